@@ -8,19 +8,63 @@ This is the driver file for running the streamlit framework.
 '''
 
 
-from random import choice
+import functools
+from random import sample
 import streamlit as st
 import requests
-from views import search, dashboard
+from views import search, dashboard, market, debug
 from models.crypto import Crypto
 from models.crypto_name_list import CryptoNameList
-from models.utils.crypto_helper import fetch_name_of_cryptos
-from models.utils.crypto_helper import get_crypto_stat_from_live_api, \
-    get_crypto_day_historical_data
+from models.utils.crypto_helper import get_cached_name_of_cryptos, \
+    get_cached_crypto_metadata
+from models.utils.crypto_helper import get_cached_crypto_stats, \
+    get_cached_crypto_stats_updated_at, get_cached_market_snapshot
+from models.utils.crypto_helper import enable_quota_budget, \
+    is_quota_nearly_exhausted
+from models.utils.crypto_helper import DAY_OF_WEEK, HISTORICAL_LIVE_DAYS
+from models.utils.downsample import TIMEFRAMES, DEFAULT_TIMEFRAME
+from models.utils.async_crypto_helper import load_search_page, run_sync
+from models.utils.history_store import get_history_store
+from models.utils.http_client import CryptoQuotaExceededError
+from models.utils.scheduler import start_quote_refresher
+from models.utils.tracing import start_trace, traced
+from models.utils.metrics import start_metrics_server
+
+
+# Cryptos of the default dashboard page
+DEFAULT_DASHBOARD_CRYPTOS = ["BTC", "ETH", "BNB", "XRP", "ADA", "DOGE"]
+# More cryptos whose quotes are pre-warmed in the background
+HOT_CRYPTOS = ["SOL", "DOT", "LTC"]
+# Refresh the quotes above off the request path while sessions show the
+# default dashboard, see models/utils/scheduler.py for the interval and idle
+# timeout
+BACKGROUND_REFRESH = True
+# Serve the metrics of the process for Prometheus, see
+# models/utils/metrics.py for the port
+METRICS_SERVER = True
 
 
 def main() -> None:
-    """Entry point for the streamlit app"""
+    """Entry point for the streamlit app, every rerun is traced and its
+    timing breakdown shown when the app is opened with ?debug=timing"""
+
+    with start_trace("rerun") as trace:
+        keep_refreshing = render_page()
+        if debug.is_enabled():
+            debug.render(trace)
+    # The auto refresh loop of the live dashboard runs once the rerun is
+    # traced, until the session reruns or ends
+    if keep_refreshing is not None:
+        keep_refreshing()
+
+
+def render_page():
+    """Render the page selected in the sidebar
+
+    Returns:
+        callable or None: the auto refresh loop of the live dashboard, None
+        on the other pages
+    """
 
     try:
         # Set default page config to wide
@@ -32,16 +76,40 @@ def main() -> None:
         st.sidebar.title("Page Navigation")
         select_option = st.sidebar.radio(
             "Select to display",
-            ["Dashboard", "Search"]
+            ["Dashboard", "Search", "Market"]
         )
         if select_option == "Dashboard":
             st.session_state["page"] = "dashboard"
         elif select_option == "Search":
             st.session_state["page"] = "search"
+        elif select_option == "Market":
+            st.session_state["page"] = "market"
+
+        # Count the requests against the monthly budget of the API plan
+        enable_quota_budget()
+        if METRICS_SERVER:
+            start_metrics_server()
+        if is_quota_nearly_exhausted():
+            st.sidebar.warning(
+                "API request budget is nearly used up, showing cached data "
+                "where possible",
+                icon="⚠️"
+            )
 
-        # Creating Crypto names and store them in session state
-        list_of_crypto_names = fetch_name_of_cryptos()
-        crypto_name_instance = CryptoNameList(list_of_crypto_names)
+        # Creating Crypto names and store them in session state, kept
+        # across reruns so the search index is only built once, and again
+        # when the list or its metadata changes
+        list_of_crypto_names = get_cached_name_of_cryptos()
+        crypto_metadata = get_cached_crypto_metadata() or None
+        crypto_name_instance = st.session_state.get("crypto_names")
+        if not isinstance(crypto_name_instance, CryptoNameList) or \
+                crypto_name_instance.name_list != list_of_crypto_names or \
+                crypto_name_instance.enriched_crypto_data is not \
+                crypto_metadata:
+            crypto_name_instance = CryptoNameList(
+                list_of_crypto_names,
+                enriched_crypto_data=crypto_metadata
+            )
         st.session_state["crypto_names"] = crypto_name_instance
 
         if "dashboard_display" not in st.session_state:
@@ -49,8 +117,20 @@ def main() -> None:
 
         # DASHBOARD PAGE
         if st.session_state["page"] == "dashboard":
+            auto_refresh_controls = dashboard.render_auto_refresh_controls(
+                crypto_name_instance.name_list, DEFAULT_DASHBOARD_CRYPTOS
+            )
+            # Auto refresh mode, reading the quotes kept fresh by the
+            # background refresher
+            if auto_refresh_controls is not None:
+                return live_dashboard_page(*auto_refresh_controls)
             # Default dashboard page
-            if st.session_state["dashboard_display"] == "default":
+            elif st.session_state["dashboard_display"] == "default":
+                # Only refreshed while some session shows them
+                if BACKGROUND_REFRESH:
+                    start_quote_refresher(
+                        DEFAULT_DASHBOARD_CRYPTOS + HOT_CRYPTOS
+                    )
                 crypto_list = default_dashboard_page_cryptos()
                 dashboard.render(crypto_list)
             elif st.session_state["dashboard_display"] == "random":
@@ -65,32 +145,114 @@ def main() -> None:
             # Check if the user has selected a crypto from the search page
             # from the session state and create object here
             if "selected_crypto" in st.session_state:
-                searched_crypto_stat = get_crypto_stat_from_live_api(
-                    st.session_state["selected_crypto"])
-                crypto_historical_data = get_crypto_day_historical_data(
-                    st.session_state["selected_crypto"])
+                # Live quote and historical days are fetched together,
+                # longer timeframes keep the days that could be fetched and
+                # read their older days from the history store only
+                timeframe = st.session_state.get(
+                    "timeframe", DEFAULT_TIMEFRAME
+                )
+                time_day = TIMEFRAMES[timeframe]
+                searched_crypto_stat, crypto_historical_data = run_sync(
+                    load_search_page(
+                        st.session_state["selected_crypto"],
+                        time_day,
+                        store=get_history_store(),
+                        allow_partial=time_day > DAY_OF_WEEK,
+                        live_days=HISTORICAL_LIVE_DAYS
+                    )
+                )
+                if crypto_historical_data and any(
+                    rate is None for _, rate in crypto_historical_data
+                ):
+                    st.caption(
+                        "Days missing from the history store are not "
+                        "fetched live beyond the last "
+                        f"{HISTORICAL_LIVE_DAYS}, fill them with "
+                        "python -m models.utils.backfill"
+                    )
                 searched_crypto = Crypto(
                     st.session_state["selected_crypto"],
                     searched_crypto_stat,
                     crypto_historical_data
                 )
-                search.display_searched_crypto(searched_crypto)
+                search.display_searched_crypto(searched_crypto, timeframe)
+
+        # MARKET PAGE
+        elif st.session_state["page"] == "market":
+            # Every listed crypto from one cached live API request
+            snapshot = get_cached_market_snapshot()
+            if not snapshot:
+                raise ValueError("Market data is not available")
+            market.render(snapshot)
 
     # Error handling
     except TypeError as te:
-        st.error("TypeError: ", te)
+        st.error(f"TypeError: {te}")
     except ValueError as ve:
-        st.error("ValueError: ", ve)
+        st.error(f"ValueError: {ve}")
+    # Errors from the HTTP client already carry their description
     except requests.exceptions.HTTPError as http_err:
-        st.error("HTTP error occurred:", http_err)
-    except requests.exceptions.ConnectionError as conn_err:
-        st.error("Connection error occurred:", conn_err)
+        st.error(http_err)
     except requests.exceptions.Timeout as timeout_err:
-        st.error("Timeout error occurred:", timeout_err)
+        st.error(timeout_err)
+    except requests.exceptions.ConnectionError as conn_err:
+        st.error(conn_err)
     except requests.exceptions.TooManyRedirects as redirect_err:
-        st.error("Redirect error occurred:", redirect_err)
+        st.error(redirect_err)
+    except CryptoQuotaExceededError as quota_err:
+        st.warning(quota_err)
     except Exception as e:  # Also catching general exceptions for debugging
-        st.error("Exception: ", e)
+        st.error(f"Exception: {e}")
+
+
+def live_dashboard_page(symbols: list, interval: float):
+    """Render the dashboard for the selected symbols, to be kept updating
+    every interval seconds. The symbols are refreshed in the background,
+    and viewers missing a quote share its request with every other viewer
+    fetching it, whatever symbols each one selected
+
+    Args:
+        symbols (list): the selected crypto symbols
+        interval (float): seconds between two updates
+
+    Returns:
+        callable or None: the auto refresh loop, None if nothing is shown
+    """
+
+    if not symbols:
+        st.info("Select cryptos in the sidebar to auto refresh", icon="ℹ️")
+        return None
+
+    if BACKGROUND_REFRESH:
+        start_quote_refresher(symbols)
+    last_updated, placeholders = dashboard.render(
+        create_cryptos_from_live_api(symbols)
+    )
+    if not placeholders:
+        return None
+
+    def get_updated_at() -> float or None:
+        # When the quotes on screen were fetched, by the refresher or by
+        # a render missing them
+        return get_cached_crypto_stats_updated_at(symbols)
+
+    dashboard.display_last_updated(last_updated, get_updated_at())
+
+    def load_cryptos() -> list:
+        # Ask for the symbols again, so the refresher keeps them while the
+        # page is open
+        if BACKGROUND_REFRESH:
+            start_quote_refresher(symbols)
+        return create_cryptos_from_live_api(symbols)
+
+    return functools.partial(
+        dashboard.auto_refresh,
+        last_updated,
+        placeholders,
+        load_cryptos,
+        interval,
+        get_updated_at=get_updated_at
+    )
 
 
 def default_dashboard_page_cryptos() -> list:
@@ -100,13 +262,8 @@ def default_dashboard_page_cryptos() -> list:
         list: list of crypto objects
     """
 
-    crypto_name_list = ["BTC", "ETH", "BNB", "XRP", "ADA", "DOGE"]
-    crypto_list = []
-    for crypto in crypto_name_list:
-        each_crypto_data = get_crypto_stat_from_live_api(crypto)
-        each_crypto = Crypto(crypto, each_crypto_data)
-        crypto_list.append(each_crypto)
-    return crypto_list
+    # Usually already cached by the background quote refresher
+    return create_cryptos_from_live_api(DEFAULT_DASHBOARD_CRYPTOS)
 
 
 def random_dashboard_page_cryptos(
@@ -121,19 +278,47 @@ def random_dashboard_page_cryptos(
         list: list of crypto objects
     """
 
-    crypto_name_list = []
-    crypto_list = []
     number_in_column = 3
-    for i in range(number_in_column * 2):
-        crypto_name_list.append(
-            choice(crypto_name_instance.name_list)
-        )
-        random_crypto_data = get_crypto_stat_from_live_api(
-            crypto_name_list[i]
-        )
-        random_crypto = Crypto(crypto_name_list[i], random_crypto_data)
-        crypto_list.append(random_crypto)
-    return crypto_list
+    number_of_cryptos = number_in_column * 2
+
+    # Sample from the cached market snapshot, so no extra request is made
+    # and every card has full stats
+    snapshot = get_cached_market_snapshot()
+    if snapshot:
+        crypto_name_list = snapshot.sample(number_of_cryptos)
+        if len(crypto_name_list) == number_of_cryptos:
+            return [
+                Crypto(crypto, snapshot.get_crypto_stat(crypto))
+                for crypto in crypto_name_list
+            ]
+
+    crypto_name_list = sample(
+        crypto_name_instance.name_list,
+        min(number_of_cryptos, crypto_name_instance.count_crypto_names())
+    )
+    return create_cryptos_from_live_api(crypto_name_list)
+
+
+@traced()
+def create_cryptos_from_live_api(crypto_name_list: list) -> list:
+    """Create crypto objects for a list of symbols from the shared quote
+    cache, missing quotes are fetched in one bulk live API request
+
+    Args:
+        crypto_name_list (list): list of crypto symbols
+
+    Raises:
+        ValueError: If the live data is not fetched
+
+    Returns:
+        list: list of crypto objects in the same order as the symbols
+    """
+
+    crypto_stats = get_cached_crypto_stats(crypto_name_list)
+    if not crypto_stats:
+        raise ValueError("Live crypto data is not available")
+
+    return Crypto.from_live_data({"rates": crypto_stats}, crypto_name_list)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,162 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Benchmark of the Crypto model: per-instance memory and construction time
+of the slotted, lazily parsed Crypto against the previous eager version
+
+Run from the root directory:
+    $ python -m benchmarks.crypto_model --count 10000
+'''
+
+import argparse
+import gc
+import time
+import tracemalloc
+from models.crypto import Crypto, ICON_URL
+
+
+STAT_KEYS = [
+    "rate",
+    "high",
+    "low",
+    "vol",
+    "cap",
+    "sup",
+    "change",
+    "change_pct"
+]
+
+
+class EagerCrypto:
+    """The Crypto model before it used slots: every stat is copied into the
+    instance __dict__ and the icon url is formatted up front"""
+    def __init__(
+        self,
+        symbol: str,
+        crypto_stat: dict = None,
+        historical_data: list = None
+    ):
+        if not isinstance(symbol, str):
+            raise TypeError("symbol must be a string")
+
+        self.symbol = symbol
+        self.icon = ICON_URL.format(symbol=symbol)
+
+        if crypto_stat is None:
+            crypto_stat = {}
+        elif not isinstance(crypto_stat, dict):
+            raise TypeError("crypto_stat must be a dict")
+
+        self.rates = crypto_stat.get("rate", 0)
+        self.high = crypto_stat.get("high", 0)
+        self.low = crypto_stat.get("low", 0)
+        self.vol = crypto_stat.get("vol", 0)
+        self.cap = crypto_stat.get("cap", 0)
+        self.sup = crypto_stat.get("sup", 0)
+        self.change = crypto_stat.get("change", 0)
+        self.change_pct = crypto_stat.get("change_pct", 0)
+
+        if historical_data is None:
+            historical_data = []
+        elif not isinstance(historical_data, list):
+            raise TypeError("historical_data must be a list")
+
+        # [(DATE, RATE), ...]
+        self.historical_data = historical_data
+
+
+def make_live_data(count: int) -> dict:
+    """Build a synthetic expanded live API response
+
+    Args:
+        count (int): the number of symbols
+
+    Returns:
+        dict: {"rates": {symbol: stat}}
+    """
+
+    return {
+        "rates": {
+            f"C{number:05d}": {
+                key: float(number + position)
+                for position, key in enumerate(STAT_KEYS)
+            }
+            for number in range(count)
+        }
+    }
+
+
+def measure(build, repeat: int) -> dict:
+    """Measure the memory kept by one build and its best time
+
+    Args:
+        build (callable): function returning the list of instances
+        repeat (int): the number of timed runs
+
+    Returns:
+        dict: bytes (allocated and kept by the instances) and seconds
+    """
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = build()
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del instances
+
+    seconds = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        build()
+        seconds.append(time.perf_counter() - started)
+    return {"bytes": allocated, "seconds": min(seconds)}
+
+
+def run(count: int, repeat: int) -> dict:
+    """Benchmark every way of building count instances
+
+    Args:
+        count (int): the number of instances
+        repeat (int): the number of timed runs
+
+    Returns:
+        dict: {case: {"bytes": ..., "seconds": ...}}
+    """
+
+    raw_data = make_live_data(count)
+    rates = raw_data["rates"]
+    cases = {
+        "eager": lambda: [
+            EagerCrypto(symbol, stat) for symbol, stat in rates.items()
+        ],
+        "slots": lambda: [
+            Crypto(symbol, stat) for symbol, stat in rates.items()
+        ],
+        "slots bulk": lambda: Crypto.from_live_data(raw_data)
+    }
+    return {case: measure(build, repeat) for case, build in cases.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the memory and build time of Crypto"
+    )
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = run(args.count, args.repeat)
+    print(f"{args.count} instances, best of {args.repeat} runs")
+    print(f"{'case':<12}{'bytes/instance':>16}{'us/instance':>14}")
+    for case, result in results.items():
+        print(
+            f"{case:<12}{result['bytes'] / args.count:>16.1f}"
+            f"{result['seconds'] / args.count * 1e6:>14.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Local stand-in for the coinlayer API, answering /list, /live and /{date}
+like crypto_helper expects, with deterministic synthetic prices for any
+number of symbols and configurable latency, errors and rate limit
+
+Run from the root directory, then point the app at it:
+    $ python -m benchmarks.mock_coinlayer --port 8765 --symbols 5000
+    $ COINLAYER_API_BASE_URL=http://127.0.0.1:8765 \
+python -m streamlit run app.py
+'''
+
+import argparse
+import datetime as dt
+import json
+import math
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from models.utils.rate_limiter import TokenBucket
+
+
+# Real symbols listed first, so the default dashboard cryptos exist
+KNOWN_CRYPTOS = {
+    "BTC": "Bitcoin",
+    "ETH": "Ethereum",
+    "BNB": "Binance Coin",
+    "XRP": "Ripple",
+    "ADA": "Cardano",
+    "DOGE": "Dogecoin",
+    "SOL": "Solana",
+    "DOT": "Polkadot",
+    "LTC": "Litecoin",
+    "BCH": "Bitcoin Cash"
+}
+DEFAULT_SYMBOL_COUNT = 1000
+ICON_URL = "https://assets.coinlayer.com/icons/{symbol}.png"
+# Seconds between two checks for a stop request
+SHUTDOWN_POLL = 0.05
+
+
+def make_symbols(count: int) -> list:
+    """Return count symbols, the KNOWN_CRYPTOS first
+
+    Args:
+        count (int): the number of symbols
+
+    Returns:
+        list: the symbols
+    """
+
+    symbols = list(KNOWN_CRYPTOS)[:count]
+    number = 0
+    while len(symbols) < count:
+        symbols.append(f"X{number:04d}")
+        number += 1
+    return symbols
+
+
+def seed_of(*parts) -> int:
+    """Stable seed of some values, the same in every process"""
+
+    return zlib.crc32("|".join(str(part) for part in parts).encode())
+
+
+def base_rate(symbol: str) -> float:
+    """The long-term rate of a symbol, between 0.001 and 10000"""
+
+    return 10 ** (seed_of(symbol) % 7 - 3) * (1 + seed_of(symbol, "b") % 9)
+
+
+def day_rate(symbol: str, date: dt.date) -> float:
+    """The closing rate of a symbol on a date, a smooth deterministic walk
+    around its base rate"""
+
+    day = date.toordinal()
+    phase = seed_of(symbol, "phase") % 360
+    wave = 0.2 * math.sin((day + phase) / 30) + 0.05 * math.sin(day / 3)
+    noise = (seed_of(symbol, day) % 1000) / 1000 * 0.04 - 0.02
+    return round(base_rate(symbol) * math.exp(wave + noise), 6)
+
+
+def live_stat(symbol: str, now: float) -> dict:
+    """The expanded live stat of a symbol, moving every minute
+
+    Args:
+        symbol (str): the symbol
+        now (float): epoch seconds
+
+    Returns:
+        dict: rate, high, low, vol, cap, sup, change and change_pct
+    """
+
+    today = dt.date.fromtimestamp(now)
+    yesterday = day_rate(symbol, today - dt.timedelta(days=1))
+    minute = int(now // 60)
+    drift = (seed_of(symbol, minute) % 1000) / 1000 * 0.02 - 0.01
+    rate = round(day_rate(symbol, today) * (1 + drift), 6)
+    sup = float(10 ** (seed_of(symbol, "sup") % 5 + 5))
+    return {
+        "rate": rate,
+        "high": round(max(rate, yesterday) * 1.01, 6),
+        "low": round(min(rate, yesterday) * 0.99, 6),
+        "vol": round(sup * rate * 0.01, 2),
+        "cap": round(sup * rate, 2),
+        "sup": sup,
+        "change": round(rate - yesterday, 6),
+        "change_pct": round((rate / yesterday - 1) * 100, 4)
+    }
+
+
+class MockCoinlayerServer:
+    """Threaded HTTP server answering like the coinlayer API
+
+    Attributes:
+        - symbols: the listed symbols
+        - latency: seconds added to every response
+        - error_rate: share of requests failing, half with a 503 and half
+        with a coinlayer error body
+        - rate_limit: requests per second answered, the others get a 429
+
+    Methods:
+        - start: serve in a background thread
+        - stop: stop serving
+        - url: the base url to set as COINLAYER_API_BASE_URL
+        - count_stats: return the request counters
+    """
+    def __init__(
+        self,
+        port: int = 0,
+        symbol_count: int = DEFAULT_SYMBOL_COUNT,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: float = None,
+        seed: int = None,
+        host: str = "127.0.0.1"
+    ) -> None:
+        """Constructor for the mock server
+
+        Args:
+            port (int, optional): the port, 0 for any free one.
+            Defaults to 0.
+            symbol_count (int, optional): the number of listed symbols.
+            Defaults to DEFAULT_SYMBOL_COUNT.
+            latency (float, optional): seconds added to every response.
+            Defaults to 0.0.
+            error_rate (float, optional): share of requests failing.
+            Defaults to 0.0.
+            rate_limit (float, optional): requests per second answered.
+            Defaults to None, unlimited.
+            seed (int, optional): seed of the error injection.
+            Defaults to None.
+            host (str, optional): the address to bind.
+            Defaults to "127.0.0.1".
+
+        Raises:
+            ValueError
+        """
+
+        if symbol_count <= 0:
+            raise ValueError("symbol_count must be positive")
+        if latency < 0:
+            raise ValueError("latency must not be negative")
+        if not 0 <= error_rate <= 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.symbols = make_symbols(symbol_count)
+        self._listed = set(self.symbols)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self._limiter = None
+        if rate_limit is not None:
+            self._limiter = TokenBucket(rate_limit, max(1, int(rate_limit)))
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "bytes": 0,
+            "errors": 0,
+            "rate_limited": 0
+        }
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockCoinlayerServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(SHUTDOWN_POLL,),
+            name="mock-coinlayer", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def count_stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+    def respond(self, path: str, query: dict) -> tuple:
+        """Answer one request
+
+        Args:
+            path (str): the url path, i.e., /live
+            query (dict): the parsed query string
+
+        Returns:
+            tuple: (HTTP status, JSON body or None, headers)
+        """
+
+        with self._lock:
+            self._stats["requests"] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        if self._limiter is not None and not self._limiter.try_acquire():
+            with self._lock:
+                self._stats["rate_limited"] += 1
+            return 429, None, {"Retry-After": "1"}
+        if self._random.random() < self.error_rate:
+            with self._lock:
+                self._stats["errors"] += 1
+            if self._random.random() < 0.5:
+                return 503, None, {}
+            return 200, error_body(500, "internal_error"), {}
+        if not query.get("access_key"):
+            return 200, error_body(101, "missing_access_key"), {}
+
+        symbols = self._requested_symbols(query)
+        if path == "/list":
+            return 200, self._list_body(), {}
+        if path == "/live":
+            return 200, self._live_body(symbols, "expand" in query), {}
+        try:
+            date = dt.date.fromisoformat(path.strip("/"))
+        except ValueError:
+            return 200, error_body(103, "invalid_api_function"), {}
+        if date > dt.date.today():
+            return 200, error_body(302, "invalid_date"), {}
+        return 200, {
+            "success": True,
+            "historical": True,
+            "date": date.isoformat(),
+            "target": "USD",
+            "rates": {symbol: day_rate(symbol, date) for symbol in symbols}
+        }, {}
+
+    def _requested_symbols(self, query: dict) -> list:
+        if "symbols" not in query:
+            return self.symbols
+        return [
+            symbol for symbol in query["symbols"][0].split(",")
+            if symbol in self._listed
+        ]
+
+    def _list_body(self) -> dict:
+        crypto = {}
+        for symbol in self.symbols:
+            name = KNOWN_CRYPTOS.get(symbol, f"Synthetic {symbol}")
+            # Like the API, some cryptos have no max supply
+            max_supply = "N/A"
+            if seed_of(symbol, "max") % 2:
+                max_supply = str(10 ** (seed_of(symbol, "sup") % 5 + 6))
+            crypto[symbol] = {
+                "symbol": symbol,
+                "name": name,
+                "name_full": f"{name} ({symbol})",
+                "max_supply": max_supply,
+                "icon_url": ICON_URL.format(symbol=symbol)
+            }
+        return {
+            "success": True,
+            "crypto": crypto,
+            "fiat": {"USD": "US Dollar"}
+        }
+
+    def _live_body(self, symbols: list, expand: bool) -> dict:
+        now = time.time()
+        rates = {}
+        for symbol in symbols:
+            stat = live_stat(symbol, now)
+            rates[symbol] = stat if expand else stat["rate"]
+        return {
+            "success": True,
+            "timestamp": int(now),
+            "target": "USD",
+            "rates": rates
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class MockCoinlayerHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                url = urlsplit(self.path)
+                status, body, headers = server.respond(
+                    url.path, parse_qs(url.query)
+                )
+                payload = b"" if body is None else json.dumps(
+                    body, separators=(",", ":")
+                ).encode()
+                with server._lock:
+                    server._stats["bytes"] += len(payload)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return MockCoinlayerHandler
+
+
+def error_body(code: int, error_type: str) -> dict:
+    """The body of a coinlayer error, answered with a 200 status"""
+
+    return {
+        "success": False,
+        "error": {"code": code, "type": error_type, "info": error_type}
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Local stand-in for the coinlayer API"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--symbols", type=int, default=DEFAULT_SYMBOL_COUNT)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--rate-limit", type=float, default=None,
+        help="requests per second answered, the others get a 429"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = MockCoinlayerServer(
+        args.port, args.symbols, args.latency, args.error_rate,
+        args.rate_limit, args.seed, args.host
+    ).start()
+    print(f"Serving {args.symbols} symbols at {server.url}")
+    print(f"Run: COINLAYER_API_BASE_URL={server.url} streamlit run app.py")
+    try:
+        while True:
+            time.sleep(60)
+            print(server.count_stats())
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
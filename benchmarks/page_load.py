@@ -0,0 +1,396 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Benchmark of the page loads: drives the app headlessly with AppTest
+through the dashboard, search and market pages against the local coinlayer
+stand-in, and reports per step the wall time, the upstream HTTP calls, the
+bytes received and the peak memory
+
+Every run starts a fresh process in an empty directory, so the caches,
+history store and quota file are cold. Results are compared with a saved
+baseline, and the command fails when a step regresses beyond the threshold
+
+Run from the root directory:
+    $ python -m benchmarks.page_load --repeat 3
+    $ python -m benchmarks.page_load --save-baseline
+'''
+
+import argparse
+import gc
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import tracemalloc
+from requests.adapters import HTTPAdapter
+from benchmarks.mock_coinlayer import MockCoinlayerServer
+
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(
+    ROOT_DIRECTORY, "benchmarks", "page_load_baseline.json"
+)
+# Allowed growth of a metric over its baseline, 0.2 is 20%
+DEFAULT_THRESHOLD = 0.2
+# Growth below these amounts is noise, whatever the threshold
+METRIC_SLACK = {
+    "seconds": 0.05,
+    "bytes": 0,
+    "peak_bytes": 256 * 1024
+}
+DEFAULT_SYMBOL_COUNT = 1000
+DEFAULT_LATENCY = 0.02
+# Seconds one step may take before AppTest gives up
+STEP_TIMEOUT = 60
+METRICS = ["seconds", "calls", "bytes", "peak_bytes"]
+# The app without the background refresher, so every upstream call of a
+# step is made by the step itself, and without the metrics server. AppTest
+# only polls for the end of a run every 0.1 seconds, so the run is timed by
+# the script
+APP_SCRIPT = """
+import time
+import streamlit as st
+import app
+app.BACKGROUND_REFRESH = False
+app.METRICS_SERVER = False
+started = time.perf_counter()
+app.main()
+st.session_state["benchmark_seconds"] = time.perf_counter() - started
+"""
+
+
+class CountingAdapter(HTTPAdapter):
+    """Transport adapter counting the upstream calls and the bytes
+    received, mounted on the HTTP client of the app"""
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "bytes": 0}
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["bytes"] += len(response.content)
+        return response
+
+    def count_stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+
+def select_crypto(app_test, symbol: str) -> None:
+    """Search a crypto like the SEARCH button does. AppTest cannot rerun a
+    selectbox with a format_func, so the selection is set directly"""
+
+    app_test.session_state["selected_crypto"] = symbol
+
+
+# (step, action on the AppTest before it runs), a user opening every page
+# once and rerunning it
+STEPS = [
+    ("dashboard", lambda app_test: None),
+    ("dashboard rerun", lambda app_test: None),
+    ("search", lambda app_test: app_test.sidebar.radio[0].set_value(
+        "Search"
+    )),
+    ("search BTC", lambda app_test: select_crypto(app_test, "BTC")),
+    ("search BTC rerun", lambda app_test: None),
+    ("market", lambda app_test: app_test.sidebar.radio[0].set_value(
+        "Market"
+    )),
+    ("market rerun", lambda app_test: None)
+]
+
+
+def run_steps(trace_memory: bool = False) -> dict:
+    """Run every step in this process, against the API_BASE_URL of the
+    environment
+
+    Args:
+        trace_memory (bool, optional): measure the peak memory, which slows
+        down the steps. Defaults to False.
+
+    Raises:
+        RuntimeError: If a step shows an error
+
+    Returns:
+        dict: {step: {"seconds", "calls", "bytes"[, "peak_bytes"]}}
+    """
+
+    # Imported here, after the parent process set the environment
+    from streamlit.testing.v1 import AppTest
+    import models.utils.crypto_helper as crypto_helper
+    from models.utils.http_client import HttpClient
+
+    # Counted the same way as use_cassette mounts its adapter
+    adapter = CountingAdapter(
+        pool_connections=crypto_helper.HTTP_POOL_SIZE,
+        pool_maxsize=crypto_helper.HTTP_POOL_SIZE
+    )
+    crypto_helper._http_client.close()
+    crypto_helper._http_client = HttpClient(
+        pool_size=crypto_helper.HTTP_POOL_SIZE, adapter=adapter
+    )
+
+    if ROOT_DIRECTORY not in sys.path:
+        sys.path.insert(0, ROOT_DIRECTORY)
+    app_test = AppTest.from_string(APP_SCRIPT, default_timeout=STEP_TIMEOUT)
+    if trace_memory:
+        tracemalloc.start()
+
+    results = {}
+    for step, action in STEPS:
+        action(app_test)
+        # A collection left over from an earlier step would land in this one
+        gc.collect()
+        stats_before = adapter.count_stats()
+        if trace_memory:
+            tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0]
+        app_test.run()
+
+        errors = [element.value for element in app_test.exception]
+        errors += [element.value for element in app_test.error]
+        if errors:
+            raise RuntimeError(f"Step {step} failed: {errors}")
+        stats = adapter.count_stats()
+        results[step] = {
+            "seconds": app_test.session_state["benchmark_seconds"],
+            "calls": stats["calls"] - stats_before["calls"],
+            "bytes": stats["bytes"] - stats_before["bytes"]
+        }
+        if trace_memory:
+            results[step]["peak_bytes"] = (
+                tracemalloc.get_traced_memory()[1] - memory_before
+            )
+
+    if trace_memory:
+        tracemalloc.stop()
+    return results
+
+
+def run_in_new_process(base_url: str, trace_memory: bool = False) -> dict:
+    """Run every step in a new process started in an empty directory, so
+    nothing is cached yet
+
+    Args:
+        base_url (str): the url of the coinlayer stand-in
+        trace_memory (bool, optional): measure the peak memory.
+        Defaults to False.
+
+    Returns:
+        dict: the results of run_steps
+    """
+
+    with tempfile.TemporaryDirectory() as directory:
+        output_path = os.path.join(directory, "results.json")
+        environment = dict(os.environ)
+        environment["COINLAYER_API_BASE_URL"] = base_url
+        environment["PYTHONPATH"] = os.pathsep.join(
+            filter(None, [ROOT_DIRECTORY, environment.get("PYTHONPATH")])
+        )
+        command = [
+            sys.executable, "-m", "benchmarks.page_load",
+            "--child", output_path
+        ]
+        if trace_memory:
+            command.append("--trace-memory")
+        # The app prints API errors, only the results file is read
+        subprocess.run(
+            command, cwd=directory, env=environment, check=True,
+            stdout=subprocess.DEVNULL
+        )
+        with open(output_path, encoding="utf-8") as file:
+            return json.load(file)
+
+
+def summarize(timing_runs: list, memory_run: dict) -> dict:
+    """Combine the runs into one result per step, the median of the timing
+    runs and the peak memory of the traced run
+
+    Args:
+        timing_runs (list): results of run_steps without tracing
+        memory_run (dict): results of run_steps with tracing
+
+    Returns:
+        dict: {step: {"seconds", "calls", "bytes", "peak_bytes"}}
+    """
+
+    summary = {}
+    for step, _ in STEPS:
+        summary[step] = {
+            metric: statistics.median(run[step][metric] for run in timing_runs)
+            for metric in ["seconds", "calls", "bytes"]
+        }
+        summary[step]["peak_bytes"] = memory_run[step]["peak_bytes"]
+    return summary
+
+
+def run_benchmark(
+    repeat: int = 3,
+    symbol_count: int = DEFAULT_SYMBOL_COUNT,
+    latency: float = DEFAULT_LATENCY
+) -> dict:
+    """Benchmark every step against a local coinlayer stand-in
+
+    Args:
+        repeat (int, optional): the number of timed runs. Defaults to 3.
+        symbol_count (int, optional): the symbols listed by the stand-in.
+        Defaults to DEFAULT_SYMBOL_COUNT.
+        latency (float, optional): seconds added to every upstream call.
+        Defaults to DEFAULT_LATENCY.
+
+    Raises:
+        ValueError: If repeat is not positive
+
+    Returns:
+        dict: {step: {"seconds", "calls", "bytes", "peak_bytes"}}
+    """
+
+    if not isinstance(repeat, int) or repeat <= 0:
+        raise ValueError("repeat must be a positive integer")
+
+    server = MockCoinlayerServer(
+        symbol_count=symbol_count, latency=latency
+    ).start()
+    try:
+        timing_runs = [
+            run_in_new_process(server.url) for _ in range(repeat)
+        ]
+        memory_run = run_in_new_process(server.url, trace_memory=True)
+    finally:
+        server.stop()
+    return summarize(timing_runs, memory_run)
+
+
+def find_regressions(
+    results: dict,
+    baseline: dict,
+    threshold: float = DEFAULT_THRESHOLD
+) -> list:
+    """Compare the results with a baseline. Upstream calls must not grow at
+    all, the other metrics by no more than the threshold
+
+    Args:
+        results (dict): {step: {metric: value}}
+        baseline (dict): {step: {metric: value}}, steps missing from it are
+        not compared
+        threshold (float, optional): allowed growth, 0.2 is 20%.
+        Defaults to DEFAULT_THRESHOLD.
+
+    Raises:
+        ValueError: If the threshold is negative
+
+    Returns:
+        list: a description of every regression, empty if none
+    """
+
+    if threshold < 0:
+        raise ValueError("threshold must not be negative")
+
+    regressions = []
+    for step, metrics in results.items():
+        if step not in baseline:
+            continue
+        for metric in METRICS:
+            value = metrics.get(metric)
+            expected = baseline[step].get(metric)
+            if value is None or expected is None:
+                continue
+            if metric == "calls":
+                limit = expected
+            else:
+                limit = max(
+                    expected * (1 + threshold),
+                    expected + METRIC_SLACK[metric]
+                )
+            if value > limit:
+                regressions.append(
+                    f"{step}: {metric} {value:g} > {limit:g} "
+                    f"(baseline {expected:g})"
+                )
+    return regressions
+
+
+def print_results(results: dict, baseline: dict = None) -> None:
+    baseline = baseline or {}
+    print(
+        f"{'step':<18}{'seconds':>10}{'calls':>7}{'KB':>10}"
+        f"{'peak KB':>10}{'base s':>10}"
+    )
+    for step, metrics in results.items():
+        base_seconds = baseline.get(step, {}).get("seconds")
+        print(
+            f"{step:<18}{metrics['seconds']:>10.3f}{metrics['calls']:>7g}"
+            f"{metrics['bytes'] / 1024:>10.1f}"
+            f"{metrics['peak_bytes'] / 1024:>10.1f}"
+            + (f"{base_seconds:>10.3f}" if base_seconds is not None else "")
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the page loads of the app"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--symbols", type=int, default=DEFAULT_SYMBOL_COUNT)
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY)
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD
+    )
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--save-baseline", action="store_true",
+        help="save the results as the new baseline"
+    )
+    # Internal, the results file of one run in a new process
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument(
+        "--trace-memory", action="store_true", help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.child:
+        results = run_steps(args.trace_memory)
+        with open(args.child, "w", encoding="utf-8") as file:
+            json.dump(results, file)
+        return
+
+    config = {"symbols": args.symbols, "latency": args.latency}
+    results = run_benchmark(args.repeat, args.symbols, args.latency)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump({"config": config, "steps": results}, file, indent=4)
+        print_results(results)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    try:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+    except FileNotFoundError:
+        print_results(results)
+        print("No baseline yet, save one with --save-baseline")
+        return
+    print_results(results, baseline["steps"])
+    if baseline["config"] != config:
+        sys.exit(f"The baseline was measured with {baseline['config']}")
+
+    regressions = find_regressions(
+        results, baseline["steps"], args.threshold
+    )
+    if regressions:
+        print("Regressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"No regression beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,12 +5,24 @@
 Crypto data class
 '''
 
+from models.time_series import TimeSeries
+from models.utils.tracing import span, traced
+
 
 ICON_URL = "https://assets.coinlayer.com/icons/{symbol}.png"
 
 
+def _stat_property(key: str) -> property:
+    """Property reading one stat from the crypto_stat dict on access,
+    0 if the API did not report it"""
+
+    return property(lambda self: self._crypto_stat.get(key, 0))
+
+
 class Crypto:
-    """The Crypto class represents a cryptocurrency
+    """The Crypto class represents a cryptocurrency. It keeps a reference
+    to its stat dict and reads the stats from it on access, and has no
+    per-instance __dict__, so thousands of instances stay cheap to build
 
     Attributes:
         - symbol: the symbol of the crypto
@@ -23,13 +35,29 @@ class Crypto:
         - sup: the supply of the crypto
         - change: the change of the crypto in the last 24 hours
         - change_pct: the change percentage of the crypto in the last 24 hours
+        - historical_data: [(DATE, RATE), ...] or a TimeSeries
+        - time_series: the historical data as a TimeSeries
 
     Methods:
         - __init__: initialises a crypto instance
+        - from_live_data: create many crypto instances from one API response
         - __str__: return a string representation of the crypto instance
         - validate_crypto_stat: validate the crypto_stat data for later
         display funtions
     """
+    __slots__ = (
+        "symbol", "_historical_data", "_crypto_stat", "_time_series"
+    )
+
+    rates = _stat_property("rate")
+    high = _stat_property("high")
+    low = _stat_property("low")
+    vol = _stat_property("vol")
+    cap = _stat_property("cap")
+    sup = _stat_property("sup")
+    change = _stat_property("change")
+    change_pct = _stat_property("change_pct")
+
     def __init__(
         self,
         symbol: str,
@@ -40,30 +68,60 @@ class Crypto:
             raise TypeError("symbol must be a string")
 
         self.symbol = symbol
-        self.icon = ICON_URL.format(symbol=symbol)
 
         if crypto_stat is None:
             crypto_stat = {}
         elif not isinstance(crypto_stat, dict):
             raise TypeError("crypto_stat must be a dict")
 
-        self.rates = crypto_stat.get("rate", 0)
-        self.high = crypto_stat.get("high", 0)
-        self.low = crypto_stat.get("low", 0)
-        self.vol = crypto_stat.get("vol", 0)
-        self.cap = crypto_stat.get("cap", 0)
-        self.sup = crypto_stat.get("sup", 0)
-        self.change = crypto_stat.get("change", 0)
-        self.change_pct = crypto_stat.get("change_pct", 0)
+        # Shared with the caller, not copied
+        self._crypto_stat = crypto_stat
 
         if historical_data is None:
             historical_data = []
-        elif not isinstance(historical_data, list):
-            raise TypeError("historical_data must be a list")
-
-        # [(DATE, RATE), ...]
+        # [(DATE, RATE), ...] or TimeSeries
         self.historical_data = historical_data
 
+    @classmethod
+    @traced("Crypto.from_live_data")
+    def from_live_data(cls, raw_data: dict, symbols: list = None) -> list:
+        """Create crypto instances from one expanded live API response,
+        each sharing its stat dict with the response
+
+        Args:
+            raw_data (dict): the live API response with "rates"
+            symbols (list, optional): the symbols to create, in order,
+            missing ones get no stats. Defaults to every symbol of the
+            response.
+
+        Returns:
+            list: list of crypto objects
+        """
+
+        if not isinstance(raw_data, dict):
+            raise TypeError("raw_data must be a dict")
+
+        rates = raw_data.get("rates") or {}
+        if symbols is None:
+            symbols = list(rates.keys())
+        elif not isinstance(symbols, list):
+            raise TypeError("symbols must be a list")
+
+        empty_stat = {}
+        cryptos = []
+        for symbol in symbols:
+            crypto = cls.__new__(cls)
+            crypto.symbol = symbol
+            crypto._crypto_stat = rates.get(symbol) or empty_stat
+            crypto._historical_data = []
+            crypto._time_series = None
+            cryptos.append(crypto)
+        return cryptos
+
+    @property
+    def icon(self) -> str:
+        return ICON_URL.format(symbol=self.symbol)
+
     def __str__(self) -> str:
         """String representation of the crypto instance
 
@@ -76,6 +134,40 @@ class Crypto:
 {self.change_pct} | {self.historical_data}"
         )
 
+    @property
+    def historical_data(self) -> list or TimeSeries:
+        return self._historical_data
+
+    @historical_data.setter
+    def historical_data(self, historical_data: list or TimeSeries) -> None:
+        if not isinstance(historical_data, (list, TimeSeries)):
+            raise TypeError("historical_data must be a list or TimeSeries")
+
+        self._historical_data = historical_data
+        # Converted again from the new data on next use
+        self._time_series = None
+
+    @property
+    def time_series(self) -> TimeSeries:
+        """The historical data as a TimeSeries, converted on first use and
+        again after the historical data is reassigned or grows in place
+
+        Returns:
+            TimeSeries: the historical data
+        """
+
+        if isinstance(self.historical_data, TimeSeries):
+            return self.historical_data
+        if (
+            self._time_series is None
+            or len(self._time_series) != len(self.historical_data)
+        ):
+            with span("Crypto.time_series"):
+                self._time_series = TimeSeries.from_historical_data(
+                    self.historical_data
+                )
+        return self._time_series
+
     def validate_crypto_stat(self):
         """validate the crypto_stat data for later display funtions
         with streamlit
@@ -0,0 +1,216 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Crypto metadata classes, the static details of every listed crypto kept
+from the list API so symbols can be labelled without extra requests
+'''
+
+
+class CryptoMetadata:
+    """The static details of one crypto, stored in slots so thousands of
+    records stay small
+
+    Attributes:
+        - symbol: the symbol of the crypto, i.e., BTC
+        - name: the name of the crypto, i.e., Bitcoin
+        - name_full: the full name, i.e., Bitcoin (BTC)
+        - icon_url: the icon url of the crypto
+        - max_supply: the maximum supply, None if unlimited or unknown
+    """
+    __slots__ = ("symbol", "name", "name_full", "icon_url", "max_supply")
+
+    def __init__(
+        self,
+        symbol: str,
+        name: str = None,
+        name_full: str = None,
+        icon_url: str = None,
+        max_supply: float = None
+    ) -> None:
+        if not isinstance(symbol, str):
+            raise TypeError("symbol must be a string")
+
+        self.symbol = symbol
+        self.name = name or symbol
+        self.name_full = name_full or self.name
+        self.icon_url = icon_url
+        self.max_supply = max_supply
+
+    @classmethod
+    def from_list_data(cls, symbol: str, details: dict) -> "CryptoMetadata":
+        """Build a record from one entry of the list API
+
+        Args:
+            symbol (str): the symbol of the crypto
+            details (dict): its details, i.e., {"name": "Bitcoin",
+            "name_full": "Bitcoin (BTC)", "max_supply": "21000000",
+            "icon_url": "https://..."}
+
+        Returns:
+            CryptoMetadata: the record
+        """
+
+        if not isinstance(details, dict):
+            raise TypeError("details must be a dict")
+
+        return cls(
+            symbol,
+            details.get("name"),
+            details.get("name_full"),
+            details.get("icon_url"),
+            parse_max_supply(details.get("max_supply"))
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CryptoMetadata):
+            return NotImplemented
+        return all(
+            getattr(self, slot) == getattr(other, slot)
+            for slot in self.__slots__
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"CryptoMetadata({self.symbol!r}, {self.name!r}, "
+            f"{self.name_full!r}, {self.icon_url!r}, {self.max_supply!r})"
+        )
+
+
+class CryptoMetadataStore:
+    """The metadata of every listed crypto, looked up by symbol. A store
+    never changes once built, a newer list API response gives a new store,
+    so it is read from any thread without a lock and a session keeps a
+    consistent snapshot
+
+    Methods:
+        - from_list_data: build a store from the list API response
+        - get: return the record of a symbol
+        - get_name: return the name of a symbol
+        - updated: return a new store with a newer list API response
+    """
+    def __init__(self, records: list = None) -> None:
+        """Constructor for the metadata store
+
+        Args:
+            records (list, optional): list of CryptoMetadata.
+            Defaults to None.
+        """
+
+        if records is None:
+            records = []
+        elif not isinstance(records, list):
+            raise TypeError("records must be a list")
+
+        self._records = {}
+        for record in records:
+            if not isinstance(record, CryptoMetadata):
+                raise TypeError("records must be CryptoMetadata objects")
+            self._records[record.symbol] = record
+
+    @classmethod
+    def from_list_data(cls, crypto_list: dict) -> "CryptoMetadataStore":
+        """Build a store from the "crypto" field of the list API
+
+        Args:
+            crypto_list (dict): {symbol: details}
+
+        Returns:
+            CryptoMetadataStore: the store
+        """
+
+        store, _ = cls().updated(crypto_list)
+        return store
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._records
+
+    def __iter__(self):
+        return iter(self._records.values())
+
+    def get(self, symbol: str) -> CryptoMetadata or None:
+        """Return the record of a symbol
+
+        Args:
+            symbol (str): Crypto symbol, i.e., BTC
+
+        Returns:
+            CryptoMetadata or None: the record, None if not listed
+        """
+
+        return self._records.get(symbol)
+
+    def get_name(self, symbol: str) -> str:
+        """Return the name of a symbol, or the symbol itself if not listed
+
+        Args:
+            symbol (str): Crypto symbol, i.e., BTC
+
+        Returns:
+            str: the name, i.e., Bitcoin
+        """
+
+        record = self._records.get(symbol)
+        return symbol if record is None else record.name
+
+    def updated(
+        self,
+        crypto_list: dict,
+        remove_missing: bool = False
+    ) -> tuple:
+        """Return a new store with a newer list API response applied, the
+        records whose details did not change are shared with this store
+
+        Args:
+            crypto_list (dict): {symbol: details}
+            remove_missing (bool, optional): drop the symbols no longer
+            listed. Defaults to False.
+
+        Returns:
+            tuple: (CryptoMetadataStore, int) the new store, and the number
+            of records added, changed or removed
+        """
+
+        if not isinstance(crypto_list, dict):
+            raise TypeError("crypto_list must be a dict")
+
+        records = dict(self._records)
+        changed = 0
+        for symbol, details in crypto_list.items():
+            record = CryptoMetadata.from_list_data(symbol, details)
+            if records.get(symbol) != record:
+                records[symbol] = record
+                changed += 1
+        if remove_missing:
+            for symbol in [
+                symbol for symbol in records if symbol not in crypto_list
+            ]:
+                del records[symbol]
+                changed += 1
+        if not changed:
+            return self, 0
+
+        store = CryptoMetadataStore.__new__(CryptoMetadataStore)
+        store._records = records
+        return store, changed
+
+
+def parse_max_supply(max_supply) -> float or None:
+    """Parse the max supply of the list API, a number, a numeric string or
+    a placeholder such as "N/A"
+
+    Args:
+        max_supply: the raw max supply
+
+    Returns:
+        float or None: the max supply, None if unlimited or unknown
+    """
+
+    try:
+        max_supply = float(max_supply)
+    except (TypeError, ValueError):
+        return None
+    return max_supply if max_supply > 0 else None
@@ -5,15 +5,37 @@
 Crypto name list class
 '''
 
+from bisect import bisect_left
+from collections import defaultdict
+import heapq
+import numpy as np
+from models.crypto_metadata import CryptoMetadata, CryptoMetadataStore
+
+
+# Number of results returned by a search
+SEARCH_RESULT_LIMIT = 10
+# Length of the n-grams indexed for substring and typo-tolerant search
+NGRAM_SIZE = 3
+# Most keys checked by edit distance for one misspelled query
+TYPO_CANDIDATE_LIMIT = 50
+# Ranking tiers of a search result, lower is better
+EXACT_MATCH, SYMBOL_PREFIX, NAME_PREFIX, SUBSTRING, TYPO = range(5)
+
 
 class CryptoNameList:
     """Crypto name list class
     """
-    def __init__(self, name_list: list) -> None:
+    def __init__(
+        self,
+        name_list: list,
+        enriched_crypto_data: CryptoMetadataStore = None
+    ) -> None:
         """Constructor for crypto name list class
 
         Args:
             name_list (list): list of crypto names to be fed in
+            enriched_crypto_data (CryptoMetadataStore, optional): metadata
+            of the cryptos, its names are also searched. Defaults to None.
 
         Raises:
             TypeError
@@ -24,12 +46,14 @@ class CryptoNameList:
             raise TypeError("Crypto name list must be a list")
         if len(name_list) == 0:
             raise ValueError("Data fed in should not be 0")
+        if enriched_crypto_data is None:
+            enriched_crypto_data = CryptoMetadataStore()
+        elif not isinstance(enriched_crypto_data, CryptoMetadataStore):
+            raise TypeError("Enriched data must be a CryptoMetadataStore")
         self.name_list = name_list
-
-        # ------------
-
-        # More attributes for further development beyond this project
-        # self.enriched_crypto_data = {name: None for name in name_list}
+        self.enriched_crypto_data = enriched_crypto_data
+        # Built on the first search
+        self._index = None
 
     def count_crypto_names(self) -> int:
         """returns the number of crypto names in the list
@@ -41,14 +65,321 @@ class CryptoNameList:
         count = len(self.name_list)
         return count
 
-    # ------------
-    # More methods for further development beyond this project
+    def get_full_name(self, symbol: str) -> str:
+        """returns the full name of a crypto, or its symbol if unknown
+
+        Args:
+            symbol (str): crypto symbol, i.e., BTC
+
+        Returns:
+            str: the full name, i.e., Bitcoin
+        """
+
+        return self.enriched_crypto_data.get_name(symbol)
+
+    def search(self, query: str, k: int = SEARCH_RESULT_LIMIT) -> list:
+        """returns the symbols best matching a query on symbol or full name:
+        exact matches first, then prefixes, substrings and typos
+
+        Args:
+            query (str): part of a symbol or full name, i.e., "bitc"
+            k (int, optional): maximum number of results.
+            Defaults to SEARCH_RESULT_LIMIT.
+
+        Returns:
+            list: up to k symbols, best match first
+        """
+
+        if not isinstance(query, str):
+            raise TypeError("query must be a string")
+        if not isinstance(k, int) or k <= 0:
+            raise ValueError("k must be a positive integer")
+
+        if self._index is None:
+            self._index = CryptoNameIndex([
+                (symbol, self.get_full_name(symbol))
+                for symbol in self.name_list
+            ])
+        return self._index.search(query, k)
+
+    def get_enriched_data(self, crypto_name: str) -> CryptoMetadata or None:
+        """returns the metadata of a crypto
+
+        Args:
+            crypto_name (str): crypto symbol, i.e., BTC
+
+        Returns:
+            CryptoMetadata or None: name, full name, icon url and max supply,
+            None if unknown
+        """
+
+        return self.enriched_crypto_data.get(crypto_name)
+
+    def update_enriched_data(self, crypto_list: dict) -> int:
+        """updates the metadata of this list only from a newer list API
+        response, the search index is rebuilt on the next search if any
+        name changed
+
+        Args:
+            crypto_list (dict): {symbol: details} from the list API
+
+        Returns:
+            int: the number of records added or changed
+        """
+
+        self.enriched_crypto_data, changed = (
+            self.enriched_crypto_data.updated(crypto_list)
+        )
+        if changed:
+            self._index = None
+        return changed
+
+
+class CryptoNameIndex:
+    """Search index over crypto symbols and full names: a sorted array of
+    the lowercase keys for prefix lookup and an n-gram index for substring
+    and typo-tolerant lookup
+    """
+    def __init__(self, entries: list) -> None:
+        """Constructor for the search index
+
+        Args:
+            entries (list): [(symbol, full name), ...]
+        """
+
+        self._symbols = []
+        # (lowercase key, entry id, is the symbol), sorted by key
+        key_rows = []
+        for entry_id, (symbol, full_name) in enumerate(entries):
+            self._symbols.append(symbol)
+            key_rows.append((symbol.lower(), entry_id, True))
+            if full_name and full_name.lower() != symbol.lower():
+                key_rows.append((full_name.lower(), entry_id, False))
+        key_rows.sort()
+        self._keys = [row[0] for row in key_rows]
+        self._entry_ids = [row[1] for row in key_rows]
+        self._is_symbol = [row[2] for row in key_rows]
+        positions = range(len(self._keys))
+        # Rank of each key position by (length, key), shortest first
+        by_length = sorted(
+            positions,
+            key=lambda position: (len(self._keys[position]), position)
+        )
+        self._order = make_ranks(by_length)
+        # Rank of each key position within the prefix tiers, symbols first
+        self._prefix_order = make_ranks(sorted(
+            positions,
+            key=lambda position: (
+                not self._is_symbol[position],
+                len(self._keys[position]),
+                position
+            )
+        ))
+
+        # {n-gram: key positions, shortest key first}, keys padded to
+        # index their edges
+        postings = defaultdict(list)
+        for position in by_length:
+            for ngram in make_ngrams(f" {self._keys[position]} "):
+                postings[ngram].append(position)
+        self._ngrams = {
+            ngram: np.array(positions, dtype=np.int64)
+            for ngram, positions in postings.items()
+        }
+
+    def search(self, query: str, k: int) -> list:
+        """returns the k symbols best matching the query
+
+        Args:
+            query (str): part of a symbol or full name
+            k (int): maximum number of results
+
+        Returns:
+            list: up to k symbols, best match first
+        """
+
+        query = query.strip().lower()
+        if not query:
+            return []
+
+        # {entry id: (tier, typos, key length, key)}
+        ranks = {}
+
+        def offer(position: int, tier: int, typos: int = 0) -> None:
+            key = self._keys[position]
+            rank = (tier, typos, len(key), key)
+            entry_id = self._entry_ids[position]
+            if entry_id not in ranks or rank < ranks[entry_id]:
+                ranks[entry_id] = rank
+
+        for position in self._find_prefixes(query, k):
+            if self._keys[position] == query:
+                offer(position, EXACT_MATCH)
+            elif self._is_symbol[position]:
+                offer(position, SYMBOL_PREFIX)
+            else:
+                offer(position, NAME_PREFIX)
+
+        if len(query) >= NGRAM_SIZE:
+            for position in self._find_substrings(query, k):
+                offer(position, SUBSTRING)
+            if len(ranks) < k:
+                for position, typos in self._find_typos(query, k):
+                    offer(position, TYPO, typos)
+
+        best = heapq.nsmallest(k, ranks.items(), key=lambda item: item[1])
+        return [self._symbols[entry_id] for entry_id, _ in best]
+
+    def _find_prefixes(self, query: str, k: int) -> list:
+        """returns the positions of the exact matches and of the best ranked
+        keys starting with the query, enough for k entries"""
+
+        # Prefix matches are one contiguous slice of the sorted keys, the
+        # exact matches first
+        first = bisect_left(self._keys, query)
+        last = bisect_left(self._keys, query + "\uffff")
+        exact_end = first
+        while exact_end < last and self._keys[exact_end] == query:
+            exact_end += 1
+        # An entry has at most two keys
+        limit = 2 * k
+        if last - exact_end <= limit:
+            return list(range(first, last))
+        ranks = self._prefix_order[exact_end:last]
+        best = np.argpartition(ranks, limit)[:limit] + exact_end
+        return list(range(first, exact_end)) + best.tolist()
+
+    def _find_substrings(self, query: str, k: int) -> list:
+        """returns the positions of the shortest keys containing the query,
+        enough for k entries"""
+
+        postings = [self._ngrams.get(ngram) for ngram in make_ngrams(query)]
+        if not postings or any(posting is None for posting in postings):
+            return []
+        # Every match is in the rarest posting, checked shortest key first
+        # as they rank first within the tier
+        matches = []
+        entry_ids = set()
+        for position in min(postings, key=len).tolist():
+            if query in self._keys[position]:
+                matches.append(position)
+                entry_ids.add(self._entry_ids[position])
+                if len(entry_ids) == k:
+                    break
+        return matches
+
+    def _find_typos(self, query: str, k: int) -> list:
+        """returns (key position, typos) for up to k keys within a small
+        edit distance of the query or of the key prefix of the same length
+        """
 
-    # def get_enriched_data(self, crypto_name: str) -> dict:
-    #     # Get the enriched data from the crypto name
-    #     # ...
-    #     return self.enriched_crypto_data.get(crypto_name)
+        max_typos = 1 if len(query) <= 4 else 2
+        query_ngrams = make_ngrams(f" {query} ")
+        # One edit changes at most NGRAM_SIZE n-grams, keys sharing fewer
+        # than max_typos are too unlike the query to be worth checking
+        min_shared = max(
+            len(query_ngrams) - NGRAM_SIZE * max_typos, max_typos
+        )
+        postings = [
+            self._ngrams[ngram] for ngram in query_ngrams
+            if ngram in self._ngrams
+        ]
+        if not postings:
+            return []
+        shared = np.bincount(
+            np.concatenate(postings), minlength=len(self._keys)
+        )
+        candidates = np.flatnonzero(shared >= min_shared)
+
+        # Keys sharing the most n-grams are the likeliest matches, then the
+        # shortest ones, which rank first within the tier. Only the best
+        # are checked, so a common n-gram cannot slow the search, and ties
+        # are cut the same way on every search
+        scores = (
+            shared[candidates] * len(self._keys) - self._order[candidates]
+        )
+        if len(candidates) > TYPO_CANDIDATE_LIMIT:
+            best = np.argpartition(-scores, TYPO_CANDIDATE_LIMIT)
+            best = best[:TYPO_CANDIDATE_LIMIT]
+            candidates, scores = candidates[best], scores[best]
+        candidates = candidates[np.argsort(-scores)]
+
+        matches = []
+        for position in candidates.tolist():
+            typos = typo_distance(query, self._keys[position], max_typos)
+            if typos <= max_typos:
+                matches.append((position, typos))
+                if len(matches) == k:
+                    break
+        return matches
+
+
+def make_ranks(positions: list) -> np.ndarray:
+    """returns the rank of every position given the positions in rank
+    order
+
+    Args:
+        positions (list): every position from 0, best ranked first
+
+    Returns:
+        np.ndarray: the rank of each position
+    """
+
+    ranks = np.empty(len(positions), dtype=np.int64)
+    ranks[positions] = np.arange(len(positions))
+    return ranks
+
+
+def make_ngrams(text: str) -> set:
+    """returns the n-grams of a text
+
+    Args:
+        text (str): the text
+
+    Returns:
+        set: the NGRAM_SIZE long substrings of the text
+    """
+
+    return {
+        text[start:start + NGRAM_SIZE]
+        for start in range(len(text) - NGRAM_SIZE + 1)
+    }
+
+
+def typo_distance(query: str, key: str, limit: int) -> int:
+    """Levenshtein distance between a query and a key, or the key prefix of
+    the same length if closer, from one table stopping early once both are
+    known to exceed limit
+
+    Args:
+        query (str): the query
+        key (str): the key
+        limit (int): the largest distance of interest
+
+    Returns:
+        int: the distance, or limit + 1 if it exceeds limit
+    """
 
-    # def update_enriched_data(self, crypto_name: str) -> None:
-    #     # Update the enriched data from the crypto name
-    #     # ...
+    key_length = len(key)
+    # Longer keys can only match by their prefix
+    key = key[:len(query) + limit]
+    beyond = limit + 1
+    previous = [min(column, beyond) for column in range(len(key) + 1)]
+    for row, query_char in enumerate(query, start=1):
+        current = [min(row, beyond)] + [beyond] * len(key)
+        # Cells further than limit from the diagonal exceed limit
+        first = max(1, row - limit)
+        last = min(len(key), row + limit)
+        for column in range(first, last + 1):
+            current[column] = min(
+                previous[column] + 1,
+                current[column - 1] + 1,
+                previous[column - 1] + (query_char != key[column - 1])
+            )
+        if min(current) > limit:
+            return beyond
+        previous = current
+    distance = previous[min(len(query), len(key))]
+    if key_length == len(key):
+        distance = min(distance, previous[-1])
+    return min(distance, beyond)
@@ -0,0 +1,236 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Market snapshot class, the live stats of every listed crypto stored as
+columns
+'''
+
+import time
+import numpy as np
+import pandas as pd
+
+
+# Stats of the expanded live API, in column order
+STAT_COLUMNS = [
+    "rate",
+    "high",
+    "low",
+    "vol",
+    "cap",
+    "sup",
+    "change",
+    "change_pct"
+]
+
+# Stats often missing from the API, checked like Crypto.validate_crypto_stat
+VALIDATED_COLUMNS = STAT_COLUMNS[1:]
+
+
+class MarketSnapshot:
+    """The MarketSnapshot class stores the live stats of many cryptos as one
+    float64 array per stat instead of one Crypto object per symbol
+
+    Attributes:
+        - symbols: array of the symbols
+        - timestamp: epoch seconds of the API response
+        - columns: {stat: float64 array} for the STAT_COLUMNS
+
+    Methods:
+        - from_live_data: build a snapshot from the live API response
+        - get_crypto_stat: return the stat dict of one symbol
+        - validate_crypto_stats: return which symbols have every stat
+        - sample: pick random symbols without replacement
+        - top: return the n symbols with the largest value of a stat
+        - top_movers: return the largest absolute changes
+        - top_volume: return the largest volumes
+        - top_cap: return the largest market caps
+        - to_frame: return the snapshot as a DataFrame
+    """
+    def __init__(
+        self,
+        symbols,
+        columns: dict,
+        timestamp: float = None
+    ) -> None:
+        """Constructor for the market snapshot
+
+        Args:
+            symbols (array-like): the symbols
+            columns (dict): {stat: array-like} for the STAT_COLUMNS
+            timestamp (float, optional): epoch seconds of the data.
+            Defaults to now.
+
+        Raises:
+            TypeError
+            ValueError
+        """
+
+        if not isinstance(columns, dict):
+            raise TypeError("columns must be a dict")
+        if set(columns) != set(STAT_COLUMNS):
+            raise ValueError(f"columns must be {STAT_COLUMNS}")
+
+        self.symbols = np.asarray(symbols, dtype=str)
+        self.columns = {
+            stat: np.asarray(columns[stat], dtype="float64")
+            for stat in STAT_COLUMNS
+        }
+        for values in self.columns.values():
+            if values.shape != self.symbols.shape:
+                raise ValueError("every column must have one value a symbol")
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self._index = {symbol: row for row, symbol in enumerate(symbols)}
+
+    @classmethod
+    def from_live_data(cls, raw_data: dict) -> "MarketSnapshot":
+        """Build a snapshot from the expanded live API response in a single
+        pass over the rates, missing stats are 0 like in Crypto
+
+        Args:
+            raw_data (dict): the live API response with "rates"
+
+        Returns:
+            MarketSnapshot: the snapshot
+        """
+
+        if not isinstance(raw_data, dict):
+            raise TypeError("raw_data must be a dict")
+
+        rates = raw_data["rates"]
+        values = np.array(
+            [
+                [rate_data.get(stat) or 0 for stat in STAT_COLUMNS]
+                for rate_data in rates.values()
+            ],
+            dtype="float64"
+        ).reshape(len(rates), len(STAT_COLUMNS))
+        columns = {
+            stat: values[:, position]
+            for position, stat in enumerate(STAT_COLUMNS)
+        }
+        return cls(list(rates.keys()), columns, raw_data.get("timestamp"))
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def get_crypto_stat(self, symbol: str) -> dict or None:
+        """Return the stats of one symbol in the format fed to Crypto
+
+        Args:
+            symbol (str): Crypto symbol, i.e., BTC
+
+        Returns:
+            dict or None: the crypto stat, None if not in the snapshot
+        """
+
+        row = self._index.get(symbol)
+        if row is None:
+            return None
+        return {stat: self.columns[stat][row].item() for stat in STAT_COLUMNS}
+
+    def validate_crypto_stats(self) -> np.ndarray:
+        """Check every symbol at once like Crypto.validate_crypto_stat
+
+        Returns:
+            np.ndarray: boolean mask, True where no stat is missing
+        """
+
+        mask = np.ones(len(self.symbols), dtype=bool)
+        for stat in VALIDATED_COLUMNS:
+            mask &= self.columns[stat] != 0
+        return mask
+
+    def sample(
+        self,
+        n: int,
+        valid_only: bool = True,
+        rng: np.random.Generator = None
+    ) -> list:
+        """Pick n different symbols at random
+
+        Args:
+            n (int): the number of symbols
+            valid_only (bool, optional): only pick symbols with every stat.
+            Defaults to True.
+            rng (np.random.Generator, optional): the random generator.
+            Defaults to a new unseeded generator.
+
+        Returns:
+            list: up to n symbols, fewer if the snapshot has not enough
+        """
+
+        if not isinstance(n, int) or n < 0:
+            raise ValueError("n must be a non-negative integer")
+        if rng is None:
+            rng = np.random.default_rng()
+
+        candidates = self.symbols
+        if valid_only:
+            candidates = candidates[self.validate_crypto_stats()]
+        picked = rng.choice(
+            candidates, size=min(n, len(candidates)), replace=False
+        )
+        return picked.tolist()
+
+    def top(self, by: str, n: int = 10, key=None) -> pd.DataFrame:
+        """Return the n symbols with the largest value of a stat
+
+        Args:
+            by (str): one of the STAT_COLUMNS
+            n (int, optional): the number of symbols. Defaults to 10.
+            key (callable, optional): function applied to the column before
+            ranking, i.e., np.abs. Defaults to None.
+
+        Raises:
+            ValueError: If by is not a stat column
+
+        Returns:
+            pd.DataFrame: the rows of the n symbols, largest first
+        """
+
+        if by not in self.columns:
+            raise ValueError(f"Invalid column: {by}")
+        if not isinstance(n, int) or n <= 0:
+            raise ValueError("n must be a positive integer")
+
+        values = self.columns[by]
+        if key is not None:
+            values = key(values)
+        n = min(n, len(values))
+        if n == 0:
+            return self.to_frame().iloc[0:0]
+        # Partial sort: only the top n rows are ordered
+        rows = np.argpartition(-values, n - 1)[:n]
+        rows = rows[np.argsort(-values[rows], kind="stable")]
+        return self.to_frame(rows)
+
+    def top_movers(self, n: int = 10) -> pd.DataFrame:
+        return self.top("change_pct", n, key=np.abs)
+
+    def top_volume(self, n: int = 10) -> pd.DataFrame:
+        return self.top("vol", n)
+
+    def top_cap(self, n: int = 10) -> pd.DataFrame:
+        return self.top("cap", n)
+
+    def to_frame(self, rows=None) -> pd.DataFrame:
+        """Return the snapshot, or some of its rows, as a DataFrame
+
+        Args:
+            rows (array-like, optional): row positions. Defaults to all.
+
+        Returns:
+            pd.DataFrame: one row per symbol, indexed by symbol
+        """
+
+        if rows is None:
+            rows = slice(None)
+        frame = pd.DataFrame(
+            {stat: self.columns[stat][rows] for stat in STAT_COLUMNS},
+            index=pd.Index(self.symbols[rows], name="symbol")
+        )
+        return frame
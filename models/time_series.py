@@ -0,0 +1,207 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Time series class, a compact array-backed store of daily crypto rates
+'''
+
+import numpy as np
+import pandas as pd
+
+
+# pandas and Arrow use nanosecond timestamps, so they can share the buffer
+DATE_DTYPE = "datetime64[ns]"
+RATE_DTYPE = "float64"
+
+
+class TimeSeries:
+    """The TimeSeries class stores daily rates in two NumPy arrays sorted by
+    date, with spare capacity so new days are appended without reallocating
+    the whole series
+
+    Attributes:
+        - dates: datetime64 array of the dates, oldest first
+        - rates: float64 array of the rates, NaN where a day is missing
+
+    Methods:
+        - from_historical_data: build a series from [(DATE, RATE), ...]
+        - append: add a day after the latest one
+        - slice: return the days within a date range without copying
+        - to_frame: return a DataFrame sharing the arrays
+        - to_arrow: return an Arrow table
+        - to_list: return [(DATE, RATE), ...]
+    """
+    def __init__(self, dates=None, rates=None) -> None:
+        """Constructor for the time series
+
+        Args:
+            dates (array-like, optional): dates sorted from oldest to latest.
+            Defaults to None.
+            rates (array-like, optional): the rate of each date.
+            Defaults to None.
+
+        Raises:
+            ValueError: If the lengths differ or the dates are not sorted
+        """
+
+        dates = np.asarray([] if dates is None else dates, dtype=DATE_DTYPE)
+        rates = np.asarray([] if rates is None else rates, dtype=RATE_DTYPE)
+        if dates.ndim != 1 or dates.shape != rates.shape:
+            raise ValueError("dates and rates must have the same length")
+        if len(dates) > 1 and np.any(dates[1:] <= dates[:-1]):
+            raise ValueError("dates must be strictly increasing")
+
+        self._dates = dates
+        self._rates = rates
+        self._size = len(dates)
+
+    @classmethod
+    def from_historical_data(cls, historical_data: list) -> "TimeSeries":
+        """Build a time series from the historical data of the helpers
+
+        Args:
+            historical_data (list): [(DATE, RATE), ...] from oldest to
+            latest, a None rate marks a missing day
+
+        Returns:
+            TimeSeries: the time series
+        """
+
+        if not isinstance(historical_data, list):
+            raise TypeError("historical_data must be a list")
+        if not historical_data:
+            return cls()
+
+        date_list, rate_list = zip(*historical_data)
+        rates = np.array(
+            [np.nan if rate is None else rate for rate in rate_list],
+            dtype=RATE_DTYPE
+        )
+        return cls(date_list, rates)
+
+    @property
+    def dates(self) -> np.ndarray:
+        return self._dates[:self._size]
+
+    @property
+    def rates(self) -> np.ndarray:
+        return self._rates[:self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"TimeSeries({self.to_list()})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TimeSeries):
+            return NotImplemented
+        return (
+            np.array_equal(self.dates, other.dates)
+            and np.array_equal(self.rates, other.rates, equal_nan=True)
+        )
+
+    def append(self, date, rate) -> None:
+        """Add one day after the latest one. The arrays double in capacity
+        when full, so appending is amortised O(1)
+
+        Args:
+            date: the date, i.e., "2023-11-30"
+            rate (float or None): the rate, None for a missing day
+
+        Raises:
+            ValueError: If the date is not after the latest date
+        """
+
+        date = np.datetime64(date, "ns")
+        if self._size and date <= self._dates[self._size - 1]:
+            raise ValueError("date must be after the latest date")
+
+        if self._size == len(self._dates):
+            capacity = max(8, 2 * len(self._dates))
+            self._dates = np.resize(self._dates, capacity)
+            self._rates = np.resize(self._rates, capacity)
+        self._dates[self._size] = date
+        self._rates[self._size] = np.nan if rate is None else rate
+        self._size += 1
+
+    def slice(self, start=None, end=None) -> "TimeSeries":
+        """Return the days between start and end, both included, as a
+        series sharing this one's arrays
+
+        Args:
+            start (optional): the first date. Defaults to the oldest.
+            end (optional): the last date. Defaults to the latest.
+
+        Returns:
+            TimeSeries: the days within the range
+        """
+
+        first = 0
+        last = self._size
+        if start is not None:
+            first = np.searchsorted(
+                self.dates, np.datetime64(start, "ns"), side="left"
+            )
+        if end is not None:
+            last = np.searchsorted(
+                self.dates, np.datetime64(end, "ns"), side="right"
+            )
+        series = TimeSeries()
+        series._dates = self.dates[first:last]
+        series._rates = self.rates[first:last]
+        series._size = len(series._dates)
+        return series
+
+    def to_frame(
+        self,
+        date_column: str = "DATE",
+        rate_column: str = "CRYPTO"
+    ) -> pd.DataFrame:
+        """Return a DataFrame of the series without copying the arrays
+
+        Args:
+            date_column (str, optional): Defaults to "DATE".
+            rate_column (str, optional): Defaults to "CRYPTO".
+
+        Returns:
+            pd.DataFrame: the dates and rates columns
+        """
+
+        return pd.DataFrame(
+            {date_column: self.dates, rate_column: self.rates},
+            copy=False
+        )
+
+    def to_arrow(
+        self,
+        date_column: str = "DATE",
+        rate_column: str = "CRYPTO"
+    ):
+        """Return an Arrow table of the series, pyarrow is installed along
+        with streamlit
+
+        Returns:
+            pyarrow.Table: the dates and rates columns
+        """
+
+        import pyarrow as pa
+
+        return pa.table({
+            date_column: pa.array(self.dates),
+            rate_column: pa.array(self.rates, from_pandas=True)
+        })
+
+    def to_list(self) -> list:
+        """Return the series in the historical data format
+
+        Returns:
+            list: [(DATE, RATE), ...] with dates in YYYY-MM-DD format and
+            None for missing days
+        """
+
+        date_list = np.datetime_as_string(self.dates, unit="D").tolist()
+        rate_list = [
+            None if np.isnan(rate) else rate for rate in self.rates.tolist()
+        ]
+        return list(zip(date_list, rate_list))
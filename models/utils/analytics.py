@@ -0,0 +1,208 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Analytics helper functions computing indicators over the historical rates
+of one or many cryptos at once
+
+Every function works on a rate frame: one row per date, one column per
+symbol, so an indicator is computed for all symbols in one vectorised pass.
+'''
+
+import numpy as np
+import pandas as pd
+from models.crypto import Crypto
+
+
+# Default windows in days, sized for the 7-day history of the Search page
+SMA_WINDOW = 3
+EMA_SPAN = 3
+VOLATILITY_WINDOW = 3
+
+INDICATOR_COLUMNS = [
+    "rate",
+    "total_return",
+    "volatility",
+    "sma",
+    "ema",
+    "max_drawdown"
+]
+
+
+def build_rate_frame(cryptos: list) -> pd.DataFrame:
+    """Combine the historical data of many cryptos into one rate frame
+
+    Args:
+        cryptos (list): list of crypto objects
+
+    Returns:
+        pd.DataFrame: rates indexed by date with one column per symbol,
+        NaN where a crypto has no rate for a date
+    """
+
+    if not isinstance(cryptos, list):
+        raise TypeError("cryptos must be a list")
+
+    columns = {}
+    for crypto in cryptos:
+        if not isinstance(crypto, Crypto):
+            raise TypeError("cryptos must be a list of Crypto objects")
+        series = crypto.time_series
+        columns[crypto.symbol] = pd.Series(
+            series.rates, index=series.dates, copy=False
+        )
+    if not columns:
+        return pd.DataFrame(dtype="float64")
+    rate_frame = pd.DataFrame(columns).sort_index()
+    # The API reports 0 when it has no rate for a symbol on a date
+    rate_frame = rate_frame.mask(rate_frame == 0)
+    rate_frame.index.name = "DATE"
+    return rate_frame
+
+
+def compute_returns(rate_frame: pd.DataFrame) -> pd.DataFrame:
+    """Daily simple returns, missing days are not filled
+
+    Args:
+        rate_frame (pd.DataFrame): rates indexed by date
+
+    Returns:
+        pd.DataFrame: the returns, NaN on the first day
+    """
+
+    return rate_frame.pct_change(fill_method=None)
+
+
+def compute_sma(
+    rate_frame: pd.DataFrame,
+    window: int = SMA_WINDOW
+) -> pd.DataFrame:
+    """Simple moving average over window days
+
+    Args:
+        rate_frame (pd.DataFrame): rates indexed by date
+        window (int, optional): Defaults to SMA_WINDOW.
+
+    Returns:
+        pd.DataFrame: the moving averages
+    """
+
+    return rate_frame.rolling(window, min_periods=1).mean()
+
+
+def compute_ema(
+    rate_frame: pd.DataFrame,
+    span: int = EMA_SPAN
+) -> pd.DataFrame:
+    """Exponential moving average with the given span in days
+
+    Args:
+        rate_frame (pd.DataFrame): rates indexed by date
+        span (int, optional): Defaults to EMA_SPAN.
+
+    Returns:
+        pd.DataFrame: the moving averages
+    """
+
+    return rate_frame.ewm(span=span, adjust=False, ignore_na=True).mean()
+
+
+def compute_rolling_volatility(
+    rate_frame: pd.DataFrame,
+    window: int = VOLATILITY_WINDOW
+) -> pd.DataFrame:
+    """Rolling standard deviation of the daily returns
+
+    Args:
+        rate_frame (pd.DataFrame): rates indexed by date
+        window (int, optional): Defaults to VOLATILITY_WINDOW.
+
+    Returns:
+        pd.DataFrame: the rolling volatility
+    """
+
+    return compute_returns(rate_frame).rolling(window, min_periods=2).std()
+
+
+def compute_max_drawdown(rate_frame: pd.DataFrame) -> pd.Series:
+    """Largest fall from a previous peak, i.e., -0.2 for a 20% drop
+
+    Args:
+        rate_frame (pd.DataFrame): rates indexed by date
+
+    Returns:
+        pd.Series: the max drawdown of each symbol
+    """
+
+    return (rate_frame / rate_frame.cummax() - 1).min()
+
+
+def compute_correlation(rate_frame: pd.DataFrame) -> pd.DataFrame:
+    """Correlation between the daily returns of every pair of symbols
+
+    Args:
+        rate_frame (pd.DataFrame): rates indexed by date
+
+    Returns:
+        pd.DataFrame: symbol by symbol correlation matrix
+    """
+
+    return compute_returns(rate_frame).corr()
+
+
+def compute_indicators(
+    rate_frame: pd.DataFrame,
+    sma_window: int = SMA_WINDOW,
+    ema_span: int = EMA_SPAN
+) -> pd.DataFrame:
+    """Compute every indicator for every symbol of a rate frame
+
+    Args:
+        rate_frame (pd.DataFrame): rates indexed by date
+        sma_window (int, optional): Defaults to SMA_WINDOW.
+        ema_span (int, optional): Defaults to EMA_SPAN.
+
+    Returns:
+        pd.DataFrame: one row per symbol with the INDICATOR_COLUMNS
+    """
+
+    if not isinstance(rate_frame, pd.DataFrame):
+        raise TypeError("rate_frame must be a DataFrame")
+
+    if rate_frame.empty:
+        indicators = pd.DataFrame(
+            np.nan, index=rate_frame.columns, columns=INDICATOR_COLUMNS
+        )
+        indicators.index.name = "SYMBOL"
+        return indicators
+
+    # Latest and first known rate of each symbol, skipping missing days
+    latest = rate_frame.ffill().iloc[-1]
+    first = rate_frame.bfill().iloc[0]
+    indicators = pd.DataFrame({
+        "rate": latest,
+        "total_return": latest / first - 1,
+        "volatility": compute_returns(rate_frame).std(),
+        "sma": compute_sma(rate_frame, sma_window).ffill().iloc[-1],
+        "ema": compute_ema(rate_frame, ema_span).ffill().iloc[-1],
+        "max_drawdown": compute_max_drawdown(rate_frame)
+    }, columns=INDICATOR_COLUMNS)
+    indicators.index.name = "SYMBOL"
+    return indicators
+
+
+def compute_crypto_indicators(crypto: Crypto) -> dict:
+    """Compute every indicator for one crypto
+
+    Args:
+        crypto (Crypto): the crypto object
+
+    Returns:
+        dict: {indicator: value} for the INDICATOR_COLUMNS
+    """
+
+    if not isinstance(crypto, Crypto):
+        raise TypeError("crypto must be a Crypto object")
+
+    indicators = compute_indicators(build_rate_frame([crypto]))
+    return indicators.loc[crypto.symbol].to_dict()
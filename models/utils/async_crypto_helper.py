@@ -0,0 +1,165 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Async counterparts of the crypto helper functions, so the requests of one
+page can overlap instead of running one after another
+
+The requests still go through fetch_data and its pooled HTTP client, run in
+worker threads, so caching, retries and error types stay the same as in the
+synchronous helpers.
+'''
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import models.utils.crypto_helper as crypto_helper
+from models.utils.crypto_helper import DAY_OF_WEEK, HISTORICAL_MAX_WORKERS
+from models.utils.history_store import HistoryStore
+from models.utils.tracing import submit
+
+
+async def fetch_name_of_cryptos() -> list or bool:
+    """Async version of crypto_helper.fetch_name_of_cryptos
+
+    Returns:
+        list or bool: a list of crypto names or False if not fetched
+    """
+
+    return await asyncio.to_thread(crypto_helper.fetch_name_of_cryptos)
+
+
+async def get_crypto_stat_from_live_api(symbol: str) -> dict or bool:
+    """Async version of crypto_helper.get_crypto_stat_from_live_api
+
+    Args:
+        symbol (str): The symbol of the crypto, i.e., BTC
+
+    Returns:
+        dict or bool: The crypto stat in dict format or False if the data is
+        not fetched
+    """
+
+    if not isinstance(symbol, str):
+        raise TypeError("symbol must be a string")
+
+    return await asyncio.to_thread(
+        crypto_helper.get_crypto_stat_from_live_api, symbol
+    )
+
+
+async def get_crypto_day_historical_data(
+    symbol: str,
+    time_day: int = DAY_OF_WEEK,
+    max_concurrency: int = HISTORICAL_MAX_WORKERS,
+    allow_partial: bool = False,
+    store: HistoryStore = None,
+    live_days: int = None
+) -> list or bool:
+    """Async version of crypto_helper.get_crypto_day_historical_data, the
+    missing days are gathered with at most max_concurrency requests in flight
+
+    Args:
+        symbol (str): Crypto symbol, i.e., BTC
+        time_day (int, optional): The days of data needed.
+        Defaults to DAY_OF_WEEK.
+        max_concurrency (int, optional): The maximum number of concurrent
+        requests. Defaults to HISTORICAL_MAX_WORKERS.
+        allow_partial (bool, optional): Mark the failed days with a None rate
+        instead of returning False or raising. Defaults to False.
+        store (HistoryStore, optional): The history store consulted first.
+        Defaults to None.
+        live_days (int, optional): Only the missing dates among the latest
+        live_days are fetched. Defaults to None, every date.
+
+    Returns:
+        list or bool: [(DATE, RATE), ...] from oldest to latest, or False if
+        the data is not fetched
+    """
+
+    if not isinstance(symbol, str):
+        raise TypeError("symbol must be a string")
+    if not isinstance(time_day, int):
+        raise TypeError("time_day must be an integer")
+    if not isinstance(max_concurrency, int) or max_concurrency <= 0:
+        raise ValueError("max_concurrency must be a positive integer")
+
+    date_list, stored_rates, missing_date_list = (
+        crypto_helper.prepare_historical_data(
+            symbol, time_day, store, live_days
+        )
+    )
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch_one_day(each_date: str) -> float or None:
+        async with semaphore:
+            return await asyncio.to_thread(
+                crypto_helper.fetch_historical_rate, symbol, each_date,
+                allow_partial
+            )
+
+    rate_list = await asyncio.gather(
+        *(fetch_one_day(each_date) for each_date in missing_date_list)
+    )
+    return crypto_helper.complete_historical_data(
+        symbol, date_list, stored_rates,
+        dict(zip(missing_date_list, rate_list)), allow_partial, store
+    )
+
+
+async def load_search_page(
+    symbol: str,
+    time_day: int = DAY_OF_WEEK,
+    store: HistoryStore = None,
+    allow_partial: bool = False,
+    live_days: int = None
+) -> tuple:
+    """Load everything the Search page shows for one crypto, with the live
+    quote and the historical days fetched at the same time
+
+    Args:
+        symbol (str): Crypto symbol, i.e., BTC
+        time_day (int, optional): The days of data needed.
+        Defaults to DAY_OF_WEEK.
+        store (HistoryStore, optional): The history store consulted first.
+        Defaults to None.
+        allow_partial (bool, optional): Mark the failed days with a None rate
+        instead of returning False. Defaults to False.
+        live_days (int, optional): Only the missing dates among the latest
+        live_days are fetched. Defaults to None, every date.
+
+    Returns:
+        tuple: (crypto stat or False, historical data or False)
+    """
+
+    if not isinstance(symbol, str):
+        raise TypeError("symbol must be a string")
+
+    crypto_stat, historical_data = await asyncio.gather(
+        asyncio.to_thread(crypto_helper.get_cached_crypto_stat, symbol),
+        get_crypto_day_historical_data(
+            symbol, time_day, allow_partial=allow_partial, store=store,
+            live_days=live_days
+        )
+    )
+    return crypto_stat, historical_data
+
+
+def run_sync(coroutine):
+    """Run a coroutine to completion from synchronous code such as a
+    streamlit script
+
+    Args:
+        coroutine: the coroutine to run
+
+    Returns:
+        the result of the coroutine
+    """
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    # This thread already runs an event loop, so use a fresh one elsewhere
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return submit(executor, asyncio.run, coroutine).result()
@@ -0,0 +1,259 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Backfill the history store over long date ranges for many symbols. Each
+request fetches one date for up to BACKFILL_CHUNK_SIZE symbols, progress is
+checkpointed after every date so an interrupted run resumes where it
+stopped, and requests never exceed a requests-per-second ceiling
+
+Run from the root directory:
+    $ python -m models.utils.backfill BTC ETH --start 2023-01-01 \
+--end 2023-06-30 --rps 2
+'''
+
+import argparse
+import datetime as dt
+import json
+import os
+import models.utils.crypto_helper as crypto_helper
+from models.utils.history_store import HistoryStore, HISTORY_DB_PATH
+from models.utils.http_client import CryptoAPIError, \
+    CryptoQuotaExceededError
+from models.utils.rate_limiter import TokenBucket
+
+
+# Requests per second of a backfill, on top of the process-wide limiter
+BACKFILL_RPS = 2
+# Symbols fetched by one historical request
+BACKFILL_CHUNK_SIZE = 100
+BACKFILL_CHECKPOINT_PATH = os.path.join(".cache", "backfill.json")
+
+
+class BackfillCheckpoint:
+    """The dates already backfilled for a set of symbols, saved to a JSON
+    file after every date. A checkpoint written for other symbols is
+    ignored
+
+    Methods:
+        - is_done: whether a date is already backfilled
+        - mark_done: record a date as backfilled and save the file
+        - count_done: the number of dates backfilled
+    """
+    def __init__(self, path: str, symbols: list) -> None:
+        """Constructor for the checkpoint, loading the file if it exists
+
+        Args:
+            path (str): the JSON file of the checkpoint
+            symbols (list): the symbols of the backfill
+        """
+
+        if not isinstance(path, str):
+            raise TypeError("path must be a string")
+        if not isinstance(symbols, list):
+            raise TypeError("symbols must be a list")
+
+        self.path = path
+        self.symbols = sorted(set(symbols))
+        self._done = self._load()
+
+    def is_done(self, date: str) -> bool:
+        return date in self._done
+
+    def mark_done(self, date: str) -> None:
+        self._done.add(date)
+        self._save()
+
+    def count_done(self) -> int:
+        return len(self._done)
+
+    def _load(self) -> set:
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return set()
+        if data.get("symbols") != self.symbols:
+            return set()
+        return set(data.get("done", []))
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Write then rename, so a crash never leaves a truncated file
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(
+                {"symbols": self.symbols, "done": sorted(self._done)}, file
+            )
+        os.replace(temp_path, self.path)
+
+
+def get_date_range(start: str, end: str) -> list:
+    """Return every date from start to end, both included
+
+    Args:
+        start (str): the first date in YYYY-MM-DD format
+        end (str): the last date in YYYY-MM-DD format
+
+    Raises:
+        ValueError: If a date is invalid or end is before start
+
+    Returns:
+        list: dates in YYYY-MM-DD format from oldest to latest
+    """
+
+    start_date = dt.date.fromisoformat(start)
+    end_date = dt.date.fromisoformat(end)
+    if end_date < start_date:
+        raise ValueError("end must not be before start")
+    return [
+        (start_date + dt.timedelta(days=day)).strftime("%Y-%m-%d")
+        for day in range((end_date - start_date).days + 1)
+    ]
+
+
+def backfill_history(
+    symbols: list,
+    start: str,
+    end: str,
+    store: HistoryStore,
+    checkpoint: BackfillCheckpoint = None,
+    rps: float = BACKFILL_RPS,
+    chunk_size: int = BACKFILL_CHUNK_SIZE,
+    limiter: TokenBucket = None
+) -> dict:
+    """Fetch the rates of many symbols over a date range into the store.
+    Symbols already stored for a date are not fetched again, and a failed
+    date is skipped instead of aborting the run, so running again retries
+    only what is missing
+
+    Args:
+        symbols (list): the symbols, i.e., ["BTC", "ETH"]
+        start (str): the first date in YYYY-MM-DD format
+        end (str): the last date in YYYY-MM-DD format, must be before today
+        store (HistoryStore): the history store to fill
+        checkpoint (BackfillCheckpoint, optional): dates already done,
+        updated after every date. Defaults to None.
+        rps (float, optional): the most requests per second.
+        Defaults to BACKFILL_RPS.
+        chunk_size (int, optional): the symbols fetched by one request.
+        Defaults to BACKFILL_CHUNK_SIZE.
+        limiter (TokenBucket, optional): the limiter enforcing rps.
+        Defaults to a new one.
+
+    Raises:
+        TypeError
+        ValueError
+        CryptoQuotaExceededError: If the request budget is used up, the
+        dates done so far are kept in the checkpoint
+
+    Returns:
+        dict: requests, saved (rates), skipped (dates from the checkpoint)
+        and failed (dates)
+    """
+
+    if not isinstance(symbols, list) or not symbols:
+        raise ValueError("symbols must be a non-empty list")
+    if not isinstance(store, HistoryStore):
+        raise TypeError("store must be a HistoryStore")
+    if rps <= 0:
+        raise ValueError("rps must be positive")
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer")
+
+    if dt.date.fromisoformat(end) >= dt.date.today():
+        raise ValueError("end must be before today")
+    date_list = get_date_range(start, end)
+    if limiter is None:
+        limiter = TokenBucket(rps)
+
+    symbols = list(dict.fromkeys(symbols))
+    # {symbol: {date: rate}} already stored, read once per symbol
+    stored_rates = {
+        symbol: store.get_rates(symbol, date_list) for symbol in symbols
+    }
+    summary = {"requests": 0, "saved": 0, "skipped": 0, "failed": []}
+
+    for each_date in date_list:
+        if checkpoint is not None and checkpoint.is_done(each_date):
+            summary["skipped"] += 1
+            continue
+
+        missing_symbols = [
+            symbol for symbol in symbols
+            if each_date not in stored_rates[symbol]
+        ]
+        failed = False
+        for first in range(0, len(missing_symbols), chunk_size):
+            chunk = missing_symbols[first:first + chunk_size]
+            limiter.acquire()
+            summary["requests"] += 1
+            try:
+                rates = crypto_helper.fetch_historical_rates(chunk, each_date)
+            except CryptoQuotaExceededError:
+                raise
+            except CryptoAPIError:
+                # i.e., a timeout, the date is retried by the next run
+                rates = None
+            if rates is None:
+                failed = True
+                continue
+            summary["saved"] += store.save_date_rates(each_date, rates)
+
+        if failed:
+            summary["failed"].append(each_date)
+        elif checkpoint is not None:
+            checkpoint.mark_done(each_date)
+    return summary
+
+
+def main() -> None:
+    yesterday = dt.date.today() - dt.timedelta(days=1)
+    parser = argparse.ArgumentParser(
+        description="Backfill the history store over a date range"
+    )
+    parser.add_argument("symbols", nargs="+", help="i.e., BTC ETH DOGE")
+    parser.add_argument("--start", required=True, help="YYYY-MM-DD")
+    parser.add_argument(
+        "--end", default=yesterday.strftime("%Y-%m-%d"),
+        help="YYYY-MM-DD, defaults to yesterday"
+    )
+    parser.add_argument("--rps", type=float, default=BACKFILL_RPS)
+    parser.add_argument(
+        "--chunk-size", type=int, default=BACKFILL_CHUNK_SIZE
+    )
+    parser.add_argument("--db", default=HISTORY_DB_PATH)
+    parser.add_argument("--checkpoint", default=BACKFILL_CHECKPOINT_PATH)
+    args = parser.parse_args()
+
+    symbols = [symbol.upper() for symbol in args.symbols]
+    # Count the requests against the same monthly budget as the app
+    crypto_helper.enable_quota_budget()
+    store = HistoryStore(args.db)
+    checkpoint = BackfillCheckpoint(args.checkpoint, symbols)
+    try:
+        summary = backfill_history(
+            symbols, args.start, args.end, store, checkpoint,
+            args.rps, args.chunk_size
+        )
+    except CryptoQuotaExceededError:
+        print(
+            "Monthly API request budget is exhausted, run again next month "
+            "to resume from the checkpoint"
+        )
+        return
+    finally:
+        store.close()
+
+    print(
+        f"{summary['requests']} requests, {summary['saved']} rates saved, "
+        f"{summary['skipped']} dates already done"
+    )
+    if summary["failed"]:
+        print(f"Failed dates, run again to retry: {summary['failed']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Process-wide caches shared by every session of the streamlit server
+'''
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class RefreshingValue:
+    """A single value produced by a loader function and kept for ttl
+    seconds. Once stale, the old value keeps being returned while one
+    background thread reloads it, so a slow or failing reload never blocks
+    the caller
+
+    Attributes:
+        - loader: the function producing the value, a falsy result or an
+        exception counts as a failed load
+        - ttl: seconds before the value is considered stale
+
+    Methods:
+        - get: return the value, loading or refreshing it when needed
+        - invalidate: drop the value so the next get loads it again
+    """
+    def __init__(self, loader, ttl: float, clock=time.monotonic) -> None:
+        """Constructor for the refreshing value
+
+        Args:
+            loader (callable): function without arguments returning the value
+            ttl (float): seconds before the value is considered stale
+            clock (callable, optional): monotonic clock in seconds.
+            Defaults to time.monotonic.
+
+        Raises:
+            TypeError
+            ValueError
+        """
+
+        if not callable(loader):
+            raise TypeError("loader must be callable")
+        if not isinstance(ttl, (int, float)):
+            raise TypeError("ttl must be a number")
+        if ttl < 0:
+            raise ValueError("ttl must not be negative")
+
+        self.loader = loader
+        self.ttl = ttl
+        self._clock = clock
+        self._value = None
+        self._loaded_at = None
+        self._refreshing = False
+        self._refresh_thread = None
+        self._lock = threading.Lock()
+        # Serialises the blocking first load between sessions
+        self._load_lock = threading.Lock()
+
+    def get(self):
+        """Return the value, loading it on first use and refreshing it in
+        the background once stale
+
+        Returns:
+            the cached value, or the falsy loader result if the first load
+            failed
+        """
+
+        with self._lock:
+            if self._loaded_at is not None:
+                if (
+                    self._clock() - self._loaded_at >= self.ttl
+                    and not self._refreshing
+                ):
+                    self._refreshing = True
+                    self._refresh_thread = threading.Thread(
+                        target=self._refresh, daemon=True
+                    )
+                    self._refresh_thread.start()
+                return self._value
+
+        with self._load_lock:
+            # Another session may have loaded it while we waited
+            with self._lock:
+                if self._loaded_at is not None:
+                    return self._value
+            value = self.loader()
+            if value:
+                self._store(value)
+            return value
+
+    def invalidate(self) -> None:
+        """Drop the value so the next get loads it again"""
+
+        with self._lock:
+            self._value = None
+            self._loaded_at = None
+
+    def _refresh(self) -> None:
+        """Reload the value, keeping the stale one if the reload fails"""
+
+        try:
+            value = self.loader()
+            if value:
+                self._store(value)
+        except Exception:  # the stale value is still served
+            pass
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _store(self, value) -> None:
+        with self._lock:
+            self._value = value
+            self._loaded_at = self._clock()
+
+
+class TTLCache:
+    """Bounded mapping whose entries expire ttl seconds after being set.
+    When full, the least recently used entry is evicted
+
+    Attributes:
+        - maxsize: the maximum number of entries
+        - ttl: seconds before an entry expires
+        - hits: number of lookups served from the cache
+        - misses: number of lookups missing or expired
+
+    Methods:
+        - get: return a fresh value for a key
+        - get_stale: return a value for a key even if expired
+        - get_age: the seconds since the value of a key was stored
+        - set: store a value for a key, optionally with its own ttl
+        - clear: drop every entry and reset the counters
+        - count_stats: return the hit/miss counts and the size
+    """
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock=time.monotonic
+    ) -> None:
+        """Constructor for the ttl cache
+
+        Args:
+            maxsize (int): the maximum number of entries
+            ttl (float): seconds before an entry expires
+            clock (callable, optional): monotonic clock in seconds.
+            Defaults to time.monotonic.
+
+        Raises:
+            TypeError
+            ValueError
+        """
+
+        if not isinstance(maxsize, int):
+            raise TypeError("maxsize must be an integer")
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        if not isinstance(ttl, (int, float)):
+            raise TypeError("ttl must be a number")
+        if ttl < 0:
+            raise ValueError("ttl must not be negative")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        # {key: (stored_at, value, ttl or None)}, least recently used first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the value of a key if it has not expired
+
+        Args:
+            key: the cache key
+            default (optional): returned on a miss. Defaults to None.
+
+        Returns:
+            the cached value or default
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._is_expired(entry):
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def get_stale(self, key, default=None):
+        """Return the value of a key even if it has expired, without
+        counting a hit or a miss
+
+        Args:
+            key: the cache key
+            default (optional): returned if the key is not cached.
+            Defaults to None.
+
+        Returns:
+            the cached value or default
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            return entry[1]
+
+    def set(self, key, value, ttl: float = None) -> None:
+        """Store the value of a key, evicting the least recently used entry
+        when full
+
+        Args:
+            key: the cache key
+            value: the value to store
+            ttl (float, optional): seconds before this entry expires.
+            Defaults to None, the ttl of the cache.
+        """
+
+        with self._lock:
+            self._entries[key] = (self._clock(), value, ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_age(self, key) -> float or None:
+        """Return the seconds since the value of a key was stored, even if
+        it has expired, without counting a hit or a miss
+
+        Args:
+            key: the cache key
+
+        Returns:
+            float or None: the age in seconds, None if the key is not cached
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            return self._clock() - entry[0]
+
+    def _is_expired(self, entry: tuple) -> bool:
+        ttl = self.ttl if entry[2] is None else entry[2]
+        return self._clock() - entry[0] >= ttl
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters"""
+
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def count_stats(self) -> dict:
+        """Return the hit/miss counts and the number of entries
+
+        Returns:
+            dict: {"hits": int, "misses": int, "size": int}
+        """
+
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries)
+            }
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key, so only the first caller
+    runs the function and the others wait for its result
+
+    Attributes:
+        - coalesced: number of calls that waited for another caller
+
+    Methods:
+        - do: run a function once per key among concurrent callers
+        - do_many: run a function once for the keys of a call that no other
+        caller is running, and wait for the others
+    """
+    def __init__(self) -> None:
+        self.coalesced = 0
+        # {key: [done event, result, exception]}
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, function):
+        """Run function for key unless another caller is already running it,
+        in which case wait and share its result
+
+        Args:
+            key: the key identifying the call
+            function (callable): function without arguments
+
+        Returns:
+            the result of function
+
+        Raises:
+            the exception raised by function
+        """
+
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = [threading.Event(), None, None]
+                self._calls[key] = call
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            call[0].wait()
+        else:
+            try:
+                call[1] = function()
+            except Exception as e:
+                call[2] = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call[0].set()
+
+        if call[2] is not None:
+            raise call[2]
+        return call[1]
+
+    def do_many(self, keys, function) -> dict:
+        """Run function once for the keys no other caller is running it for,
+        and wait for the calls already running the other keys, so callers
+        asking for overlapping keys, i.e., symbols, share the work per key
+
+        Args:
+            keys (iterable): the keys identifying the work
+            function (callable): called with the list of keys this caller
+            runs, returning one result for all of them
+
+        Returns:
+            dict: {key: result of the call that ran key}
+
+        Raises:
+            the exception raised by function for any of the keys
+        """
+
+        own_call = [threading.Event(), None, None]
+        own_keys = []
+        calls = {}
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                call = self._calls.get(key)
+                if call is None:
+                    call = self._calls[key] = own_call
+                    own_keys.append(key)
+                calls[key] = call
+            if len(own_keys) < len(calls):
+                self.coalesced += 1
+
+        # Run our keys before waiting, so two callers waiting on each
+        # other's keys never block each other
+        if own_keys:
+            try:
+                own_call[1] = function(own_keys)
+            except Exception as e:
+                own_call[2] = e
+            finally:
+                with self._lock:
+                    for key in own_keys:
+                        del self._calls[key]
+                own_call[0].set()
+
+        results = {}
+        for key, call in calls.items():
+            call[0].wait()
+            if call[2] is not None:
+                raise call[2]
+            results[key] = call[1]
+        return results
@@ -0,0 +1,220 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Record and replay of the coinlayer API responses, so the app can be run and
+benchmarked offline with the latency and errors of production
+
+The cassette is a transport adapter mounted on the session of the HTTP
+client, so retries, error types, caching and rate limiting behave exactly as
+with the real API. Responses are appended to a gzip file of JSON lines, one
+{"url", "status", "body", "today"} object each, with the access key
+stripped. The historical urls hold dates relative to the day they were
+recorded on, so a replay pins today to that day, see crypto_helper.get_today.
+'''
+
+import datetime as dt
+import gzip
+import json
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import requests
+from requests.adapters import HTTPAdapter
+
+
+CASSETTE_MODES = ["record", "replay"]
+# Query parameters never written to a cassette
+SECRET_PARAMETERS = ["access_key"]
+
+
+class CassetteAdapter(HTTPAdapter):
+    """Transport adapter recording the API responses to a cassette, or
+    serving them from it without network
+
+    Attributes:
+        - path: the gzip file of the cassette
+        - mode: "record" or "replay"
+        - latency: seconds added to every replayed response
+        - jitter: random seconds added on top of latency
+        - error_rate: share of replayed requests failing, half with a 503
+        response and half with a timeout
+        - today: the day the replayed responses were recorded on, the
+        latest if several, None if unknown
+
+    Methods:
+        - send: answer one request, called by the requests session
+        - count_stats: return the recorded, replayed, missed and injected
+        error counters
+    """
+    def __init__(
+        self,
+        path: str,
+        mode: str = "replay",
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = None,
+        **kwargs
+    ) -> None:
+        """Constructor for the cassette adapter
+
+        Args:
+            path (str): the gzip file of the cassette
+            mode (str, optional): "record" or "replay".
+            Defaults to "replay".
+            latency (float, optional): seconds added to every replayed
+            response. Defaults to 0.0.
+            jitter (float, optional): random seconds added on top of latency.
+            Defaults to 0.0.
+            error_rate (float, optional): share of replayed requests failing.
+            Defaults to 0.0.
+            seed (int, optional): seed of the jitter and errors, for
+            reproducible runs. Defaults to None.
+            **kwargs: passed on to HTTPAdapter, i.e., pool_maxsize
+
+        Raises:
+            TypeError
+            ValueError
+        """
+
+        if not isinstance(path, str):
+            raise TypeError("path must be a string")
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"mode must be one of {CASSETTE_MODES}")
+        if latency < 0 or jitter < 0:
+            raise ValueError("latency and jitter must not be negative")
+        if not 0 <= error_rate <= 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        super().__init__(**kwargs)
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {"recorded": 0, "replayed": 0, "missed": 0, "errors": 0}
+        self.today = None
+        # {url: (status, body)}, the latest recording of each url wins
+        self._responses = self._load() if mode == "replay" else {}
+
+    def send(self, request, **kwargs) -> requests.Response:
+        """Answer one request from the cassette, or from the network while
+        recording it
+
+        Args:
+            request (requests.PreparedRequest): the request
+
+        Returns:
+            requests.Response: the response
+        """
+
+        url = strip_secrets(request.url)
+        if self.mode == "record":
+            response = super().send(request, **kwargs)
+            if response.status_code == 200:
+                self._record(url, response.status_code, response.text)
+            return response
+
+        time.sleep(self.latency + self._random.uniform(0, self.jitter))
+        if self._random.random() < self.error_rate:
+            with self._lock:
+                self._stats["errors"] += 1
+            if self._random.random() < 0.5:
+                raise requests.exceptions.ReadTimeout(
+                    f"Injected timeout for {url}", request=request
+                )
+            return build_response(request, 503, "")
+
+        recorded = self._responses.get(url)
+        with self._lock:
+            self._stats["missed" if recorded is None else "replayed"] += 1
+        if recorded is None:
+            return build_response(
+                request, 404, f"No recorded response for {url}"
+            )
+        return build_response(request, *recorded)
+
+    def count_stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+    def _load(self) -> dict:
+        responses = {}
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as file:
+                for line in file:
+                    entry = json.loads(line)
+                    responses[entry["url"]] = (entry["status"], entry["body"])
+                    if entry.get("today"):
+                        today = dt.date.fromisoformat(entry["today"])
+                        self.today = max(self.today or today, today)
+        except FileNotFoundError:
+            pass
+        return responses
+
+    def _record(self, url: str, status: int, body: str) -> None:
+        line = json.dumps(
+            {
+                "url": url,
+                "status": status,
+                "body": body,
+                "today": dt.date.today().isoformat()
+            },
+            separators=(",", ":")
+        )
+        directory = os.path.dirname(self.path)
+        with self._lock:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Every append is a gzip member of its own, read back as one
+            # stream
+            with gzip.open(self.path, "at", encoding="utf-8") as file:
+                file.write(line + "\n")
+            self._stats["recorded"] += 1
+
+
+def strip_secrets(url: str) -> str:
+    """Remove the access key and other secrets from a url
+
+    Args:
+        url (str): the url
+
+    Returns:
+        str: the url without the SECRET_PARAMETERS
+    """
+
+    parts = urlsplit(url)
+    query = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name not in SECRET_PARAMETERS
+    ]
+    return urlunsplit(parts._replace(query=urlencode(query, safe=",")))
+
+
+def build_response(request, status: int, body: str) -> requests.Response:
+    """Build the response of a request without network
+
+    Args:
+        request (requests.PreparedRequest): the request
+        status (int): the HTTP status
+        body (str): the JSON body
+
+    Returns:
+        requests.Response: the response
+    """
+
+    response = requests.Response()
+    response.status_code = status
+    response.reason = "OK" if status == 200 else "Replayed error"
+    response._content = body.encode("utf-8")
+    response.encoding = "utf-8"
+    response.headers["Content-Type"] = "application/json"
+    response.url = request.url
+    response.request = request
+    return response
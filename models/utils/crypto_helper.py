@@ -7,53 +7,333 @@ to feed into Crypto class
 '''
 
 import datetime as dt
-import requests
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from models.utils.http_client import HttpClient, CryptoAPIError, \
+    CryptoQuotaExceededError
+from models.utils.rate_limiter import TokenBucket, QuotaBudget
+from models.market_snapshot import MarketSnapshot
+from models.crypto_metadata import CryptoMetadataStore
+from models.utils.cache import RefreshingValue, TTLCache, SingleFlight
+from models.utils.history_store import HistoryStore
+from models.utils.cassette import CassetteAdapter
+from models.utils.tracing import span, traced, submit
+from models.utils.metrics import REGISTRY, CACHE_HIT_RATIO, hit_ratio
 
+logger = logging.getLogger(__name__)
 
 # Define API endpoints and API key
 API_KEY = "REPLACE_WITH_YOUR_API_KEY"
-LIST_ENDPOINT = "http://api.coinlayer.com/list?access_key={api_key}"
-LIVE_DATA = "http://api.coinlayer.com/live?access_key={api_key}&symbols={symbol}&expand=1"
-HISTORICAL_DATE = "http://api.coinlayer.com/{date}?access_key={api_key}&symbols={symbol}"
+# Set COINLAYER_API_BASE_URL to use another server, i.e., the local stand-in
+# of benchmarks/mock_coinlayer.py
+API_BASE_URL = os.environ.get(
+    "COINLAYER_API_BASE_URL", "http://api.coinlayer.com"
+).rstrip("/")
+LIST_ENDPOINT = API_BASE_URL + "/list?access_key={api_key}"
+LIVE_DATA = API_BASE_URL + "/live?access_key={api_key}&symbols={symbol}&expand=1"
+HISTORICAL_DATE = API_BASE_URL + "/{date}?access_key={api_key}&symbols={symbol}"
+LIVE_MARKET_DATA = API_BASE_URL + "/live?access_key={api_key}&expand=1"
 DAY_OF_WEEK = 7
+# Keep the comma-joined symbols query at a safe URL length
+LIVE_SYMBOLS_CHUNK_SIZE = 100
+# Cap on concurrent requests when fetching historical days
+HISTORICAL_MAX_WORKERS = 7
+# Latest days of a long timeframe fetched live when missing from the history
+# store, older days are only read from it, see models/utils/backfill.py
+HISTORICAL_LIVE_DAYS = 30
+# Seconds before the cached crypto list is refreshed
+NAME_LIST_TTL = 60 * 60
+# Seconds a live quote is shared between sessions, and how many are kept
+QUOTE_CACHE_TTL = 60
+QUOTE_CACHE_SIZE = 512
+# Seconds before the cached market snapshot is refreshed
+MARKET_SNAPSHOT_TTL = 60
+# Keep-alive connections kept per host by the HTTP client
+HTTP_POOL_SIZE = 10
+# Client-side rate limit of the API requests
+RATE_LIMIT_PER_SECOND = 5
+RATE_LIMIT_BURST = 10
+# Monthly request budget of the coinlayer plan, see enable_quota_budget
+MONTHLY_REQUEST_BUDGET = 5000
+QUOTA_FILE_PATH = os.path.join(".cache", "quota.json")
+# Offline record or replay of the API responses, see use_cassette. Set
+# COINLAYER_CASSETTE_MODE to "record" or "replay" to enable it at start up
+CASSETTE_MODE = os.environ.get("COINLAYER_CASSETTE_MODE")
+CASSETTE_PATH = os.environ.get(
+    "COINLAYER_CASSETTE_PATH",
+    os.path.join(".cache", "coinlayer.jsonl.gz")
+)
+REPLAY_LATENCY = float(os.environ.get("COINLAYER_REPLAY_LATENCY", 0))
+REPLAY_JITTER = float(os.environ.get("COINLAYER_REPLAY_JITTER", 0))
+REPLAY_ERROR_RATE = float(os.environ.get("COINLAYER_REPLAY_ERROR_RATE", 0))
+
+# Process-wide caches, looked up at call time so the fetchers can be patched
+_crypto_list_cache = RefreshingValue(
+    lambda: fetch_crypto_list(), NAME_LIST_TTL
+)
+_market_snapshot_cache = RefreshingValue(
+    lambda: fetch_market_snapshot(), MARKET_SNAPSHOT_TTL
+)
+_crypto_metadata = CryptoMetadataStore()
+# The crypto list the metadata was last updated from
+_crypto_metadata_source = None
+_crypto_metadata_lock = threading.Lock()
+_quote_cache = TTLCache(QUOTE_CACHE_SIZE, QUOTE_CACHE_TTL)
+_quote_flight = SingleFlight()
+_http_client = HttpClient(pool_size=HTTP_POOL_SIZE)
+_cassette = None
+_rate_limiter = TokenBucket(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+_quota_budget = None
+
+# Metrics of the API, served by models/utils/metrics.py
+API_REQUESTS = REGISTRY.counter(
+    "crypto_api_requests_total",
+    "Requests sent to the coinlayer API, retries included",
+    ("endpoint",)
+)
+API_LATENCY = REGISTRY.histogram(
+    "crypto_api_request_seconds",
+    "Seconds until the coinlayer API answered, retries included",
+    ("endpoint",)
+)
+API_ERRORS = REGISTRY.counter(
+    "crypto_api_errors_total",
+    "Failed coinlayer API requests by the error.type of the response or "
+    "the exception raised",
+    ("endpoint", "type")
+)
+API_IN_FLIGHT = REGISTRY.gauge(
+    "crypto_api_in_flight_requests",
+    "Requests to the coinlayer API waiting for an answer"
+)
+API_QUOTA_USED = REGISTRY.gauge(
+    "crypto_api_quota_used",
+    "Requests used this month out of the request budget"
+)
+API_QUOTA_LIMIT = REGISTRY.gauge(
+    "crypto_api_quota_limit",
+    "Requests allowed per month by the request budget"
+)
+API_QUOTA_USED.set_function(
+    lambda: _quota_budget.count_used() if _quota_budget else None
+)
+API_QUOTA_LIMIT.set_function(
+    lambda: _quota_budget.monthly_limit if _quota_budget else None
+)
+CACHE_HIT_RATIO.set_function(
+    lambda: hit_ratio(_quote_cache.count_stats()), cache="quote"
+)
 
 
 def fetch_data(api_url: str) -> dict or bool:
-    """Helper function to fetch data from API
+    """Helper function to fetch data from API through the pooled HTTP client
 
     Args:
         api_url (str): The API url to fetch data from
 
     Raises:
-        f: HTTPErrors, ConnectionErrors, TimeoutErrors, TooManyRedirects
+        CryptoHTTPError, CryptoConnectionError, CryptoTimeoutError,
+        CryptoRedirectError: subclasses of the matching requests exceptions
+        CryptoQuotaExceededError: the monthly request budget is used up
 
     Returns:
         dict or bool: The data from API in json format converted to dict
         or False if the data is not fetched successfully
     """
 
-    try:
-        response = requests.get(api_url, timeout=10)
-        response.raise_for_status()
+    endpoint = get_endpoint_name(api_url)
+    # Replayed requests never reach the API, so they are neither rate
+    # limited nor use any of the budget
+    replaying = is_replaying()
 
-        data = response.json()
+    def start_attempt() -> None:
+        # Called again before each retry, which is a request too
+        if not replaying:
+            _rate_limiter.acquire()
+            if _quota_budget is not None and not _quota_budget.consume():
+                raise CryptoQuotaExceededError(
+                    "Monthly API request budget is exhausted"
+                )
+        API_REQUESTS.inc(endpoint=endpoint)
+
+    with span(f"fetch_data {endpoint}") as fetch_span:
+        API_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            data = _http_client.get_json(
+                api_url, before_attempt=start_attempt
+            )
+        except Exception as error:
+            API_ERRORS.inc(endpoint=endpoint, type=type(error).__name__)
+            raise
+        finally:
+            API_LATENCY.observe(
+                time.perf_counter() - start, endpoint=endpoint
+            )
+            API_IN_FLIGHT.dec()
         if data["success"] is True:
             return data
 
-        # API ONLY debugging purpose
+        error_type = (data.get("error") or {}).get("type", "unknown")
+        API_ERRORS.inc(endpoint=endpoint, type=error_type)
         if data.get("error"):
-            print("FETCH ERROR TYPE: ", data["error"]["type"])
+            fetch_span.attributes["error"] = error_type
+        logger.warning("API error on %s: %s", endpoint, error_type)
+        return False
+
+
+def get_endpoint_name(api_url: str) -> str:
+    """Name the API endpoint of a url without its symbols or date, used to
+    label spans
+
+    Args:
+        api_url (str): The API url
+
+    Returns:
+        str: "/list", "/live" or "/historical"
+    """
+
+    path = urlsplit(api_url).path
+    endpoint = "/" + path.rstrip("/").rsplit("/", 1)[-1]
+    if endpoint in ["/list", "/live"]:
+        return endpoint
+    return "/historical"
+
+
+def is_replaying() -> bool:
+    """Whether the API responses are replayed from a cassette
+
+    Returns:
+        bool: True if replaying, see use_cassette
+    """
+
+    return _cassette is not None and _cassette.mode == "replay"
+
+
+def get_today() -> dt.date:
+    """Return today's date, or the day the replayed cassette was recorded
+    on, so the historical urls relative to today match the recorded ones
+
+    Returns:
+        dt.date: the date the historical days are counted back from
+    """
+
+    if is_replaying() and _cassette.today is not None:
+        return _cassette.today
+    return dt.date.today()
+
+
+def use_cassette(
+    path: str = CASSETTE_PATH,
+    mode: str = "replay",
+    latency: float = REPLAY_LATENCY,
+    jitter: float = REPLAY_JITTER,
+    error_rate: float = REPLAY_ERROR_RATE,
+    seed: int = None
+) -> CassetteAdapter or None:
+    """Record every API response to a cassette, or replay them from it
+    without network. Replaying adds synthetic latency and errors to
+    reproduce the behaviour of the real API
+
+    Args:
+        path (str, optional): the cassette file. Defaults to CASSETTE_PATH.
+        mode (str, optional): "record", "replay", or None to use the API
+        again. Defaults to "replay".
+        latency (float, optional): seconds added to every replayed response.
+        Defaults to REPLAY_LATENCY.
+        jitter (float, optional): random seconds added on top of latency.
+        Defaults to REPLAY_JITTER.
+        error_rate (float, optional): share of replayed requests failing.
+        Defaults to REPLAY_ERROR_RATE.
+        seed (int, optional): seed of the jitter and errors.
+        Defaults to None.
+
+    Returns:
+        CassetteAdapter or None: the cassette in use
+    """
+
+    global _http_client, _cassette
+    _http_client.close()
+    if mode is None:
+        _cassette = None
+        _http_client = HttpClient(pool_size=HTTP_POOL_SIZE)
+        return None
+
+    _cassette = CassetteAdapter(
+        path, mode, latency, jitter, error_rate, seed,
+        pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE
+    )
+    _http_client = HttpClient(pool_size=HTTP_POOL_SIZE, adapter=_cassette)
+    return _cassette
+
+
+def enable_quota_budget(
+    path: str = QUOTA_FILE_PATH,
+    monthly_limit: int = MONTHLY_REQUEST_BUDGET
+) -> QuotaBudget:
+    """Start counting the API requests against a monthly budget persisted
+    to path. Calling it again returns the budget already enabled
+
+    Args:
+        path (str, optional): the path of the json file.
+        Defaults to QUOTA_FILE_PATH.
+        monthly_limit (int, optional): the number of requests allowed per
+        month. Defaults to MONTHLY_REQUEST_BUDGET.
+
+    Returns:
+        QuotaBudget: the budget checked by fetch_data
+    """
+
+    global _quota_budget
+    if _quota_budget is None:
+        _quota_budget = QuotaBudget(path, monthly_limit)
+    return _quota_budget
+
+
+def is_quota_nearly_exhausted() -> bool:
+    """Whether the monthly request budget is nearly used up, in which case
+    cached data should be preferred over new requests
+
+    Returns:
+        bool: True if the budget is enabled and nearly exhausted
+    """
+
+    return (
+        _quota_budget is not None and _quota_budget.is_nearly_exhausted()
+    )
+
+
+def get_quota_budget() -> QuotaBudget or None:
+    """Return the monthly request budget, None if not enabled
+
+    Returns:
+        QuotaBudget or None: the budget checked by fetch_data
+    """
+
+    return _quota_budget
+
+
+@traced()
+def fetch_crypto_list() -> dict or bool:
+    """Fetch the details of every listed crypto
+
+    Returns:
+        dict or bool: {symbol: details} where details has the symbol, name,
+        name_full, max_supply and icon_url of the crypto, or False if the
+        data is not fetched
+    """
+
+    raw_data = fetch_data(LIST_ENDPOINT.format(api_key=API_KEY))
+    if not raw_data:
         return False
-    except requests.exceptions.HTTPError as http_err:
-        raise f"HTTP error occurred: {http_err}"
-    except requests.exceptions.ConnectionError as conn_err:
-        raise f"Connection error occurred: {conn_err}"
-    except requests.exceptions.Timeout as timeout_err:
-        raise f"Timeout error occurred: {timeout_err}"
-    except requests.exceptions.TooManyRedirects as redirect_err:
-        raise f"Redirect error occurred: {redirect_err}"
+    return raw_data["crypto"]
 
 
+@traced()
 def fetch_name_of_cryptos() -> list:
     """Parse the data from API to get the list of crypto names
 
@@ -62,15 +342,70 @@ def fetch_name_of_cryptos() -> list:
     """
 
     crypto_name_list = []
-    raw_data = fetch_data(LIST_ENDPOINT.format(api_key=API_KEY))
-    if not raw_data:
+    crypto_list = fetch_crypto_list()
+    if not crypto_list:
         return False
 
-    for symbol in raw_data["crypto"].keys():
+    for symbol in crypto_list.keys():
         crypto_name_list.append(symbol)
     return crypto_name_list
 
 
+def get_cached_crypto_list() -> dict or bool:
+    """Return the details of every listed crypto from the cache shared by
+    every session. It is refreshed in the background once older than
+    NAME_LIST_TTL seconds, and the stale details are kept if the refresh
+    fails
+
+    Returns:
+        dict or bool: {symbol: details}, or False if the list has never
+        been fetched successfully
+    """
+
+    _crypto_list_cache.ttl = NAME_LIST_TTL
+    return _crypto_list_cache.get()
+
+
+def get_cached_name_of_cryptos() -> list or bool:
+    """Return the list of crypto names from the cached crypto list, see
+    get_cached_crypto_list
+
+    Returns:
+        list or bool: a list of crypto names, or False if the list has never
+        been fetched successfully
+    """
+
+    crypto_list = get_cached_crypto_list()
+    if not crypto_list:
+        return False
+    return list(crypto_list.keys())
+
+
+def get_cached_crypto_metadata() -> CryptoMetadataStore or bool:
+    """Return the metadata of every listed crypto from the cached crypto
+    list, see get_cached_crypto_list. The store is shared by every session
+    and replaced by a new one when the list changes, reusing the records
+    that did not
+
+    Returns:
+        CryptoMetadataStore or bool: the metadata store, or False if the
+        list has never been fetched successfully
+    """
+
+    global _crypto_metadata, _crypto_metadata_source
+    crypto_list = get_cached_crypto_list()
+    if not crypto_list:
+        return False
+    with _crypto_metadata_lock:
+        if crypto_list is not _crypto_metadata_source:
+            _crypto_metadata, _ = _crypto_metadata.updated(
+                crypto_list, remove_missing=True
+            )
+            _crypto_metadata_source = crypto_list
+        return _crypto_metadata
+
+
+@traced()
 def get_crypto_stat_from_live_api(symbol: str) -> dict or bool:
     """Parse data from API to get the crypto stats, and used to feed to create
     Crypto instance
@@ -90,60 +425,586 @@ def get_crypto_stat_from_live_api(symbol: str) -> dict or bool:
     )
     if not raw_data:
         return False
+    return parse_crypto_stat(raw_data["rates"][symbol])
+
+
+@traced()
+def get_crypto_stats_from_live_api(
+    symbols: list,
+    chunk_size: int = LIVE_SYMBOLS_CHUNK_SIZE
+) -> dict or bool:
+    """Fetch the live stats of many cryptos with one request per chunk of
+    symbols instead of one request per symbol
+
+    Args:
+        symbols (list): The symbols of the cryptos, i.e., ["BTC", "ETH"]
+        chunk_size (int, optional): The maximum number of symbols sent in one
+        request. Defaults to LIVE_SYMBOLS_CHUNK_SIZE.
+
+    Returns:
+        dict or bool: {symbol: crypto stat} for every symbol returned by the
+        API, or False if any chunk is not fetched
+    """
+
+    if not isinstance(symbols, list):
+        raise TypeError("symbols must be a list")
+    for symbol in symbols:
+        if not isinstance(symbol, str):
+            raise TypeError("symbol must be a string")
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer")
+
+    # Duplicates would only make the query longer
+    unique_symbols = list(dict.fromkeys(symbols))
+    crypto_stats = {}
+    for start in range(0, len(unique_symbols), chunk_size):
+        chunk = unique_symbols[start:start + chunk_size]
+        raw_data = fetch_data(
+            LIVE_DATA.format(api_key=API_KEY, symbol=",".join(chunk))
+        )
+        if not raw_data:
+            return False
+        for symbol, rate_data in raw_data["rates"].items():
+            crypto_stats[symbol] = parse_crypto_stat(rate_data)
+    return crypto_stats
+
+
+def get_cached_crypto_stat(symbol: str) -> dict or bool:
+    """Return the live stat of one crypto from the quote cache shared by
+    every session, see get_cached_crypto_stats
+
+    Args:
+        symbol (str): The symbol of the crypto, i.e., BTC
+
+    Returns:
+        dict or bool: The crypto stat in dict format or False if the data is
+        not fetched
+    """
+
+    if not isinstance(symbol, str):
+        raise TypeError("symbol must be a string")
+
+    crypto_stats = get_cached_crypto_stats([symbol])
+    if not crypto_stats or symbol not in crypto_stats:
+        return False
+    return crypto_stats[symbol]
+
+
+def get_cached_crypto_stats(symbols: list) -> dict or bool:
+    """Return the live stats of many cryptos from the quote cache shared by
+    every session. Quotes are kept for QUOTE_CACHE_TTL seconds, or longer
+    once the request budget is nearly exhausted, and concurrent sessions
+    missing the same symbols share the requests per symbol
+
+    Args:
+        symbols (list): The symbols of the cryptos, i.e., ["BTC", "ETH"]
+
+    Returns:
+        dict or bool: {symbol: crypto stat} for every symbol known to the
+        API, or False if the missing stats are not fetched
+    """
+
+    if not isinstance(symbols, list):
+        raise TypeError("symbols must be a list")
+    for symbol in symbols:
+        if not isinstance(symbol, str):
+            raise TypeError("symbol must be a string")
+
+    _quote_cache.ttl = QUOTE_CACHE_TTL
+    save_quota = is_quota_nearly_exhausted()
+    crypto_stats = {}
+    missing_symbols = []
+    for symbol in dict.fromkeys(symbols):
+        crypto_stat = _quote_cache.get(symbol)
+        if crypto_stat is None and save_quota:
+            # Serve an expired quote rather than spend the last requests
+            crypto_stat = _quote_cache.get_stale(symbol)
+        if crypto_stat is None:
+            missing_symbols.append(symbol)
+        else:
+            crypto_stats[symbol] = crypto_stat
+    if not missing_symbols:
+        return crypto_stats
+
+    fetched_stats = _fetch_crypto_stats_once(missing_symbols)
+    if not fetched_stats:
+        return False
+    crypto_stats.update(fetched_stats)
+    return crypto_stats
+
+
+def get_cached_crypto_stats_updated_at(symbols: list) -> float or None:
+    """Return when the oldest cached live stat of the symbols was fetched,
+    i.e., the time of the quotes on screen
+
+    Args:
+        symbols (list): The symbols of the cryptos, i.e., ["BTC", "ETH"]
+
+    Returns:
+        float or None: epoch seconds, None if a stat is not cached
+    """
+
+    if not isinstance(symbols, list):
+        raise TypeError("symbols must be a list")
+
+    ages = [_quote_cache.get_age(symbol) for symbol in symbols]
+    if not ages or None in ages:
+        return None
+    return time.time() - max(ages)
+
+
+def refresh_cached_crypto_stats(
+    symbols: list,
+    ttl: float = None
+) -> dict or bool:
+    """Fetch the live stats of the symbols into the shared quote cache even
+    if they are still cached, used to pre-warm the cache off the request
+    path. Nothing is fetched once the request budget is nearly exhausted
+
+    Args:
+        symbols (list): The symbols of the cryptos, i.e., ["BTC", "ETH"]
+        ttl (float, optional): seconds the fetched stats stay fresh, i.e.,
+        until the next refresh. Defaults to None, QUOTE_CACHE_TTL.
+
+    Returns:
+        dict or bool: {symbol: crypto stat} or False if not fetched
+    """
+
+    if not isinstance(symbols, list):
+        raise TypeError("symbols must be a list")
+    if not symbols or is_quota_nearly_exhausted():
+        return False
+
+    return _fetch_crypto_stats_once(symbols, ttl)
+
+
+def count_quote_cache_stats() -> dict:
+    """Return the counters of the shared quote cache, used to size
+    QUOTE_CACHE_TTL
+
+    Returns:
+        dict: {"hits": int, "misses": int, "size": int, "coalesced": int}
+    """
+
+    quote_cache_stats = _quote_cache.count_stats()
+    quote_cache_stats["coalesced"] = _quote_flight.coalesced
+    return quote_cache_stats
+
+
+def _fetch_crypto_stats_once(
+    symbols: list,
+    ttl: float = None
+) -> dict or bool:
+    """Fetch the live stats of the symbols into the quote cache, sharing
+    the requests of concurrent callers per symbol: the symbols already
+    being fetched by another caller are waited for, and the rest are
+    fetched in one bulk request
+
+    Args:
+        symbols (list): The symbols of the cryptos
+        ttl (float, optional): seconds the stats fetched by this caller
+        stay fresh. Defaults to None, QUOTE_CACHE_TTL.
+
+    Returns:
+        dict or bool: {symbol: crypto stat} for every symbol known to the
+        API, or False if any of the requests failed
+    """
+
+    fetched_stats = _quote_flight.do_many(
+        symbols, lambda own_symbols: _fetch_and_cache_crypto_stats(
+            own_symbols, ttl
+        )
+    )
+    crypto_stats = {}
+    for symbol, each_stats in fetched_stats.items():
+        if not each_stats:
+            return False
+        if symbol in each_stats:
+            crypto_stats[symbol] = each_stats[symbol]
+    return crypto_stats
+
+
+def _fetch_and_cache_crypto_stats(
+    symbols: list,
+    ttl: float = None
+) -> dict or bool:
+    """Fetch the live stats of the symbols and store them in the quote cache
+
+    Args:
+        symbols (list): The symbols of the cryptos
+        ttl (float, optional): seconds the stats stay fresh.
+        Defaults to None, QUOTE_CACHE_TTL.
+
+    Returns:
+        dict or bool: {symbol: crypto stat} or False if not fetched
+    """
+
+    crypto_stats = get_crypto_stats_from_live_api(symbols)
+    if crypto_stats:
+        for symbol, crypto_stat in crypto_stats.items():
+            _quote_cache.set(symbol, crypto_stat, ttl)
+    return crypto_stats
+
+
+@traced()
+def fetch_market_snapshot() -> MarketSnapshot or bool:
+    """Fetch the live stats of every listed crypto in one request
+
+    Returns:
+        MarketSnapshot or bool: the snapshot or False if the data is not
+        fetched
+    """
+
+    raw_data = fetch_data(LIVE_MARKET_DATA.format(api_key=API_KEY))
+    if not raw_data:
+        return False
+    return MarketSnapshot.from_live_data(raw_data)
+
+
+def get_cached_market_snapshot() -> MarketSnapshot or bool:
+    """Return the market snapshot from the cache shared by every session. It
+    is refreshed in the background once older than MARKET_SNAPSHOT_TTL
+    seconds, and the stale snapshot is kept if the refresh fails
+
+    Returns:
+        MarketSnapshot or bool: the snapshot, or False if it has never been
+        fetched successfully
+    """
+
+    _market_snapshot_cache.ttl = MARKET_SNAPSHOT_TTL
+    return _market_snapshot_cache.get()
+
+
+def parse_crypto_stat(rate_data: dict) -> dict:
+    """Parse the expanded rate data of one crypto from the live API
+
+    Args:
+        rate_data (dict): The expanded rate data, i.e.,
+        raw_data["rates"]["BTC"]
+
+    Returns:
+        dict: The crypto stat in dict format
+    """
+
     crypto_stat = {}
-    crypto_stat["rate"] = raw_data["rates"][symbol]["rate"]
-    crypto_stat["high"] = raw_data["rates"][symbol]["high"]
-    crypto_stat["low"] = raw_data["rates"][symbol]["low"]
-    crypto_stat["vol"] = raw_data["rates"][symbol]["vol"]
-    crypto_stat["cap"] = raw_data["rates"][symbol]["cap"]
-    crypto_stat["sup"] = raw_data["rates"][symbol]["sup"]
-    crypto_stat["change"] = raw_data["rates"][symbol]["change"]
-    crypto_stat["change_pct"] = raw_data["rates"][symbol]["change_pct"]
+    crypto_stat["rate"] = rate_data["rate"]
+    crypto_stat["high"] = rate_data["high"]
+    crypto_stat["low"] = rate_data["low"]
+    crypto_stat["vol"] = rate_data["vol"]
+    crypto_stat["cap"] = rate_data["cap"]
+    crypto_stat["sup"] = rate_data["sup"]
+    crypto_stat["change"] = rate_data["change"]
+    crypto_stat["change_pct"] = rate_data["change_pct"]
     return crypto_stat
 
 
+@traced()
 def get_crypto_day_historical_data(
     symbol: str,
-    time_day: int = DAY_OF_WEEK
+    time_day: int = DAY_OF_WEEK,
+    max_workers: int = HISTORICAL_MAX_WORKERS,
+    allow_partial: bool = False,
+    store: HistoryStore = None,
+    live_days: int = None
 ) -> list or bool:
     """Parse data from API to get the crypto historical data for a given symbol
-    which is used to feed to create Crypto instance
+    which is used to feed to create Crypto instance. The days are fetched
+    concurrently, at most max_workers requests at a time.
 
     Args:
         symbol (str): Crypto symbol, i.e., BTC
         time_day (int, optional): The days of data needed.
         Defaults to DAY_OF_WEEK.
+        max_workers (int, optional): The maximum number of concurrent
+        requests. Defaults to HISTORICAL_MAX_WORKERS.
+        allow_partial (bool, optional): Keep the days that are fetched and
+        mark the failed days with a None rate instead of returning False or
+        raising, see fetch_historical_rate. Defaults to False.
+        store (HistoryStore, optional): The history store consulted first,
+        so only the missing dates are fetched. Defaults to None.
+        live_days (int, optional): Only the missing dates among the latest
+        live_days are fetched, older ones are missing unless stored.
+        Defaults to None, every date.
 
     Returns:
-        list or bool: The crypto historical data in list format or False if
-        the data is not fetched
+        list or bool: The crypto historical data in list format
+        [(DATE, RATE), ...] from oldest to latest, or False if the data is
+        not fetched
     """
 
     if not isinstance(symbol, str):
         raise TypeError("symbol must be a string")
     if not isinstance(time_day, int):
         raise TypeError("time_day must be an integer")
+    if not isinstance(max_workers, int) or max_workers <= 0:
+        raise ValueError("max_workers must be a positive integer")
 
-    historical_data = []
-    for day in range(time_day):
+    date_list, stored_rates, missing_date_list = prepare_historical_data(
+        symbol, time_day, store, live_days
+    )
+
+    fetched_rates = {}
+    if missing_date_list:
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(missing_date_list))
+        ) as executor:
+            # Each day in a copy of the context, so its spans are traced
+            futures = [
+                submit(
+                    executor, fetch_historical_rate, symbol, each_date,
+                    allow_partial
+                )
+                for each_date in missing_date_list
+            ]
+            fetched_rates = {
+                each_date: future.result()
+                for each_date, future in zip(missing_date_list, futures)
+            }
+
+    return complete_historical_data(
+        symbol, date_list, stored_rates, fetched_rates, allow_partial, store
+    )
+
+
+def prepare_historical_data(
+    symbol: str,
+    time_day: int,
+    store: HistoryStore = None,
+    live_days: int = None
+) -> tuple:
+    """First step of get_crypto_day_historical_data and its async version:
+    read the stored rates and list the dates to fetch
+
+    Args:
+        symbol (str): Crypto symbol, i.e., BTC
+        time_day (int): The days of data needed
+        store (HistoryStore, optional): The history store consulted first.
+        Defaults to None.
+        live_days (int, optional): Only the missing dates among the latest
+        live_days are fetched. Defaults to None, every date.
+
+    Returns:
+        tuple: (date_list, stored_rates, missing_date_list) with the dates
+        from oldest to latest and stored_rates as {date: rate}
+    """
+
+    date_list = get_historical_date_list(time_day)
+    stored_rates = {}
+    if store is not None and date_list:
+        stored_rates = store.get_rates(symbol, date_list)
+    missing_date_list = get_missing_date_list(
+        date_list, stored_rates, live_days
+    )
+    return date_list, stored_rates, missing_date_list
+
+
+def complete_historical_data(
+    symbol: str,
+    date_list: list,
+    stored_rates: dict,
+    fetched_rates: dict,
+    allow_partial: bool = False,
+    store: HistoryStore = None
+) -> list or bool:
+    """Last step of get_crypto_day_historical_data and its async version:
+    save the fetched rates and merge them with the stored ones
+
+    Args:
+        symbol (str): Crypto symbol, i.e., BTC
+        date_list (list): dates from oldest to latest
+        stored_rates (dict): {date: rate} read from the history store
+        fetched_rates (dict): {date: rate or None} fetched from the API
+        allow_partial (bool, optional): Mark the missing days with a None
+        rate instead of returning False. Defaults to False.
+        store (HistoryStore, optional): The history store receiving the
+        fetched rates. Defaults to None.
+
+    Returns:
+        list or bool: [(DATE, RATE), ...] or False if a day is missing
+    """
+
+    if store is not None and fetched_rates:
+        store.save_rates(symbol, list(fetched_rates.items()))
+    return merge_historical_rates(
+        date_list, stored_rates, fetched_rates, allow_partial
+    )
+
+
+def get_historical_date_list(time_day: int) -> list:
+    """Return the dates of the last time_day days, today included
+
+    Args:
+        time_day (int): The days of data needed
+
+    Returns:
+        list: dates in YYYY-MM-DD format from oldest to latest
+    """
+
+    # [oldest ... latest]
+    today = get_today()
+    date_list = []
+    for day in reversed(range(time_day)):
         each_date = (
-            (dt.date.today() - dt.timedelta(days=day)).strftime("%Y-%m-%d")
-        )
-        historical_url = (
-            HISTORICAL_DATE.format(
-                date=each_date,
-                api_key=API_KEY,
-                symbol=symbol
-            )
+            (today - dt.timedelta(days=day)).strftime("%Y-%m-%d")
         )
-        # print(historical_url)
-        raw_data = fetch_data(historical_url)
-        if not raw_data:
-            return False
+        date_list.append(each_date)
+    return date_list
+
+
+def get_missing_date_list(
+    date_list: list,
+    stored_rates: dict,
+    live_days: int = None
+) -> list:
+    """Return the dates to fetch from the API
+
+    Args:
+        date_list (list): dates from oldest to latest
+        stored_rates (dict): {date: rate} read from the history store
+        live_days (int, optional): Only the dates among the latest
+        live_days are fetched. Defaults to None, every date.
 
-        data_set = each_date, raw_data["rates"].get(symbol, 0)
-        historical_data.append(data_set)
-        # Reverse the list so [oldest ... latest]
-    historical_data.reverse()
-    # print(historical_data)
+    Returns:
+        list: the dates not stored, from oldest to latest
+    """
+
+    if live_days is not None:
+        if not isinstance(live_days, int) or live_days <= 0:
+            raise ValueError("live_days must be a positive integer")
+        date_list = date_list[-live_days:]
+    return [
+        each_date for each_date in date_list if each_date not in stored_rates
+    ]
+
+
+@traced()
+def merge_historical_rates(
+    date_list: list,
+    stored_rates: dict,
+    fetched_rates: dict,
+    allow_partial: bool = False
+) -> list or bool:
+    """Merge the stored and fetched rates into the historical data format
+
+    Args:
+        date_list (list): dates from oldest to latest
+        stored_rates (dict): {date: rate} read from the history store
+        fetched_rates (dict): {date: rate or None} fetched from the API
+        allow_partial (bool, optional): Mark the missing days with a None
+        rate instead of returning False. Defaults to False.
+
+    Returns:
+        list or bool: [(DATE, RATE), ...] or False if a day is missing
+    """
+
+    historical_data = []
+    for each_date in date_list:
+        rate = stored_rates.get(each_date, fetched_rates.get(each_date))
+        if rate is None and not allow_partial:
+            return False
+        historical_data.append((each_date, rate))
     return historical_data
+
+
+def warm_up_historical_data(
+    symbols: list,
+    store: HistoryStore,
+    time_day: int = DAY_OF_WEEK
+) -> dict:
+    """Fill the history store for a list of symbols ahead of time
+
+    Args:
+        symbols (list): The symbols of the cryptos, i.e., ["BTC", "ETH"]
+        store (HistoryStore): The history store to fill
+        time_day (int, optional): The days of data needed.
+        Defaults to DAY_OF_WEEK.
+
+    Returns:
+        dict: {"hits": int, "misses": int} of the store during the warm-up
+    """
+
+    if not isinstance(symbols, list):
+        raise TypeError("symbols must be a list")
+    if not isinstance(store, HistoryStore):
+        raise TypeError("store must be a HistoryStore")
+
+    before = store.count_stats()
+    for symbol in symbols:
+        get_crypto_day_historical_data(
+            symbol, time_day, allow_partial=True, store=store
+        )
+    after = store.count_stats()
+    return {
+        "hits": after["hits"] - before["hits"],
+        "misses": after["misses"] - before["misses"]
+    }
+
+
+def fetch_historical_rate(
+    symbol: str,
+    date: str,
+    allow_partial: bool = False
+) -> float or None:
+    """Fetch the rate of a crypto on one date from the historical API
+
+    Args:
+        symbol (str): Crypto symbol, i.e., BTC
+        date (str): The date in YYYY-MM-DD format
+        allow_partial (bool, optional): Return None instead of raising when
+        the request fails, except when the request budget is used up.
+        Defaults to False.
+
+    Raises:
+        CryptoAPIError: If the request fails and allow_partial is False
+        CryptoQuotaExceededError: If the request budget is used up
+
+    Returns:
+        float or None: The rate of the crypto on that date, 0 if the API has
+        no rate for the symbol, or None if the data is not fetched
+    """
+
+    try:
+        rates = fetch_historical_rates([symbol], date)
+    except CryptoQuotaExceededError:
+        raise
+    except CryptoAPIError:
+        if not allow_partial:
+            raise
+        return None
+    if rates is None:
+        return None
+    return rates[symbol]
+
+
+@traced()
+def fetch_historical_rates(symbols: list, date: str) -> dict or None:
+    """Fetch the rates of many cryptos on one date in a single request to
+    the historical API
+
+    Args:
+        symbols (list): Crypto symbols, i.e., ["BTC", "ETH"]
+        date (str): The date in YYYY-MM-DD format
+
+    Returns:
+        dict or None: {symbol: rate} with 0 where the API has no rate for a
+        symbol, or None if the data is not fetched
+    """
+
+    if not isinstance(symbols, list) or not symbols:
+        raise ValueError("symbols must be a non-empty list")
+
+    historical_url = (
+        HISTORICAL_DATE.format(
+            date=date,
+            api_key=API_KEY,
+            symbol=",".join(symbols)
+        )
+    )
+    raw_data = fetch_data(historical_url)
+    if not raw_data:
+        return None
+    return {symbol: raw_data["rates"].get(symbol, 0) for symbol in symbols}
+
+
+if CASSETTE_MODE:
+    use_cassette(CASSETTE_PATH, CASSETTE_MODE)
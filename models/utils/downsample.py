@@ -0,0 +1,199 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Downsampling helper functions capping the points sent to a chart while
+keeping the visual shape of the series
+'''
+
+import numpy as np
+from models.time_series import TimeSeries
+from models.utils.cache import TTLCache
+
+
+# Most points drawn by one chart
+CHART_POINT_BUDGET = 200
+# Search page timeframes and their days of history
+TIMEFRAMES = {
+    "7D": 7,
+    "30D": 30,
+    "90D": 90,
+    "1Y": 365
+}
+DEFAULT_TIMEFRAME = "7D"
+DOWNSAMPLE_METHODS = ["lttb", "minmax"]
+CHART_CACHE_SIZE = 256
+CHART_CACHE_TTL = 60 * 60
+
+# {(symbol, timeframe, budget, method): (version of the full series,
+# downsampled series)}, shared by every session
+_chart_cache = TTLCache(CHART_CACHE_SIZE, CHART_CACHE_TTL)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, budget: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: keep the first and last points, and
+    from each bucket in between the point forming the largest triangle with
+    the point kept before it and the average of the next bucket
+
+    Args:
+        x (np.ndarray): increasing x values
+        y (np.ndarray): y values, without NaN
+        budget (int): the number of points to keep, at least 3
+
+    Returns:
+        np.ndarray: the positions of the kept points, increasing
+    """
+
+    size = len(x)
+    if budget >= size or budget < 3:
+        return np.arange(size)
+
+    # Bucket edges of the size - 2 middle points
+    edges = np.linspace(1, size - 1, budget - 1).astype(int)
+    kept = np.empty(budget, dtype=int)
+    kept[0] = 0
+    kept[-1] = size - 1
+    previous = 0
+    for bucket in range(budget - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else size
+        # Average of the next bucket, the last point for the last bucket
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        kept[bucket + 1] = previous
+    return kept
+
+
+def min_max_indices(y: np.ndarray, budget: int) -> np.ndarray:
+    """Keep the lowest and highest point of each bucket, so every peak and
+    trough survives
+
+    Args:
+        y (np.ndarray): y values, without NaN
+        budget (int): the number of points to keep, at least 2
+
+    Returns:
+        np.ndarray: the positions of the kept points, increasing
+    """
+
+    size = len(y)
+    if budget >= size or budget < 2:
+        return np.arange(size)
+
+    edges = np.linspace(0, size, budget // 2 + 1).astype(int)
+    kept = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        kept.append(start + int(np.argmin(y[start:end])))
+        kept.append(start + int(np.argmax(y[start:end])))
+    return np.unique(kept)
+
+
+def downsample_indices(
+    x: np.ndarray,
+    y: np.ndarray,
+    budget: int = CHART_POINT_BUDGET,
+    method: str = "lttb"
+) -> np.ndarray:
+    """Positions of the points to chart, missing rates are left out
+
+    Args:
+        x (np.ndarray): increasing x values, i.e., datetime64 dates
+        y (np.ndarray): y values, NaN where missing
+        budget (int, optional): the most points kept.
+        Defaults to CHART_POINT_BUDGET.
+        method (str, optional): "lttb" or "minmax". Defaults to "lttb".
+
+    Raises:
+        ValueError: If the method or budget is invalid
+
+    Returns:
+        np.ndarray: the positions of the kept points, increasing
+    """
+
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"Invalid method: {method}")
+    if not isinstance(budget, int) or budget <= 0:
+        raise ValueError("budget must be a positive integer")
+
+    present = np.flatnonzero(~np.isnan(y))
+    if len(present) <= budget:
+        return np.arange(len(y))
+    if method == "lttb":
+        kept = lttb_indices(
+            x[present].astype("int64").astype("float64"), y[present], budget
+        )
+    else:
+        kept = min_max_indices(y[present], budget)
+    return present[kept]
+
+
+def downsample_series(
+    series: TimeSeries,
+    budget: int = CHART_POINT_BUDGET,
+    method: str = "lttb"
+) -> TimeSeries:
+    """Return a series of at most budget points with the shape of the given
+    one, or the series itself if it is short enough
+
+    Args:
+        series (TimeSeries): the series to chart
+        budget (int, optional): the most points kept.
+        Defaults to CHART_POINT_BUDGET.
+        method (str, optional): "lttb" or "minmax". Defaults to "lttb".
+
+    Returns:
+        TimeSeries: the downsampled series
+    """
+
+    if not isinstance(series, TimeSeries):
+        raise TypeError("series must be a TimeSeries")
+
+    if len(series) <= budget:
+        return series
+    kept = downsample_indices(series.dates, series.rates, budget, method)
+    return TimeSeries(series.dates[kept], series.rates[kept])
+
+
+def get_cached_chart_series(
+    symbol: str,
+    timeframe: str,
+    series: TimeSeries,
+    budget: int = CHART_POINT_BUDGET,
+    method: str = "lttb"
+) -> TimeSeries:
+    """Return the downsampled series of a symbol and timeframe from the
+    cache shared by every session, computed again once the series changes
+
+    Args:
+        symbol (str): Crypto symbol, i.e., BTC
+        timeframe (str): one of the TIMEFRAMES
+        series (TimeSeries): the full series of the timeframe
+        budget (int, optional): the most points kept.
+        Defaults to CHART_POINT_BUDGET.
+        method (str, optional): "lttb" or "minmax". Defaults to "lttb".
+
+    Returns:
+        TimeSeries: the downsampled series
+    """
+
+    if timeframe not in TIMEFRAMES:
+        raise ValueError(f"Invalid timeframe: {timeframe}")
+    if not isinstance(series, TimeSeries):
+        raise TypeError("series must be a TimeSeries")
+
+    if len(series) <= budget:
+        return series
+    key = (symbol, timeframe, budget, method)
+    # The latest day is still moving, so every rate is part of the version
+    version = (series.dates.tobytes(), series.rates.tobytes())
+    entry = _chart_cache.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    downsampled = downsample_series(series, budget, method)
+    _chart_cache.set(key, (version, downsampled))
+    return downsampled
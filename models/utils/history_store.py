@@ -0,0 +1,191 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Persistent on-disk store for historical daily rates, so past dates are only
+fetched from the API once
+'''
+
+import datetime as dt
+import os
+import sqlite3
+import threading
+from models.utils.metrics import CACHE_HIT_RATIO, hit_ratio
+
+
+HISTORY_DB_PATH = os.path.join(".cache", "history.sqlite3")
+
+_default_store = None
+_default_store_lock = threading.Lock()
+CACHE_HIT_RATIO.set_function(
+    lambda: hit_ratio(_default_store.count_stats()) if _default_store
+    else None,
+    cache="history"
+)
+
+
+class HistoryStore:
+    """SQLite store of historical rates keyed by (symbol, date)
+
+    Attributes:
+        - db_path: the path of the SQLite database file
+        - hits: number of (symbol, date) lookups served from the store
+        - misses: number of (symbol, date) lookups not in the store
+
+    Methods:
+        - get_rates: get the stored rates of a symbol for some dates
+        - save_rates: save the rates of past dates for a symbol
+        - save_date_rates: save the rates of many symbols for a past date
+        - count_stats: return the hit/miss counts
+        - close: close the database connection
+    """
+    def __init__(self, db_path: str = HISTORY_DB_PATH) -> None:
+        """Constructor for the history store
+
+        Args:
+            db_path (str, optional): The path of the SQLite database file,
+            or ":memory:". Defaults to HISTORY_DB_PATH.
+
+        Raises:
+            TypeError
+        """
+
+        if not isinstance(db_path, str):
+            raise TypeError("db_path must be a string")
+
+        directory = os.path.dirname(db_path)
+        if db_path != ":memory:" and directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        # One connection shared by the threads of the streamlit server
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS rates ("
+                "symbol TEXT NOT NULL, "
+                "date TEXT NOT NULL, "
+                "rate REAL NOT NULL, "
+                "PRIMARY KEY (symbol, date)"
+                ") WITHOUT ROWID"
+            )
+
+    def get_rates(self, symbol: str, date_list: list) -> dict:
+        """Get the stored rates of a symbol for the given dates
+
+        Args:
+            symbol (str): Crypto symbol, i.e., BTC
+            date_list (list): dates in YYYY-MM-DD format
+
+        Returns:
+            dict: {date: rate} for the dates found in the store
+        """
+
+        if not isinstance(symbol, str):
+            raise TypeError("symbol must be a string")
+        if not isinstance(date_list, list):
+            raise TypeError("date_list must be a list")
+        if not date_list:
+            return {}
+
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT date, rate FROM rates "
+                "WHERE symbol = ? AND date BETWEEN ? AND ?",
+                (symbol, min(date_list), max(date_list))
+            ).fetchall()
+            wanted = set(date_list)
+            rates = {date: rate for date, rate in rows if date in wanted}
+            self.hits += len(rates)
+            self.misses += len(wanted) - len(rates)
+        return rates
+
+    def save_rates(self, symbol: str, historical_data: list) -> int:
+        """Save the rates of a symbol. Today's rate is still moving and
+        failed days have no rate, so both are skipped
+
+        Args:
+            symbol (str): Crypto symbol, i.e., BTC
+            historical_data (list): [(DATE, RATE), ...]
+
+        Returns:
+            int: number of rates saved
+        """
+
+        if not isinstance(symbol, str):
+            raise TypeError("symbol must be a string")
+        if not isinstance(historical_data, list):
+            raise TypeError("historical_data must be a list")
+
+        today = dt.date.today().strftime("%Y-%m-%d")
+        return self._save_rows([
+            (symbol, date, rate) for date, rate in historical_data
+            if rate is not None and date < today
+        ])
+
+    def save_date_rates(self, date: str, rates: dict) -> int:
+        """Save the rates of many symbols for one date in one transaction,
+        i.e., one historical API response. Today's rates and missing rates
+        are skipped as in save_rates
+
+        Args:
+            date (str): The date in YYYY-MM-DD format
+            rates (dict): {symbol: rate}
+
+        Returns:
+            int: number of rates saved
+        """
+
+        if not isinstance(date, str):
+            raise TypeError("date must be a string")
+        if not isinstance(rates, dict):
+            raise TypeError("rates must be a dict")
+
+        if date >= dt.date.today().strftime("%Y-%m-%d"):
+            return 0
+        return self._save_rows([
+            (symbol, date, rate) for symbol, rate in rates.items()
+            if rate is not None
+        ])
+
+    def _save_rows(self, rows: list) -> int:
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO rates (symbol, date, rate) "
+                "VALUES (?, ?, ?)",
+                rows
+            )
+        return len(rows)
+
+    def count_stats(self) -> dict:
+        """Return the hit/miss counts of the store
+
+        Returns:
+            dict: {"hits": int, "misses": int}
+        """
+
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        """Close the database connection"""
+
+        with self._lock:
+            self._connection.close()
+
+
+def get_history_store() -> HistoryStore:
+    """Return the history store shared by the whole process
+
+    Returns:
+        HistoryStore: the store at HISTORY_DB_PATH
+    """
+
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = HistoryStore(HISTORY_DB_PATH)
+        return _default_store
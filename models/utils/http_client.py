@@ -0,0 +1,182 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+HTTP client behind fetch_data, with a pooled keep-alive session, retries
+with exponential backoff and typed errors
+'''
+
+import random
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Responses worth retrying: rate limited or a transient server error
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class CryptoAPIError(Exception):
+    """Base class of the errors raised when fetching data from the API"""
+
+
+class CryptoHTTPError(CryptoAPIError, requests.exceptions.HTTPError):
+    """The API answered with an HTTP error status"""
+
+
+class CryptoConnectionError(
+    CryptoAPIError, requests.exceptions.ConnectionError
+):
+    """The API could not be reached"""
+
+
+class CryptoTimeoutError(CryptoAPIError, requests.exceptions.Timeout):
+    """The API did not answer in time"""
+
+
+class CryptoRedirectError(
+    CryptoAPIError, requests.exceptions.TooManyRedirects
+):
+    """The API redirected too many times"""
+
+
+class CryptoQuotaExceededError(CryptoAPIError):
+    """The monthly request budget of the API is used up"""
+
+
+class HttpClient:
+    """Pooled HTTP client retrying transient failures
+
+    Attributes:
+        - session: the requests session keeping connections alive
+        - timeout: seconds to wait for each response
+        - max_retries: number of retries after the first attempt
+        - backoff_factor: base delay in seconds of the exponential backoff
+        - max_backoff: upper bound in seconds of one backoff delay
+
+    Methods:
+        - get_json: GET a url and return the decoded json body
+        - close: close the pooled connections
+    """
+    def __init__(
+        self,
+        pool_size: int = 10,
+        timeout: float = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 8,
+        adapter: HTTPAdapter = None
+    ) -> None:
+        """Constructor for the http client
+
+        Args:
+            pool_size (int, optional): connections kept alive per host.
+            Defaults to 10.
+            timeout (float, optional): seconds to wait for each response.
+            Defaults to 10.
+            max_retries (int, optional): number of retries after the first
+            attempt. Defaults to 3.
+            backoff_factor (float, optional): base delay in seconds of the
+            exponential backoff. Defaults to 0.5.
+            max_backoff (float, optional): upper bound in seconds of one
+            backoff delay. Defaults to 8.
+            adapter (HTTPAdapter, optional): transport adapter of the
+            session, i.e., a cassette. Defaults to a pooled HTTPAdapter.
+
+        Raises:
+            TypeError
+            ValueError
+        """
+
+        if not isinstance(pool_size, int) or not isinstance(max_retries, int):
+            raise TypeError("pool_size and max_retries must be integers")
+        if pool_size <= 0:
+            raise ValueError("pool_size must be positive")
+        if max_retries < 0:
+            raise ValueError("max_retries must not be negative")
+
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+
+        self.session = requests.Session()
+        if adapter is None:
+            adapter = HTTPAdapter(
+                pool_connections=pool_size,
+                pool_maxsize=pool_size
+            )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get_json(self, url: str, before_attempt=None) -> dict:
+        """GET a url and return the decoded json body, retrying rate limits,
+        server errors, timeouts and connection errors
+
+        Args:
+            url (str): the url to fetch
+            before_attempt (callable, optional): called without arguments
+            before every attempt, retries included, i.e., to rate limit
+            them. What it raises is raised as is. Defaults to None.
+
+        Raises:
+            CryptoHTTPError, CryptoConnectionError, CryptoTimeoutError,
+            CryptoRedirectError
+
+        Returns:
+            dict: the json body of the response
+        """
+
+        attempt = 0
+        while True:
+            if before_attempt is not None:
+                before_attempt()
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+                if (
+                    response.status_code in RETRY_STATUS_CODES
+                    and attempt < self.max_retries
+                ):
+                    self._sleep(attempt, response.headers.get("Retry-After"))
+                    attempt += 1
+                    continue
+                response.raise_for_status()
+                return response.json()
+            except requests.exceptions.HTTPError as http_err:
+                raise CryptoHTTPError(
+                    f"HTTP error occurred: {http_err}",
+                    response=http_err.response
+                ) from http_err
+            except requests.exceptions.Timeout as timeout_err:
+                if attempt >= self.max_retries:
+                    raise CryptoTimeoutError(
+                        f"Timeout error occurred: {timeout_err}"
+                    ) from timeout_err
+            except requests.exceptions.ConnectionError as conn_err:
+                if attempt >= self.max_retries:
+                    raise CryptoConnectionError(
+                        f"Connection error occurred: {conn_err}"
+                    ) from conn_err
+            except requests.exceptions.TooManyRedirects as redirect_err:
+                raise CryptoRedirectError(
+                    f"Redirect error occurred: {redirect_err}"
+                ) from redirect_err
+            self._sleep(attempt)
+            attempt += 1
+
+    def close(self) -> None:
+        """Close the pooled connections"""
+
+        self.session.close()
+
+    def _sleep(self, attempt: int, retry_after: str = None) -> None:
+        """Wait before the next attempt, honouring a Retry-After header or
+        else using exponential backoff with full jitter"""
+
+        if retry_after is not None and str(retry_after).isdigit():
+            delay = min(int(retry_after), self.max_backoff)
+        else:
+            delay = random.uniform(
+                0, min(self.max_backoff, self.backoff_factor * 2 ** attempt)
+            )
+        time.sleep(delay)
@@ -0,0 +1,496 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Metrics of the process in the Prometheus text format: counters, gauges and
+histograms registered at import time, once however many times the module
+is imported, updated on the hot path with a lock and a dict lookup, and
+served by a small HTTP server on METRICS_PORT
+
+Run the app, then scrape:
+    $ curl http://127.0.0.1:9108/metrics
+'''
+
+import bisect
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+METRICS_HOST = os.environ.get("COINLAYER_METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.environ.get("COINLAYER_METRICS_PORT", 9108))
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = logging.getLogger(__name__)
+
+_metrics_server = None
+# The error of the failed start, so the port is not tried on every rerun
+_metrics_server_error = None
+_metrics_server_lock = threading.Lock()
+
+
+class Metric:
+    """Base class of the metrics, one value per combination of label
+    values
+
+    Attributes:
+        - name: the metric name, i.e., crypto_api_requests_total
+        - description: the HELP text
+        - label_names: the names of the labels, in order
+    """
+    kind = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: tuple = ()
+    ) -> None:
+        """Constructor for the metric
+
+        Args:
+            name (str): the metric name
+            description (str): the HELP text
+            label_names (tuple, optional): the names of the labels.
+            Defaults to ().
+
+        Raises:
+            TypeError
+        """
+
+        if not isinstance(name, str):
+            raise TypeError("name must be a string")
+        if not isinstance(description, str):
+            raise TypeError("description must be a string")
+
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self._label_set = set(self.label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        if not labels and not self.label_names:
+            return ()
+        if labels.keys() != self._label_set:
+            raise ValueError(
+                f"{self.name} needs the labels {self.label_names}"
+            )
+        return tuple([str(labels[name]) for name in self.label_names])
+
+    def _format_labels(self, key: tuple, extra: dict = None) -> str:
+        pairs = list(zip(self.label_names, key))
+        if extra:
+            pairs += list(extra.items())
+        if not pairs:
+            return ""
+        return "{" + ",".join(
+            f'{name}="{escape_label(value)}"' for name, value in pairs
+        ) + "}"
+
+    def collect(self) -> list:
+        """Return the samples of the metric as text lines"""
+
+        raise NotImplementedError
+
+    def format(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.kind}"
+        ]
+        return "\n".join(lines + self.collect())
+
+
+class Counter(Metric):
+    """A value that only goes up, i.e., the number of requests
+
+    Methods:
+        - inc: add to the value of some labels
+        - get: the value of some labels
+    """
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if amount < 0:
+            raise ValueError("a counter can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def collect(self) -> list:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{self._format_labels(key)} {format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Gauge(Metric):
+    """A value that goes up and down, i.e., the requests in flight, or read
+    from a function when collected
+
+    Methods:
+        - set, inc, dec: change the value of some labels
+        - set_function: read the value of some labels from a function
+        - track: count the code in a context as in flight
+        - get: the value of some labels
+    """
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: tuple = ()
+    ) -> None:
+        super().__init__(name, description, label_names)
+        self._functions = {}
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, function, **labels) -> None:
+        """Read the value of some labels from a function, called only when
+        the metrics are collected
+
+        Args:
+            function (callable): returns the value, or None to leave the
+            sample out
+        """
+
+        key = self._key(labels)
+        with self._lock:
+            self._functions[key] = function
+
+    @contextmanager
+    def track(self, **labels):
+        self.inc(1, **labels)
+        try:
+            yield
+        finally:
+            self.dec(1, **labels)
+
+    def get(self, **labels) -> float:
+        key = self._key(labels)
+        with self._lock:
+            function = self._functions.get(key)
+            if function is None:
+                return self._values.get(key, 0)
+        return function()
+
+    def collect(self) -> list:
+        with self._lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+        for key, function in functions.items():
+            values[key] = function()
+        return [
+            f"{self.name}{self._format_labels(key)} {format_value(value)}"
+            for key, value in sorted(values.items())
+            if value is not None
+        ]
+
+
+class Histogram(Metric):
+    """Observations counted in cumulative buckets, i.e., the latency of
+    the requests
+
+    Methods:
+        - observe: count one observation of some labels
+        - time: observe the seconds taken by the code in a context
+        - count: the number of observations of some labels
+    """
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: tuple = (),
+        buckets: tuple = LATENCY_BUCKETS
+    ) -> None:
+        """Constructor for the histogram
+
+        Args:
+            name (str): the metric name
+            description (str): the HELP text
+            label_names (tuple, optional): the names of the labels.
+            Defaults to ().
+            buckets (tuple, optional): increasing upper bounds of the
+            buckets. Defaults to LATENCY_BUCKETS.
+
+        Raises:
+            ValueError: If the buckets are not increasing
+        """
+
+        if list(buckets) != sorted(set(buckets)) or not buckets:
+            raise ValueError("buckets must be increasing")
+
+        super().__init__(name, description, label_names)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            # [count per bucket, then +Inf], sum
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [
+                    [0] * (len(self.buckets) + 1), 0.0
+                ]
+            entry[0][position] += 1
+            entry[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return sum(entry[0]) if entry else 0
+
+    def collect(self) -> list:
+        with self._lock:
+            values = sorted(
+                (key, (list(entry[0]), entry[1]))
+                for key, entry in self._values.items()
+            )
+        lines = []
+        for key, (bucket_counts, total) in values:
+            cumulative = 0
+            bounds = [format_value(bound) for bound in self.buckets]
+            for bound, bucket_count in zip(bounds + ["+Inf"], bucket_counts):
+                cumulative += bucket_count
+                labels = self._format_labels(key, {"le": bound})
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = self._format_labels(key)
+            lines.append(f"{self.name}_sum{labels} {format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """The metrics of the process, formatted together when scraped
+
+    Methods:
+        - counter, gauge, histogram: create and register a metric
+        - register_collector: add text from a function to every scrape
+        - format: every metric in the Prometheus text format
+    """
+    def __init__(self) -> None:
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        """Register a metric once, so a module registering its metrics at
+        import can be imported again, i.e., by a Streamlit reload
+
+        Args:
+            metric (Metric): the metric
+
+        Raises:
+            ValueError: If another kind of metric or one with other labels
+            is registered under the name
+
+        Returns:
+            Metric: the metric, or the one already registered under its name
+        """
+
+        with self._lock:
+            registered = self._metrics.get(metric.name)
+            if registered is None:
+                self._metrics[metric.name] = metric
+                return metric
+        if (
+            type(registered) is not type(metric)
+            or registered.label_names != metric.label_names
+            or getattr(registered, "buckets", None)
+            != getattr(metric, "buckets", None)
+        ):
+            raise ValueError(
+                f"{metric.name} is already registered as another metric"
+            )
+        return registered
+
+    def counter(self, name: str, description: str, label_names=()):
+        return self.register(Counter(name, description, label_names))
+
+    def gauge(self, name: str, description: str, label_names=()):
+        return self.register(Gauge(name, description, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        label_names=(),
+        buckets: tuple = LATENCY_BUCKETS
+    ):
+        return self.register(
+            Histogram(name, description, label_names, buckets)
+        )
+
+    def register_collector(self, collector) -> None:
+        """Add the Prometheus text returned by a function to every scrape,
+        i.e., tracing.format_prometheus
+
+        Args:
+            collector (callable): returns Prometheus text, replacing the
+            collector of the same name from an earlier import of its module
+        """
+
+        name = (collector.__module__, collector.__qualname__)
+        with self._lock:
+            self._collectors = [
+                each for each in self._collectors
+                if (each.__module__, each.__qualname__) != name
+            ]
+            self._collectors.append(collector)
+
+    def format(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        parts = [metric.format() for metric in metrics]
+        parts += [collector().rstrip("\n") for collector in collectors]
+        return "\n".join(parts) + "\n"
+
+
+# Registry of the whole process
+REGISTRY = MetricsRegistry()
+# Shared by the caches of every module, labelled by cache
+CACHE_HIT_RATIO = REGISTRY.gauge(
+    "crypto_cache_hit_ratio",
+    "Share of the lookups answered by a cache since the process started",
+    ("cache",)
+)
+
+
+def hit_ratio(cache_stats: dict) -> float or None:
+    """The share of hits of a cache, None before the first lookup
+
+    Args:
+        cache_stats (dict): {"hits": int, "misses": int}
+
+    Returns:
+        float or None: hits / (hits + misses)
+    """
+
+    lookups = cache_stats["hits"] + cache_stats["misses"]
+    if not lookups:
+        return None
+    return cache_stats["hits"] / lookups
+
+
+def format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+def escape_label(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    )
+
+
+def start_metrics_server(
+    port: int = None,
+    host: str = None,
+    registry: MetricsRegistry = REGISTRY
+) -> ThreadingHTTPServer or None:
+    """Serve the registry at /metrics in a background thread, started once
+    per process however many sessions call it
+
+    Args:
+        port (int, optional): the port, 0 for any free one.
+        Defaults to METRICS_PORT.
+        host (str, optional): the address to bind. Defaults to METRICS_HOST.
+        registry (MetricsRegistry, optional): the metrics served.
+        Defaults to REGISTRY.
+
+    Returns:
+        ThreadingHTTPServer or None: the server, or None if the port is
+        taken, i.e., by another app process. A failed start is logged once
+        and not tried again until stop_metrics_server
+    """
+
+    global _metrics_server, _metrics_server_error
+    with _metrics_server_lock:
+        if _metrics_server is not None:
+            return _metrics_server
+        if _metrics_server_error is not None:
+            return None
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                payload = registry.format().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        address = (
+            host or METRICS_HOST, METRICS_PORT if port is None else port
+        )
+        try:
+            server = ThreadingHTTPServer(address, MetricsHandler)
+        except OSError as error:
+            _metrics_server_error = error
+            logger.warning(
+                "Metrics are not served on %s:%s: %s", *address, error
+            )
+            return None
+        server.daemon_threads = True
+        threading.Thread(
+            target=server.serve_forever, name="metrics-server", daemon=True
+        ).start()
+        _metrics_server = server
+        return server
+
+
+def stop_metrics_server() -> None:
+    global _metrics_server, _metrics_server_error
+    with _metrics_server_lock:
+        _metrics_server_error = None
+        if _metrics_server is not None:
+            _metrics_server.shutdown()
+            _metrics_server.server_close()
+            _metrics_server = None
@@ -0,0 +1,241 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Client-side rate limiter and monthly request budget for the coinlayer API
+'''
+
+import datetime as dt
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+try:
+    import fcntl
+except ImportError:
+    # Windows: the budget file is only locked between threads
+    fcntl = None
+
+
+class TokenBucket:
+    """Token bucket rate limiter, shared by every thread of the process
+
+    Attributes:
+        - rate: tokens added per second
+        - capacity: the maximum number of tokens, i.e., the allowed burst
+
+    Methods:
+        - acquire: wait until a token is available and take it
+        - try_acquire: take a token only if one is available now
+    """
+    def __init__(
+        self,
+        rate: float,
+        capacity: int = 1,
+        clock=time.monotonic,
+        sleep=time.sleep
+    ) -> None:
+        """Constructor for the token bucket
+
+        Args:
+            rate (float): tokens added per second
+            capacity (int, optional): the maximum number of tokens.
+            Defaults to 1.
+            clock (callable, optional): monotonic clock in seconds.
+            Defaults to time.monotonic.
+            sleep (callable, optional): function waiting some seconds.
+            Defaults to time.sleep.
+
+        Raises:
+            TypeError
+            ValueError
+        """
+
+        if not isinstance(rate, (int, float)):
+            raise TypeError("rate must be a number")
+        if not isinstance(capacity, int):
+            raise TypeError("capacity must be an integer")
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(capacity)
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available now
+
+        Returns:
+            bool: True if a token was taken, False otherwise
+        """
+
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self) -> float:
+        """Wait until a token is available and take it
+
+        Returns:
+            float: seconds spent waiting
+        """
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self.capacity,
+            self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+
+class QuotaBudget:
+    """Monthly request budget persisted to a json file, so the count
+    survives server restarts. The file is read again under a file lock on
+    every count, so several server processes sharing it add up their
+    requests instead of overwriting each other's counts
+
+    Attributes:
+        - path: the path of the json file
+        - monthly_limit: the number of requests allowed per month
+        - warning_ratio: the used share of the budget from which it is
+        considered nearly exhausted
+
+    Methods:
+        - consume: count one request if the budget allows it
+        - count_used: return the requests used this month
+        - is_nearly_exhausted: whether callers should prefer cached data
+    """
+    def __init__(
+        self,
+        path: str,
+        monthly_limit: int,
+        warning_ratio: float = 0.9,
+        today=dt.date.today
+    ) -> None:
+        """Constructor for the quota budget
+
+        Args:
+            path (str): the path of the json file
+            monthly_limit (int): the number of requests allowed per month
+            warning_ratio (float, optional): the used share of the budget
+            from which it is nearly exhausted. Defaults to 0.9.
+            today (callable, optional): returns the current date.
+            Defaults to dt.date.today.
+
+        Raises:
+            TypeError
+            ValueError
+        """
+
+        if not isinstance(path, str):
+            raise TypeError("path must be a string")
+        if not isinstance(monthly_limit, int):
+            raise TypeError("monthly_limit must be an integer")
+        if monthly_limit <= 0:
+            raise ValueError("monthly_limit must be positive")
+        if not 0 < warning_ratio <= 1:
+            raise ValueError("warning_ratio must be in (0, 1]")
+
+        self.path = path
+        self.monthly_limit = monthly_limit
+        self.warning_ratio = warning_ratio
+        self._today = today
+        self._lock = threading.Lock()
+
+    def consume(self) -> bool:
+        """Count one request if the budget of this month allows it
+
+        Returns:
+            bool: True if the request may be sent, False if the budget is
+            exhausted
+        """
+
+        with self._locked():
+            month, used = self._load()
+            if used >= self.monthly_limit:
+                return False
+            self._save(month, used + 1)
+            return True
+
+    def count_used(self) -> int:
+        """Return the number of requests used this month
+
+        Returns:
+            int: requests used this month
+        """
+
+        with self._locked():
+            return self._load()[1]
+
+    def is_nearly_exhausted(self) -> bool:
+        """Whether the used share of the budget reached warning_ratio
+
+        Returns:
+            bool: True if callers should prefer cached data
+        """
+
+        return self.count_used() >= self.monthly_limit * self.warning_ratio
+
+    def _current_month(self) -> str:
+        return self._today().strftime("%Y-%m")
+
+    @contextmanager
+    def _locked(self):
+        """Hold the lock of the threads, then a lock file next to the json
+        file shared with the other processes, where supported"""
+
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            self._make_directory()
+            with open(self.path + ".lock", "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load(self) -> tuple:
+        month = self._current_month()
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return month, 0
+        if data.get("month") != month:
+            return month, 0
+        return month, int(data.get("used", 0))
+
+    def _save(self, month: str, used: int) -> None:
+        self._make_directory()
+        # Write then rename, so a crash never leaves a truncated file
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"month": month, "used": used}, file)
+        os.replace(temp_path, self.path)
+
+    def _make_directory(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
@@ -0,0 +1,321 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Background scheduler refreshing live quotes into the shared quote cache, so
+page renders read them without waiting for the API
+
+Only the symbols some render asked for within SYMBOL_IDLE_TIMEOUT are
+refreshed, and the thread stops once none are left, so a server without
+viewers sends no requests. The interval also grows with the share of the
+monthly request budget already used, and the refreshed quotes stay fresh
+until the next refresh is due, so renders keep reading them in between
+'''
+
+import datetime as dt
+import random
+import threading
+import time
+import models.utils.crypto_helper as crypto_helper
+
+
+# Shortest seconds between two refreshes, each refresh is one request
+REFRESH_INTERVAL = 30
+# Random seconds added to or removed from each interval, so several server
+# processes do not refresh in lockstep
+REFRESH_JITTER = 3
+# Seconds the refreshed quotes stay fresh beyond the next scheduled
+# refresh, covering a slow refresh
+REFRESH_TTL_MARGIN = 10
+# Seconds a symbol is refreshed after a render last asked for it, above
+# dashboard.AUTO_REFRESH_MAX_INTERVAL so auto refreshing pages keep theirs
+SYMBOL_IDLE_TIMEOUT = 600
+# Share of the remaining monthly request budget the refresher may spend,
+# the rest is left to the page renders
+REFRESH_BUDGET_SHARE = 0.5
+
+_quote_refresher = None
+_quote_refresher_lock = threading.Lock()
+
+
+class QuoteRefresher:
+    """Refresh the live quotes of some symbols in one background thread
+
+    Attributes:
+        - symbols: the symbols refreshed
+        - interval: shortest seconds between two refreshes
+        - jitter: random seconds added to or removed from each interval
+        - idle_timeout: seconds a symbol is refreshed after it was last
+        asked for
+
+    Methods:
+        - start: start the background thread
+        - stop: stop the background thread
+        - is_running: whether the background thread runs
+        - add_symbols: ask for symbols, refreshed from the next run
+        - refresh_once: refresh the quotes now, in the calling thread
+        - next_interval: seconds until the next run, given the budget
+        - count_metrics: return the refresh counters and lag
+    """
+    def __init__(
+        self,
+        symbols: list,
+        interval: float = REFRESH_INTERVAL,
+        jitter: float = REFRESH_JITTER,
+        refresh=None,
+        idle_timeout: float = SYMBOL_IDLE_TIMEOUT
+    ) -> None:
+        """Constructor for the quote refresher
+
+        Args:
+            symbols (list): the symbols to refresh
+            interval (float, optional): shortest seconds between two
+            refreshes. Defaults to REFRESH_INTERVAL.
+            jitter (float, optional): random seconds added to or removed
+            from each interval. Defaults to REFRESH_JITTER.
+            refresh (callable, optional): function fetching the quotes of a
+            list of symbols, kept fresh for the ttl given as second
+            argument. Defaults to crypto_helper.refresh_cached_crypto_stats.
+            idle_timeout (float, optional): seconds a symbol is refreshed
+            after it was last asked for. Defaults to SYMBOL_IDLE_TIMEOUT.
+
+        Raises:
+            TypeError
+            ValueError
+        """
+
+        if not isinstance(symbols, list):
+            raise TypeError("symbols must be a list")
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if not 0 <= jitter < interval:
+            raise ValueError("jitter must be between 0 and interval")
+        if idle_timeout <= 0:
+            raise ValueError("idle_timeout must be positive")
+
+        self.interval = interval
+        self.jitter = jitter
+        self.idle_timeout = idle_timeout
+        # {symbol: monotonic time it was last asked for}
+        now = time.monotonic()
+        self._requested = dict.fromkeys(symbols, now)
+        self._refresh = refresh or crypto_helper.refresh_cached_crypto_stats
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._metrics = {
+            "refresh_count": 0,
+            "error_count": 0,
+            "last_refresh_at": None,
+            "last_duration": None,
+            "last_lag": None,
+            "max_lag": 0.0
+        }
+
+    @property
+    def symbols(self) -> list:
+        with self._lock:
+            return list(self._requested)
+
+    def start(self) -> None:
+        """Start the background thread, does nothing if already running"""
+
+        with self._lock:
+            if self.is_running():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="quote-refresher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = None) -> None:
+        """Stop the background thread
+
+        Args:
+            timeout (float, optional): seconds to wait for the thread.
+            Defaults to None.
+        """
+
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def add_symbols(self, symbols: list) -> None:
+        """Ask for symbols, refreshed from the next run until none asked
+        for them within idle_timeout
+
+        Args:
+            symbols (list): the symbols to add
+        """
+
+        if not isinstance(symbols, list):
+            raise TypeError("symbols must be a list")
+        now = time.monotonic()
+        with self._lock:
+            for symbol in symbols:
+                self._requested[symbol] = now
+
+    def refresh_once(self, lag: float = 0.0, interval: float = None) -> bool:
+        """Refresh the quotes of every symbol now, in the calling thread,
+        keeping them fresh until the next refresh is due
+
+        Args:
+            lag (float, optional): seconds this run started after its
+            scheduled time. Defaults to 0.0.
+            interval (float, optional): seconds until the next refresh.
+            Defaults to next_interval().
+
+        Returns:
+            bool: True if the quotes were refreshed
+        """
+
+        if interval is None:
+            interval = self.next_interval()
+        ttl = interval + self.jitter + REFRESH_TTL_MARGIN
+        symbols = self.symbols
+        started = time.monotonic()
+        try:
+            refreshed = bool(self._refresh(symbols, ttl))
+        except Exception:  # the next run tries again
+            refreshed = False
+
+        with self._lock:
+            self._metrics["last_duration"] = time.monotonic() - started
+            self._metrics["last_lag"] = lag
+            self._metrics["max_lag"] = max(self._metrics["max_lag"], lag)
+            if refreshed:
+                self._metrics["refresh_count"] += 1
+                self._metrics["last_refresh_at"] = time.time()
+            else:
+                self._metrics["error_count"] += 1
+        return refreshed
+
+    def next_interval(self) -> float:
+        """Seconds until the next run: interval, or longer when spending
+        REFRESH_BUDGET_SHARE of the remaining monthly request budget at
+        that pace would not last until the end of the month
+
+        Returns:
+            float: seconds until the next run, without jitter
+        """
+
+        budget = crypto_helper.get_quota_budget()
+        if budget is None:
+            return self.interval
+        remaining = budget.monthly_limit - budget.count_used()
+        allowed = max(remaining * REFRESH_BUDGET_SHARE, 1)
+        return max(self.interval, seconds_until_next_month() / allowed)
+
+    def count_metrics(self) -> dict:
+        """Return the refresh counters and how late the refreshes run
+
+        Returns:
+            dict: refresh_count, error_count, last_refresh_at (epoch
+            seconds), last_duration, last_lag and max_lag (seconds), and
+            snapshot_age, the seconds since the last successful refresh
+        """
+
+        with self._lock:
+            metrics = dict(self._metrics)
+        if metrics["last_refresh_at"] is None:
+            metrics["snapshot_age"] = None
+        else:
+            metrics["snapshot_age"] = time.time() - metrics["last_refresh_at"]
+        return metrics
+
+    def _drop_idle_symbols(self) -> bool:
+        """Drop the symbols nobody asked for within idle_timeout, and
+        detach the thread when none are left, so start() runs a new one
+
+        Returns:
+            bool: True if symbols are left to refresh
+        """
+
+        expired_before = time.monotonic() - self.idle_timeout
+        with self._lock:
+            self._requested = {
+                symbol: requested_at
+                for symbol, requested_at in self._requested.items()
+                if requested_at >= expired_before
+            }
+            if not self._requested:
+                self._thread = None
+                return False
+            return True
+
+    def _run(self) -> None:
+        scheduled = time.monotonic()
+        while not self._stop_event.is_set():
+            if not self._drop_idle_symbols():
+                return
+            interval = self.next_interval()
+            self.refresh_once(
+                max(0.0, time.monotonic() - scheduled), interval
+            )
+            scheduled += interval + random.uniform(-self.jitter, self.jitter)
+            # Skip the runs missed while a slow refresh was in flight
+            scheduled = max(scheduled, time.monotonic())
+            self._stop_event.wait(scheduled - time.monotonic())
+
+
+def start_quote_refresher(
+    symbols: list,
+    interval: float = REFRESH_INTERVAL,
+    jitter: float = REFRESH_JITTER
+) -> QuoteRefresher:
+    """Start the quote refresher shared by the whole process, or ask it for
+    the symbols if it already exists. Called by every render, so it also
+    restarts a refresher that stopped without viewers
+
+    Args:
+        symbols (list): the symbols to refresh
+        interval (float, optional): seconds between two refreshes.
+        Defaults to REFRESH_INTERVAL.
+        jitter (float, optional): random seconds added to or removed from
+        each interval. Defaults to REFRESH_JITTER.
+
+    Returns:
+        QuoteRefresher: the running refresher
+    """
+
+    global _quote_refresher
+    with _quote_refresher_lock:
+        if _quote_refresher is None:
+            _quote_refresher = QuoteRefresher(symbols, interval, jitter)
+        else:
+            _quote_refresher.add_symbols(symbols)
+        _quote_refresher.start()
+        return _quote_refresher
+
+
+def get_quote_refresher() -> QuoteRefresher or None:
+    """Return the quote refresher of the process, None if never started
+
+    Returns:
+        QuoteRefresher or None: the refresher
+    """
+
+    return _quote_refresher
+
+
+def seconds_until_next_month(now: dt.datetime = None) -> float:
+    """Seconds left until the monthly request budget resets
+
+    Args:
+        now (dt.datetime, optional): the current time.
+        Defaults to dt.datetime.now().
+
+    Returns:
+        float: seconds until the first day of the next month
+    """
+
+    now = now or dt.datetime.now()
+    month_start = now.replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+    next_month = (month_start + dt.timedelta(days=32)).replace(day=1)
+    return (next_month - now).total_seconds()
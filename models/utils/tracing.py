@@ -0,0 +1,350 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Lightweight tracing of the hot path: spans time the API calls, parsers,
+model construction and display functions, and are collected per rerun into
+a trace with a timing breakdown
+
+The current trace and span are kept in context variables, so they follow
+asyncio.to_thread and the thread pools submitting through submit(). Every
+span is also added to process-wide totals, exported in the Prometheus text
+format and served with the metrics of models/utils/metrics.py. Finished
+traces can be appended as JSON lines to TRACE_LOG_PATH.
+'''
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from models.utils.metrics import REGISTRY
+
+
+# JSON lines file receiving every finished trace, None to keep them in
+# memory only
+TRACE_LOG_PATH = os.environ.get("COINLAYER_TRACE_LOG")
+# Spans kept by one trace, the rest only count towards the totals
+MAX_SPANS_PER_TRACE = 5000
+
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+_current_span = contextvars.ContextVar("current_span", default=None)
+# {span name: [count, seconds, self seconds]} of the whole process
+_span_totals = {}
+_span_totals_lock = threading.Lock()
+
+
+class Span:
+    """One timed operation, nested in the span that was current when it
+    started
+
+    Attributes:
+        - name: what is timed, i.e., fetch_data /live
+        - parent: the enclosing span or None
+        - attributes: extra details, i.e., the error raised
+        - offset: seconds from the start of the trace, or None
+        - duration: seconds the span took
+        - children_duration: seconds taken by the spans nested in it
+    """
+    __slots__ = (
+        "name",
+        "parent",
+        "attributes",
+        "offset",
+        "duration",
+        "children_duration"
+    )
+
+    def __init__(self, name: str, parent=None, attributes: dict = None):
+        self.name = name
+        self.parent = parent
+        self.attributes = attributes or {}
+        self.offset = None
+        self.duration = 0.0
+        self.children_duration = 0.0
+
+    @property
+    def self_duration(self) -> float:
+        # Children running in parallel threads can outlast their parent
+        return max(self.duration - self.children_duration, 0.0)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "parent": self.parent.name if self.parent else None,
+            "offset": self.offset,
+            "duration": self.duration,
+            "self_duration": self.self_duration,
+            "attributes": self.attributes
+        }
+
+
+class Trace:
+    """The spans of one rerun of the app
+
+    Methods:
+        - add: record a finished span
+        - finish: stop the clock of the trace
+        - breakdown: the spans aggregated by name
+        - to_dict: the trace as a JSON serializable dict
+    """
+    def __init__(self, name: str) -> None:
+        """Constructor for the trace, starting its clock
+
+        Args:
+            name (str): what is traced, i.e., rerun
+        """
+
+        if not isinstance(name, str):
+            raise TypeError("name must be a string")
+
+        self.name = name
+        self.started_at = time.time()
+        self.spans = []
+        self.dropped = 0
+        self.duration = None
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @property
+    def elapsed(self) -> float:
+        if self.duration is not None:
+            return self.duration
+        return time.perf_counter() - self._start
+
+    def add(self, span: Span, start: float) -> None:
+        span.offset = start - self._start
+        with self._lock:
+            if len(self.spans) < MAX_SPANS_PER_TRACE:
+                self.spans.append(span)
+            else:
+                self.dropped += 1
+
+    def finish(self) -> None:
+        if self.duration is None:
+            self.duration = time.perf_counter() - self._start
+
+    def breakdown(self) -> list:
+        """Aggregate the spans by name, the slowest first
+
+        Returns:
+            list: [{"name", "count", "seconds", "self_seconds",
+            "max_seconds"}, ...] sorted by seconds
+        """
+
+        with self._lock:
+            spans = list(self.spans)
+        rows = {}
+        for span in spans:
+            row = rows.setdefault(span.name, {
+                "name": span.name,
+                "count": 0,
+                "seconds": 0.0,
+                "self_seconds": 0.0,
+                "max_seconds": 0.0
+            })
+            row["count"] += 1
+            row["seconds"] += span.duration
+            row["self_seconds"] += span.self_duration
+            row["max_seconds"] = max(row["max_seconds"], span.duration)
+        return sorted(
+            rows.values(), key=lambda row: row["seconds"], reverse=True
+        )
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            spans = [span.to_dict() for span in self.spans]
+        return {
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration": self.elapsed,
+            "dropped": self.dropped,
+            "spans": spans
+        }
+
+
+@contextmanager
+def start_trace(name: str = "rerun", log_path: str = None):
+    """Collect the spans started in this context into a new trace
+
+    Args:
+        name (str, optional): what is traced. Defaults to "rerun".
+        log_path (str, optional): JSON lines file receiving the finished
+        trace. Defaults to TRACE_LOG_PATH.
+
+    Yields:
+        Trace: the trace
+    """
+
+    trace = Trace(name)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(None)
+    try:
+        yield trace
+    finally:
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        trace.finish()
+        log_path = log_path or TRACE_LOG_PATH
+        if log_path:
+            write_json_log(trace, log_path)
+
+
+def get_current_trace() -> Trace or None:
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Time the code in this context as a span of the current trace, and
+    add it to the process-wide totals
+
+    Args:
+        name (str): what is timed, i.e., fetch_data /live
+        **attributes: extra details kept with the span
+
+    Yields:
+        Span: the span, whose attributes can still be added to
+    """
+
+    parent = _current_span.get()
+    current = Span(name, parent, attributes)
+    token = _current_span.set(current)
+    start = time.perf_counter()
+    try:
+        yield current
+    except BaseException as error:
+        current.attributes["error"] = type(error).__name__
+        raise
+    finally:
+        current.duration = time.perf_counter() - start
+        _current_span.reset(token)
+        record_span(current)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(current, start)
+
+
+def traced(name: str = None):
+    """Decorator timing every call of a function as a span
+
+    Args:
+        name (str, optional): the span name. Defaults to the name of the
+        function.
+    """
+
+    def decorator(function):
+        span_name = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def submit(executor, function, *args):
+    """Submit a call to an executor in a copy of the current context, so
+    its spans belong to the current trace
+
+    Args:
+        executor (concurrent.futures.Executor): the executor
+        function (callable): the function to call
+        *args: the arguments of the call
+
+    Returns:
+        concurrent.futures.Future: the future of the call
+    """
+
+    return executor.submit(contextvars.copy_context().run, function, *args)
+
+
+def record_span(finished_span: Span) -> None:
+    """Add a finished span to the process-wide totals and to the time of
+    its parent"""
+
+    with _span_totals_lock:
+        if finished_span.parent is not None:
+            finished_span.parent.children_duration += finished_span.duration
+        totals = _span_totals.setdefault(finished_span.name, [0, 0.0, 0.0])
+        totals[0] += 1
+        totals[1] += finished_span.duration
+        totals[2] += finished_span.self_duration
+
+
+def count_span_totals() -> dict:
+    """Return the process-wide totals of every span name
+
+    Returns:
+        dict: {name: {"count", "seconds", "self_seconds"}}
+    """
+
+    with _span_totals_lock:
+        return {
+            name: {
+                "count": totals[0],
+                "seconds": totals[1],
+                "self_seconds": totals[2]
+            }
+            for name, totals in _span_totals.items()
+        }
+
+
+def reset_span_totals() -> None:
+    with _span_totals_lock:
+        _span_totals.clear()
+
+
+def format_prometheus(span_totals: dict = None) -> str:
+    """Format the span totals in the Prometheus text exposition format
+
+    Args:
+        span_totals (dict, optional): totals as returned by
+        count_span_totals. Defaults to the current totals.
+
+    Returns:
+        str: the metrics, one sample per line
+    """
+
+    if span_totals is None:
+        span_totals = count_span_totals()
+
+    metrics = [
+        ("crypto_span_calls_total", "count", "Calls of each traced span"),
+        ("crypto_span_seconds_total", "seconds",
+         "Seconds spent in each traced span"),
+        ("crypto_span_self_seconds_total", "self_seconds",
+         "Seconds spent in each traced span outside its nested spans")
+    ]
+    lines = []
+    for metric, key, description in metrics:
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} counter")
+        for name in sorted(span_totals):
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            lines.append(
+                f'{metric}{{span="{label}"}} {span_totals[name][key]:g}'
+            )
+    return "\n".join(lines) + "\n"
+
+
+def write_json_log(trace: Trace, path: str) -> None:
+    """Append a trace to a JSON lines file
+
+    Args:
+        trace (Trace): the trace
+        path (str): the JSON lines file
+    """
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as file:
+        file.write(json.dumps(trace.to_dict(), separators=(",", ":")) + "\n")
+
+
+# Span totals are scraped with the other metrics of the process
+REGISTRY.register_collector(format_prometheus)
@@ -0,0 +1,105 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Unit tests for analytics helper functions
+'''
+
+from unittest import TestCase
+import numpy as np
+import pandas as pd
+from models.crypto import Crypto
+import models.utils.analytics as Analytics
+
+
+class TestAnalytics(TestCase):
+    """Unit tests for analytics helper functions
+    """
+    def setUp(self) -> None:
+        self.btc = Crypto("BTC", historical_data=[
+            ("2023-11-27", 1.0),
+            ("2023-11-28", 2.0),
+            ("2023-11-29", 1.0),
+            ("2023-11-30", 1.5)
+        ])
+        self.eth = Crypto("ETH", historical_data=[
+            ("2023-11-28", 4.0),
+            ("2023-11-29", 2.0),
+            ("2023-11-30", 0)
+        ])
+        self.rate_frame = Analytics.build_rate_frame([self.btc, self.eth])
+
+    def test_build_rate_frame(self) -> None:
+        self.assertEqual(list(self.rate_frame.columns), ["BTC", "ETH"])
+        self.assertEqual(len(self.rate_frame), 4)
+        # missing and zero rates are NaN
+        self.assertTrue(np.isnan(self.rate_frame["ETH"].iloc[0]))
+        self.assertTrue(np.isnan(self.rate_frame["ETH"].iloc[-1]))
+
+    def test_build_rate_frame_invalid(self) -> None:
+        with self.assertRaises(TypeError):
+            Analytics.build_rate_frame(self.btc)
+        with self.assertRaises(TypeError):
+            Analytics.build_rate_frame(["BTC"])
+
+    def test_compute_returns(self) -> None:
+        returns = Analytics.compute_returns(self.rate_frame)
+        self.assertEqual(returns["BTC"].tolist()[1:], [1.0, -0.5, 0.5])
+
+    def test_moving_averages(self) -> None:
+        sma = Analytics.compute_sma(self.rate_frame, 2)
+        self.assertEqual(sma["BTC"].tolist(), [1.0, 1.5, 1.5, 1.25])
+        ema = Analytics.compute_ema(self.rate_frame, 3)
+        # alpha = 2 / (span + 1) = 0.5
+        self.assertEqual(ema["BTC"].tolist(), [1.0, 1.5, 1.25, 1.375])
+
+    def test_compute_max_drawdown(self) -> None:
+        drawdown = Analytics.compute_max_drawdown(self.rate_frame)
+        self.assertEqual(drawdown["BTC"], -0.5)
+        self.assertEqual(drawdown["ETH"], -0.5)
+
+    def test_compute_rolling_volatility(self) -> None:
+        volatility = Analytics.compute_rolling_volatility(self.rate_frame, 2)
+        self.assertAlmostEqual(
+            volatility["BTC"].iloc[-1], np.std([-0.5, 0.5], ddof=1)
+        )
+
+    def test_compute_correlation(self) -> None:
+        correlation = Analytics.compute_correlation(self.rate_frame)
+        self.assertEqual(correlation.shape, (2, 2))
+        self.assertAlmostEqual(correlation.loc["BTC", "BTC"], 1.0)
+
+    def test_compute_indicators(self) -> None:
+        indicators = Analytics.compute_indicators(self.rate_frame)
+        self.assertEqual(
+            list(indicators.columns), Analytics.INDICATOR_COLUMNS
+        )
+        self.assertEqual(indicators.loc["BTC", "rate"], 1.5)
+        self.assertEqual(indicators.loc["BTC", "total_return"], 0.5)
+        self.assertEqual(indicators.loc["ETH", "rate"], 2.0)
+        self.assertEqual(indicators.loc["ETH", "total_return"], -0.5)
+
+    def test_compute_indicators_empty(self) -> None:
+        indicators = Analytics.compute_indicators(
+            Analytics.build_rate_frame([Crypto("BTC")])
+        )
+        self.assertTrue(indicators.loc["BTC"].isna().all())
+        with self.assertRaises(TypeError):
+            Analytics.compute_indicators([1, 2])
+
+    def test_compute_indicators_many_symbols(self) -> None:
+        dates = pd.date_range("2023-01-01", periods=30)
+        rate_frame = pd.DataFrame(
+            np.random.default_rng(0).uniform(1, 2, (30, 300)),
+            index=dates,
+            columns=[f"C{i}" for i in range(300)]
+        )
+        indicators = Analytics.compute_indicators(rate_frame)
+        self.assertEqual(len(indicators), 300)
+        self.assertFalse(indicators.isna().any().any())
+
+    def test_compute_crypto_indicators(self) -> None:
+        indicators = Analytics.compute_crypto_indicators(self.btc)
+        self.assertEqual(indicators["max_drawdown"], -0.5)
+        with self.assertRaises(TypeError):
+            Analytics.compute_crypto_indicators("BTC")
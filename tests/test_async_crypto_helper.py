@@ -0,0 +1,205 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Unit tests for the async crypto helper functions, run against a local stub
+HTTP server
+'''
+
+import json
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase, IsolatedAsyncioTestCase
+from unittest.mock import patch
+from urllib.parse import urlparse, parse_qs
+import models.utils.crypto_helper as CryptoHelper
+import models.utils.async_crypto_helper as AsyncCryptoHelper
+from models.utils.history_store import HistoryStore
+from models.utils.http_client import CryptoTimeoutError
+
+
+STAT = {
+    "rate": 1, "high": 2, "low": 3, "vol": 4,
+    "cap": 5, "sup": 6, "change": 7, "change_pct": 8
+}
+
+
+class StubCoinlayerHandler(BaseHTTPRequestHandler):
+    """Answers /list, /live and /{date} like the coinlayer API"""
+
+    requested_paths = []
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        symbols = parse_qs(url.query).get("symbols", [""])[0].split(",")
+        StubCoinlayerHandler.requested_paths.append(url.path)
+        if url.path == "/list":
+            body = {"success": True, "crypto": {"BTC": {}, "ETH": {}}}
+        elif url.path == "/live":
+            body = {"success": True, "rates": {
+                symbol: STAT for symbol in symbols
+            }}
+        elif url.path == "/2023-11-29":
+            body = {"success": False, "error": {"type": "no_data"}}
+        else:
+            day = int(url.path[-2:])
+            body = {"success": True, "rates": {
+                symbol: day for symbol in symbols
+            }}
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class StubServerMixin:
+    """Start the stub server and point the helper endpoints at it"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), StubCoinlayerHandler
+        )
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{cls.server.server_port}"
+        cls.patchers = [
+            patch.object(
+                CryptoHelper, "LIST_ENDPOINT",
+                base_url + "/list?access_key={api_key}"
+            ),
+            patch.object(
+                CryptoHelper, "LIVE_DATA",
+                base_url + "/live?access_key={api_key}&symbols={symbol}"
+                "&expand=1"
+            ),
+            patch.object(
+                CryptoHelper, "HISTORICAL_DATE",
+                base_url + "/{date}?access_key={api_key}&symbols={symbol}"
+            ),
+            patch("datetime.date")
+        ]
+        mocks = [patcher.start() for patcher in cls.patchers]
+        mocks[-1].today.return_value = date(2023, 11, 30)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        for patcher in cls.patchers:
+            patcher.stop()
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self) -> None:
+        StubCoinlayerHandler.requested_paths = []
+        CryptoHelper._quote_cache.clear()
+
+
+class TestAsyncCryptoHelper(StubServerMixin, IsolatedAsyncioTestCase):
+    """Unit tests for the async crypto helper functions
+    """
+    async def test_fetch_name_of_cryptos(self) -> None:
+        result = await AsyncCryptoHelper.fetch_name_of_cryptos()
+        self.assertEqual(result, ["BTC", "ETH"])
+
+    async def test_get_crypto_stat_from_live_api(self) -> None:
+        result = await AsyncCryptoHelper.get_crypto_stat_from_live_api("BTC")
+        self.assertEqual(result, STAT)
+
+    async def test_get_crypto_stat_from_live_api_false_type(self) -> None:
+        with self.assertRaises(TypeError):
+            await AsyncCryptoHelper.get_crypto_stat_from_live_api(1)
+
+    async def test_get_crypto_day_historical_data(self) -> None:
+        result = await AsyncCryptoHelper.get_crypto_day_historical_data(
+            "BTC", 3, allow_partial=True
+        )
+        self.assertEqual(
+            result,
+            [("2023-11-28", 28), ("2023-11-29", None), ("2023-11-30", 30)]
+        )
+        result = await AsyncCryptoHelper.get_crypto_day_historical_data(
+            "BTC", 3
+        )
+        self.assertIs(result, False)
+
+    async def test_get_crypto_day_historical_data_errors(self) -> None:
+        fetch_data = CryptoHelper.fetch_data
+
+        def fetch_data_timing_out(url: str) -> dict:
+            if "/2023-11-28" in url:
+                raise CryptoTimeoutError("Timeout error occurred")
+            return fetch_data(url)
+
+        with patch.object(
+            CryptoHelper, "fetch_data", side_effect=fetch_data_timing_out
+        ):
+            result = await AsyncCryptoHelper.get_crypto_day_historical_data(
+                "BTC", 3, allow_partial=True
+            )
+            self.assertEqual(
+                result,
+                [("2023-11-28", None), ("2023-11-29", None),
+                 ("2023-11-30", 30)]
+            )
+            with self.assertRaises(CryptoTimeoutError):
+                await AsyncCryptoHelper.get_crypto_day_historical_data(
+                    "BTC", 3
+                )
+
+    async def test_get_crypto_day_historical_data_with_store(self) -> None:
+        store = HistoryStore(":memory:")
+        await AsyncCryptoHelper.get_crypto_day_historical_data(
+            "BTC", 2, max_concurrency=1, store=store
+        )
+        StubCoinlayerHandler.requested_paths = []
+        result = await AsyncCryptoHelper.get_crypto_day_historical_data(
+            "ETH", 1, store=store
+        )
+        self.assertEqual(result, [("2023-11-30", 30)])
+        self.assertEqual(
+            StubCoinlayerHandler.requested_paths, ["/2023-11-30"]
+        )
+        store.close()
+
+    async def test_get_crypto_day_historical_data_live_days(self) -> None:
+        store = HistoryStore(":memory:")
+        store.save_rates("BTC", [("2023-11-28", 1.5)])
+        StubCoinlayerHandler.requested_paths = []
+        result = await AsyncCryptoHelper.get_crypto_day_historical_data(
+            "BTC", 3, allow_partial=True, store=store, live_days=1
+        )
+        # the day before the live window is neither stored nor fetched
+        self.assertEqual(
+            result,
+            [("2023-11-28", 1.5), ("2023-11-29", None), ("2023-11-30", 30)]
+        )
+        self.assertEqual(
+            StubCoinlayerHandler.requested_paths, ["/2023-11-30"]
+        )
+        with self.assertRaises(ValueError):
+            await AsyncCryptoHelper.get_crypto_day_historical_data(
+                "BTC", 3, live_days=0
+            )
+        store.close()
+
+    async def test_load_search_page(self) -> None:
+        crypto_stat, historical_data = \
+            await AsyncCryptoHelper.load_search_page("BTC", 1)
+        self.assertEqual(crypto_stat, STAT)
+        self.assertEqual(historical_data, [("2023-11-30", 30)])
+
+
+class TestRunSync(StubServerMixin, TestCase):
+    """Unit tests for the sync wrapper used from streamlit
+    """
+    def test_run_sync(self) -> None:
+        crypto_stat, historical_data = AsyncCryptoHelper.run_sync(
+            AsyncCryptoHelper.load_search_page("ETH", 2)
+        )
+        self.assertEqual(crypto_stat, STAT)
+        self.assertIs(historical_data, False)
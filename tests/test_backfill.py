@@ -0,0 +1,162 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Unit tests for the history backfill
+'''
+
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+from models.utils.backfill import BackfillCheckpoint, backfill_history, \
+    get_date_range, main
+from models.utils.history_store import HistoryStore
+from models.utils.http_client import CryptoQuotaExceededError, \
+    CryptoTimeoutError
+from models.utils.rate_limiter import TokenBucket
+from test_rate_limiter import FakeTime
+
+
+def fake_rates(symbols: list, date: str) -> dict:
+    return {symbol: float(date[-2:]) for symbol in symbols}
+
+
+class TestBackfill(TestCase):
+    """Unit tests for the history backfill
+    """
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(self.directory.name, "fill.json")
+        self.store = HistoryStore(":memory:")
+        self.time = FakeTime()
+        self.limiter = TokenBucket(
+            2, clock=self.time.clock, sleep=self.time.sleep
+        )
+
+    def tearDown(self) -> None:
+        self.store.close()
+        self.directory.cleanup()
+
+    def backfill(self, symbols: list, **kwargs) -> dict:
+        checkpoint = BackfillCheckpoint(self.checkpoint_path, symbols)
+        return backfill_history(
+            symbols, "2023-01-01", "2023-01-05", self.store, checkpoint,
+            limiter=self.limiter, **kwargs
+        )
+
+    def test_get_date_range(self) -> None:
+        self.assertEqual(
+            get_date_range("2023-12-30", "2024-01-01"),
+            ["2023-12-30", "2023-12-31", "2024-01-01"]
+        )
+        with self.assertRaises(ValueError):
+            get_date_range("2023-01-02", "2023-01-01")
+        with self.assertRaises(ValueError):
+            get_date_range("2023-13-01", "2023-12-01")
+
+    @patch("models.utils.crypto_helper.fetch_historical_rates")
+    def test_one_request_per_date_and_chunk(self, mock_fetch) -> None:
+        mock_fetch.side_effect = fake_rates
+        with patch.object(
+            self.store, "save_date_rates", wraps=self.store.save_date_rates
+        ) as mock_save:
+            summary = self.backfill(["BTC", "ETH", "DOGE"], chunk_size=2)
+        # one write per response
+        self.assertEqual(mock_save.call_count, 10)
+        self.assertEqual(summary["requests"], 10)
+        self.assertEqual(summary["saved"], 15)
+        self.assertEqual(summary["failed"], [])
+        self.assertEqual(
+            self.store.get_rates("ETH", ["2023-01-03"]), {"2023-01-03": 3.0}
+        )
+
+    @patch("models.utils.crypto_helper.fetch_historical_rates")
+    def test_rps_ceiling(self, mock_fetch) -> None:
+        mock_fetch.side_effect = fake_rates
+        self.backfill(["BTC"])
+        # 5 requests at 2 per second, the first one is not delayed
+        self.assertAlmostEqual(self.time.now, 2.0)
+
+    @patch("models.utils.crypto_helper.fetch_historical_rates")
+    def test_resume_from_checkpoint(self, mock_fetch) -> None:
+        mock_fetch.side_effect = lambda symbols, date: (
+            None if date == "2023-01-03" else fake_rates(symbols, date)
+        )
+        summary = self.backfill(["BTC", "ETH"])
+        self.assertEqual(summary["failed"], ["2023-01-03"])
+
+        mock_fetch.reset_mock()
+        mock_fetch.side_effect = fake_rates
+        summary = self.backfill(["BTC", "ETH"])
+        self.assertEqual(summary["skipped"], 4)
+        self.assertEqual(summary["requests"], 1)
+        mock_fetch.assert_called_once_with(["BTC", "ETH"], "2023-01-03")
+
+    @patch("models.utils.crypto_helper.fetch_historical_rates")
+    def test_transport_error_skips_date(self, mock_fetch) -> None:
+        def fetch_rates(symbols: list, date: str) -> dict:
+            if date == "2023-01-02":
+                raise CryptoTimeoutError("Timeout error occurred")
+            return fake_rates(symbols, date)
+
+        mock_fetch.side_effect = fetch_rates
+        summary = self.backfill(["BTC"])
+        self.assertEqual(summary["failed"], ["2023-01-02"])
+        self.assertEqual(summary["requests"], 5)
+        self.assertEqual(summary["saved"], 4)
+
+        mock_fetch.side_effect = CryptoQuotaExceededError("exhausted")
+        with self.assertRaises(CryptoQuotaExceededError):
+            self.backfill(["BTC"])
+
+    @patch("models.utils.crypto_helper.fetch_historical_rates")
+    def test_stored_symbols_not_fetched(self, mock_fetch) -> None:
+        mock_fetch.side_effect = fake_rates
+        self.store.save_rates("BTC", [("2023-01-02", 1.0)])
+        self.backfill(["BTC", "ETH"])
+        self.assertIn(
+            (["ETH"], "2023-01-02"),
+            [call.args for call in mock_fetch.call_args_list]
+        )
+
+    @patch("models.utils.backfill.backfill_history")
+    @patch("models.utils.crypto_helper.enable_quota_budget")
+    def test_main_counts_requests_against_budget(
+        self, mock_budget, mock_backfill
+    ) -> None:
+        mock_backfill.side_effect = CryptoQuotaExceededError("exhausted")
+        argv = [
+            "backfill", "btc", "--start", "2023-01-01", "--end",
+            "2023-01-05", "--db", ":memory:",
+            "--checkpoint", self.checkpoint_path
+        ]
+        with patch("sys.argv", argv), patch("builtins.print") as mock_print:
+            main()
+        mock_budget.assert_called_once_with()
+        self.assertEqual(mock_backfill.call_args.args[0], ["BTC"])
+        self.assertIn("exhausted", mock_print.call_args.args[0])
+
+    def test_checkpoint_for_other_symbols_ignored(self) -> None:
+        checkpoint = BackfillCheckpoint(self.checkpoint_path, ["BTC"])
+        checkpoint.mark_done("2023-01-01")
+        self.assertTrue(
+            BackfillCheckpoint(self.checkpoint_path, ["BTC"]).is_done(
+                "2023-01-01"
+            )
+        )
+        self.assertEqual(
+            BackfillCheckpoint(self.checkpoint_path, ["ETH"]).count_done(), 0
+        )
+
+    def test_backfill_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            backfill_history([], "2023-01-01", "2023-01-02", self.store)
+        with self.assertRaises(TypeError):
+            backfill_history(["BTC"], "2023-01-01", "2023-01-02", None)
+        with self.assertRaises(ValueError):
+            backfill_history(
+                ["BTC"], "2023-01-01", "2023-01-02", self.store, rps=0
+            )
+        with self.assertRaises(ValueError):
+            backfill_history(["BTC"], "2023-01-01", "2999-01-01", self.store)
@@ -0,0 +1,393 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Unit tests for the process-wide caches
+'''
+
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import patch, Mock
+from models.utils.cache import RefreshingValue, TTLCache, SingleFlight
+import models.utils.crypto_helper as CryptoHelper
+
+
+class FakeClock:
+    """Manually advanced clock for ttl tests
+    """
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRefreshingValue(TestCase):
+    """Unit tests for the stale-while-revalidate value
+    """
+    def wait_for_refresh(self, value: RefreshingValue) -> None:
+        value._refresh_thread.join(timeout=1)
+
+    def test_init_invalid(self) -> None:
+        with self.assertRaises(TypeError):
+            RefreshingValue("loader", 1)
+        with self.assertRaises(TypeError):
+            RefreshingValue(lambda: 1, "1")
+        with self.assertRaises(ValueError):
+            RefreshingValue(lambda: 1, -1)
+
+    def test_get_loads_once_within_ttl(self) -> None:
+        loader = Mock(return_value=["BTC"])
+        value = RefreshingValue(loader, 10, clock=FakeClock())
+        self.assertEqual(value.get(), ["BTC"])
+        self.assertEqual(value.get(), ["BTC"])
+        loader.assert_called_once()
+
+    def test_get_first_load_failure_not_cached(self) -> None:
+        loader = Mock(side_effect=[False, ["BTC"]])
+        value = RefreshingValue(loader, 10, clock=FakeClock())
+        self.assertIs(value.get(), False)
+        self.assertEqual(value.get(), ["BTC"])
+
+    def test_get_stale_returns_old_value_and_refreshes(self) -> None:
+        clock = FakeClock()
+        loader = Mock(side_effect=[["BTC"], ["BTC", "ETH"]])
+        value = RefreshingValue(loader, 10, clock=clock)
+        value.get()
+        clock.now = 11
+        # stale value is served while refreshing in the background
+        self.assertEqual(value.get(), ["BTC"])
+        self.wait_for_refresh(value)
+        self.assertEqual(value.get(), ["BTC", "ETH"])
+
+    def test_get_failed_refresh_keeps_stale_value(self) -> None:
+        clock = FakeClock()
+        loader = Mock(side_effect=[["BTC"], Exception("down")])
+        value = RefreshingValue(loader, 10, clock=clock)
+        value.get()
+        clock.now = 11
+        value.get()
+        self.wait_for_refresh(value)
+        self.assertEqual(value.get(), ["BTC"])
+
+    def test_invalidate(self) -> None:
+        loader = Mock(return_value=["BTC"])
+        value = RefreshingValue(loader, 10, clock=FakeClock())
+        value.get()
+        value.invalidate()
+        value.get()
+        self.assertEqual(loader.call_count, 2)
+
+    def test_get_cached_name_of_cryptos(self) -> None:
+        CryptoHelper._crypto_list_cache.invalidate()
+        with patch("models.utils.crypto_helper.fetch_crypto_list") as \
+                mock_fetch:
+            mock_fetch.return_value = {
+                "BTC": {"name": "Bitcoin"},
+                "ETH": {"name": "Ethereum"}
+            }
+            self.assertEqual(
+                CryptoHelper.get_cached_name_of_cryptos(), ["BTC", "ETH"]
+            )
+            metadata = CryptoHelper.get_cached_crypto_metadata()
+            self.assertEqual(metadata.get_name("ETH"), "Ethereum")
+            self.assertIs(CryptoHelper.get_cached_crypto_metadata(), metadata)
+            mock_fetch.assert_called_once()
+
+            # a changed list gives a new store, the old one is left as is
+            CryptoHelper._crypto_list_cache.invalidate()
+            mock_fetch.return_value = {"BTC": {"name": "Bitcoin"}}
+            CryptoHelper.get_cached_name_of_cryptos()
+            newer_metadata = CryptoHelper.get_cached_crypto_metadata()
+            self.assertIsNot(newer_metadata, metadata)
+            self.assertNotIn("ETH", newer_metadata)
+            self.assertIn("ETH", metadata)
+        CryptoHelper._crypto_list_cache.invalidate()
+
+
+class TestTTLCache(TestCase):
+    """Unit tests for the bounded ttl cache
+    """
+    def test_init_invalid(self) -> None:
+        with self.assertRaises(TypeError):
+            TTLCache("1", 1)
+        with self.assertRaises(ValueError):
+            TTLCache(0, 1)
+        with self.assertRaises(ValueError):
+            TTLCache(1, -1)
+
+    def test_get_set_and_expire(self) -> None:
+        clock = FakeClock()
+        cache = TTLCache(10, 5, clock=clock)
+        self.assertIsNone(cache.get("BTC"))
+        cache.set("BTC", {"rate": 1})
+        self.assertEqual(cache.get("BTC"), {"rate": 1})
+        clock.now = 5
+        self.assertIsNone(cache.get("BTC"))
+        self.assertEqual(
+            cache.count_stats(), {"hits": 1, "misses": 2, "size": 1}
+        )
+
+    def test_entry_ttl(self) -> None:
+        clock = FakeClock()
+        cache = TTLCache(10, 5, clock=clock)
+        cache.set("BTC", 1, ttl=60)
+        cache.set("ETH", 2)
+        clock.now = 30
+        self.assertEqual(cache.get("BTC"), 1)
+        self.assertIsNone(cache.get("ETH"))
+        clock.now = 60
+        self.assertIsNone(cache.get("BTC"))
+
+    def test_get_age(self) -> None:
+        clock = FakeClock()
+        cache = TTLCache(10, 5, clock=clock)
+        self.assertIsNone(cache.get_age("BTC"))
+        cache.set("BTC", 1)
+        clock.now = 8
+        self.assertEqual(cache.get_age("BTC"), 8)
+        self.assertEqual(
+            cache.count_stats(), {"hits": 0, "misses": 0, "size": 1}
+        )
+
+    def test_lru_eviction(self) -> None:
+        cache = TTLCache(2, 5, clock=FakeClock())
+        cache.set("BTC", 1)
+        cache.set("ETH", 2)
+        # BTC becomes the most recently used, so ETH is evicted
+        cache.get("BTC")
+        cache.set("DOGE", 3)
+        self.assertEqual(cache.get("BTC"), 1)
+        self.assertIsNone(cache.get("ETH"))
+        self.assertEqual(cache.get("DOGE"), 3)
+
+    def test_clear(self) -> None:
+        cache = TTLCache(2, 5, clock=FakeClock())
+        cache.set("BTC", 1)
+        cache.clear()
+        self.assertEqual(
+            cache.count_stats(), {"hits": 0, "misses": 0, "size": 0}
+        )
+
+
+class TestSingleFlight(TestCase):
+    """Unit tests for request coalescing
+    """
+    def test_do_coalesces_concurrent_calls(self) -> None:
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow_fetch() -> str:
+            calls.append(1)
+            started.set()
+            release.wait(timeout=1)
+            return "BTC"
+
+        results = []
+        leader = threading.Thread(
+            target=lambda: results.append(flight.do("BTC", slow_fetch))
+        )
+        leader.start()
+        started.wait(timeout=1)
+        followers = [
+            threading.Thread(
+                target=lambda: results.append(flight.do("BTC", slow_fetch))
+            ) for _ in range(3)
+        ]
+        for follower in followers:
+            follower.start()
+        deadline = time.monotonic() + 1
+        while flight.coalesced < 3 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join(timeout=1)
+
+        self.assertEqual(results, ["BTC"] * 4)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.coalesced, 3)
+
+    def test_do_raises_exception(self) -> None:
+        flight = SingleFlight()
+        with self.assertRaises(ValueError):
+            flight.do("BTC", Mock(side_effect=ValueError("fail")))
+        # the key is released after a failure
+        self.assertEqual(flight.do("BTC", lambda: 1), 1)
+
+    def test_do_many_shares_overlapping_keys(self) -> None:
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow_fetch(keys: list) -> dict:
+            calls.append(keys)
+            started.set()
+            release.wait(timeout=1)
+            return {key: key.lower() for key in keys}
+
+        results = []
+        leader = threading.Thread(
+            target=lambda: results.append(
+                flight.do_many(["BTC"], slow_fetch)
+            )
+        )
+        leader.start()
+        started.wait(timeout=1)
+        follower = threading.Thread(
+            target=lambda: results.append(
+                flight.do_many(["ETH", "BTC"], slow_fetch)
+            )
+        )
+        follower.start()
+        deadline = time.monotonic() + 1
+        while flight.coalesced < 1 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+        for thread in [leader, follower]:
+            thread.join(timeout=1)
+
+        self.assertEqual(calls, [["BTC"], ["ETH"]])
+        self.assertEqual(flight.coalesced, 1)
+        self.assertIn({"BTC": {"BTC": "btc"}}, results)
+        self.assertIn(
+            {"ETH": {"ETH": "eth"}, "BTC": {"BTC": "btc"}}, results
+        )
+
+    def test_do_many_raises_exception(self) -> None:
+        flight = SingleFlight()
+        with self.assertRaises(ValueError):
+            flight.do_many(["BTC"], Mock(side_effect=ValueError("fail")))
+        self.assertEqual(
+            flight.do_many(["BTC", "BTC"], lambda keys: keys),
+            {"BTC": ["BTC"]}
+        )
+
+
+class TestQuoteCache(TestCase):
+    """Unit tests for the shared live quote cache
+    """
+    def setUp(self) -> None:
+        CryptoHelper._quote_cache.clear()
+
+    def tearDown(self) -> None:
+        CryptoHelper._quote_cache.clear()
+
+    def test_get_cached_crypto_stats(self) -> None:
+        with patch(
+            "models.utils.crypto_helper.get_crypto_stats_from_live_api"
+        ) as mock_live:
+            mock_live.return_value = {"BTC": {"rate": 1}}
+            result = CryptoHelper.get_cached_crypto_stats(["BTC"])
+            self.assertEqual(result, {"BTC": {"rate": 1}})
+
+            # only the missing symbol is fetched
+            mock_live.return_value = {"ETH": {"rate": 2}}
+            result = CryptoHelper.get_cached_crypto_stats(["BTC", "ETH"])
+            self.assertEqual(result, {"BTC": {"rate": 1}, "ETH": {"rate": 2}})
+            mock_live.assert_called_with(["ETH"])
+
+            CryptoHelper.get_cached_crypto_stats(["BTC", "ETH"])
+            self.assertEqual(mock_live.call_count, 2)
+            stats = CryptoHelper.count_quote_cache_stats()
+            self.assertEqual(stats["hits"], 3)
+            self.assertEqual(stats["misses"], 2)
+
+    def test_get_cached_crypto_stats_overlapping_symbols(self) -> None:
+        release = threading.Event()
+        calls = []
+
+        def slow_live_api(symbols: list) -> dict:
+            calls.append(symbols)
+            release.wait(timeout=1)
+            return {symbol: {"rate": len(symbol)} for symbol in symbols}
+
+        coalesced = CryptoHelper.count_quote_cache_stats()["coalesced"]
+        results = []
+        threads = []
+        with patch(
+            "models.utils.crypto_helper.get_crypto_stats_from_live_api",
+            side_effect=slow_live_api
+        ):
+            for symbols in [["BTC"], ["BTC", "ETH"], ["ETH", "BTC", "DOGE"]]:
+                thread = threading.Thread(
+                    target=lambda symbols=symbols: results.append(
+                        CryptoHelper.get_cached_crypto_stats(symbols)
+                    )
+                )
+                thread.start()
+                threads.append(thread)
+                # start the next caller once this one fetches or waits
+                deadline = time.monotonic() + 1
+                while len(calls) < len(threads) and (
+                    time.monotonic() < deadline
+                ):
+                    time.sleep(0.001)
+            release.set()
+            for thread in threads:
+                thread.join(timeout=1)
+
+        self.assertEqual(calls, [["BTC"], ["ETH"], ["DOGE"]])
+        self.assertEqual(
+            CryptoHelper.count_quote_cache_stats()["coalesced"],
+            coalesced + 2
+        )
+        self.assertEqual(len(results), 3)
+        self.assertIn(
+            {
+                "ETH": {"rate": 3},
+                "BTC": {"rate": 3},
+                "DOGE": {"rate": 4}
+            },
+            results
+        )
+
+    def test_get_cached_crypto_stat(self) -> None:
+        with patch(
+            "models.utils.crypto_helper.get_crypto_stats_from_live_api"
+        ) as mock_live:
+            mock_live.return_value = {"BTC": {"rate": 1}}
+            self.assertEqual(
+                CryptoHelper.get_cached_crypto_stat("BTC"), {"rate": 1}
+            )
+            mock_live.return_value = {}
+            self.assertIs(CryptoHelper.get_cached_crypto_stat("XYZ"), False)
+            mock_live.return_value = False
+            self.assertIs(CryptoHelper.get_cached_crypto_stat("ETH"), False)
+
+    def test_get_cached_crypto_stats_updated_at(self) -> None:
+        self.assertIsNone(
+            CryptoHelper.get_cached_crypto_stats_updated_at(["BTC"])
+        )
+        with patch.object(
+            CryptoHelper._quote_cache, "_clock", return_value=100
+        ):
+            CryptoHelper._quote_cache.set("BTC", {"rate": 1})
+        with patch.object(
+            CryptoHelper._quote_cache, "_clock", return_value=130
+        ):
+            CryptoHelper._quote_cache.set("ETH", {"rate": 2})
+        with patch.object(
+            CryptoHelper._quote_cache, "_clock", return_value=160
+        ), patch("models.utils.crypto_helper.time.time", return_value=1e9):
+            # the oldest quote on screen, fetched 60 seconds ago
+            self.assertEqual(
+                CryptoHelper.get_cached_crypto_stats_updated_at(
+                    ["BTC", "ETH"]
+                ),
+                1e9 - 60
+            )
+            self.assertIsNone(
+                CryptoHelper.get_cached_crypto_stats_updated_at(
+                    ["BTC", "DOGE"]
+                )
+            )
+
+    def test_get_cached_crypto_stats_false_type(self) -> None:
+        with self.assertRaises(TypeError):
+            CryptoHelper.get_cached_crypto_stats("BTC")
+        with self.assertRaises(TypeError):
+            CryptoHelper.get_cached_crypto_stat(1)
@@ -0,0 +1,190 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Unit tests for the record and replay cassette, recorded from a local stub
+HTTP server
+'''
+
+import datetime as dt
+import gzip
+import json
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase
+from unittest.mock import patch
+import models.utils.crypto_helper as CryptoHelper
+from models.utils.cassette import CassetteAdapter, strip_secrets
+from models.utils.http_client import HttpClient, CryptoHTTPError, \
+    CryptoTimeoutError
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers every path with its own name"""
+
+    def do_GET(self) -> None:
+        payload = json.dumps(
+            {"success": True, "path": self.path.split("?")[0]}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class TestCassette(TestCase):
+    """Unit tests for the cassette adapter
+    """
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "api.jsonl.gz")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def record(self, *paths: str) -> None:
+        cassette = CassetteAdapter(self.path, "record")
+        client = HttpClient(adapter=cassette)
+        for path in paths:
+            client.get_json(f"{self.base_url}{path}?access_key=SECRET&a=1")
+        client.close()
+        self.assertEqual(cassette.count_stats()["recorded"], len(paths))
+
+    def set_recorded_on(self, today: dt.date) -> None:
+        """Pretend the responses recorded so far were recorded on a day"""
+
+        with gzip.open(self.path, "rt", encoding="utf-8") as file:
+            entries = [json.loads(line) for line in file]
+        with gzip.open(self.path, "wt", encoding="utf-8") as file:
+            for entry in entries:
+                entry["today"] = today.isoformat()
+                file.write(json.dumps(entry) + "\n")
+
+    def test_strip_secrets(self) -> None:
+        self.assertEqual(
+            strip_secrets(
+                "http://x/live?access_key=KEY&symbols=BTC,ETH&expand=1"
+            ),
+            "http://x/live?symbols=BTC,ETH&expand=1"
+        )
+
+    def test_record_without_access_key(self) -> None:
+        self.record("/list")
+        with gzip.open(self.path, "rt", encoding="utf-8") as file:
+            content = file.read()
+        self.assertNotIn("SECRET", content)
+        self.assertIn("/list", content)
+
+    def test_record_into_new_directory(self) -> None:
+        self.path = os.path.join(
+            self.directory.name, "new", "api.jsonl.gz"
+        )
+        self.record("/list")
+        self.assertTrue(os.path.exists(self.path))
+
+    def test_replay_without_network(self) -> None:
+        self.record("/list", "/live")
+        self.record("/2023-11-30")
+        cassette = CassetteAdapter(self.path, "replay")
+        client = HttpClient(adapter=cassette)
+        with patch(
+            "requests.adapters.HTTPAdapter.send",
+            side_effect=AssertionError("network used")
+        ):
+            for path in ["/list", "/live", "/2023-11-30"]:
+                data = client.get_json(
+                    f"{self.base_url}{path}?access_key=OTHER&a=1"
+                )
+                self.assertEqual(data["path"], path)
+            with self.assertRaises(CryptoHTTPError):
+                client.get_json(f"{self.base_url}/missing")
+        self.assertEqual(
+            cassette.count_stats(),
+            {"recorded": 0, "replayed": 3, "missed": 1, "errors": 0}
+        )
+
+    def test_replay_latency(self) -> None:
+        self.record("/list")
+        cassette = CassetteAdapter(self.path, "replay", latency=0.2)
+        with patch("models.utils.cassette.time.sleep") as mock_sleep:
+            HttpClient(adapter=cassette).get_json(
+                f"{self.base_url}/list?a=1"
+            )
+        mock_sleep.assert_called_once_with(0.2)
+
+    def test_replay_error_injection(self) -> None:
+        self.record("/list")
+        cassette = CassetteAdapter(self.path, "replay", error_rate=1, seed=1)
+        client = HttpClient(adapter=cassette, max_retries=3)
+        with patch.object(HttpClient, "_sleep"):
+            with self.assertRaises((CryptoHTTPError, CryptoTimeoutError)):
+                client.get_json(f"{self.base_url}/list?a=1")
+        self.assertEqual(cassette.count_stats()["errors"], 4)
+
+    def test_init_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            CassetteAdapter(self.path, "rewind")
+        with self.assertRaises(ValueError):
+            CassetteAdapter(self.path, error_rate=2)
+        with self.assertRaises(ValueError):
+            CassetteAdapter(self.path, latency=-1)
+
+    def test_replay_today(self) -> None:
+        self.assertIsNone(CassetteAdapter(self.path, "replay").today)
+        self.record("/list")
+        self.assertEqual(
+            CassetteAdapter(self.path, "replay").today, dt.date.today()
+        )
+        self.set_recorded_on(dt.date(2023, 11, 30))
+        self.assertEqual(
+            CassetteAdapter(self.path, "replay").today, dt.date(2023, 11, 30)
+        )
+
+    def test_use_cassette_replay_uses_no_budget(self) -> None:
+        url = f"{self.base_url}/list?access_key=SECRET&a=1"
+        self.record("/list")
+        try:
+            CryptoHelper.use_cassette(self.path, "replay")
+            with patch.object(
+                CryptoHelper, "_quota_budget"
+            ) as mock_budget, patch.object(
+                CryptoHelper, "_rate_limiter"
+            ) as mock_limiter:
+                self.assertEqual(CryptoHelper.fetch_data(url)["path"], "/list")
+                mock_budget.consume.assert_not_called()
+                mock_limiter.acquire.assert_not_called()
+        finally:
+            CryptoHelper.use_cassette(mode=None)
+
+    def test_use_cassette_replay_pins_today(self) -> None:
+        recorded_on = dt.date(2023, 11, 30)
+        self.record("/2023-11-29", "/2023-11-30")
+        self.set_recorded_on(recorded_on)
+        self.assertNotEqual(CryptoHelper.get_today(), recorded_on)
+        try:
+            CryptoHelper.use_cassette(self.path, "replay")
+            self.assertEqual(CryptoHelper.get_today(), recorded_on)
+            self.assertEqual(
+                CryptoHelper.get_historical_date_list(2),
+                ["2023-11-29", "2023-11-30"]
+            )
+        finally:
+            CryptoHelper.use_cassette(mode=None)
+        self.assertEqual(CryptoHelper.get_today(), dt.date.today())
@@ -120,3 +120,65 @@ class TestCrypto(TestCase):
 0.1 | 1000 | 100000 | 5000 | 0.3 | 21.2 | [('2023/11/21', 0.5), \
 ('2023/11/22', 0.6), ('2023/11/23', 0.7)]"
         )
+
+    def test_crypto_has_no_instance_dict(self) -> None:
+        test_crypto = Crypto("BTC", {"rate": 0.5})
+        self.assertFalse(hasattr(test_crypto, "__dict__"))
+        with self.assertRaises(AttributeError):
+            test_crypto.price = 1
+
+    def test_crypto_reads_stat_on_access(self) -> None:
+        feed_in_stat = {"rate": 0.5}
+        test_crypto = Crypto("BTC", feed_in_stat)
+        feed_in_stat["rate"] = 0.6
+        self.assertEqual(test_crypto.rates, 0.6)
+        self.assertEqual(test_crypto.high, 0)
+
+    def test_crypto_from_live_data(self) -> None:
+        raw_data = {
+            "rates": {
+                "BTC": {"rate": 0.5, "high": 1},
+                "ETH": {"rate": 0.2}
+            }
+        }
+        test_cryptos = Crypto.from_live_data(raw_data)
+        self.assertEqual(
+            [crypto.symbol for crypto in test_cryptos], ["BTC", "ETH"]
+        )
+        self.assertEqual(test_cryptos[0].high, 1)
+        self.assertEqual(test_cryptos[1].rates, 0.2)
+        self.assertEqual(test_cryptos[1].historical_data, [])
+
+    def test_crypto_from_live_data_with_symbols(self) -> None:
+        raw_data = {"rates": {"BTC": {"rate": 0.5}}}
+        test_cryptos = Crypto.from_live_data(raw_data, ["DOGE", "BTC"])
+        self.assertEqual(test_cryptos[0].symbol, "DOGE")
+        self.assertEqual(test_cryptos[0].rates, 0)
+        self.assertEqual(test_cryptos[1].rates, 0.5)
+        self.assertEqual(
+            str(test_cryptos[0]),
+            "DOGE | https://assets.coinlayer.com/icons/DOGE.png | 0 | 0 | \
+0 | 0 | 0 | 0 | 0 | 0 | []"
+        )
+
+    def test_crypto_from_live_data_invalid(self) -> None:
+        with self.assertRaises(TypeError):
+            Crypto.from_live_data([])
+        with self.assertRaises(TypeError):
+            Crypto.from_live_data({"rates": {}}, "BTC")
+
+    def test_crypto_time_series_follows_historical_data(self) -> None:
+        test_crypto = Crypto("BTC", historical_data=[("2023-11-21", 0.5)])
+        self.assertEqual(test_crypto.time_series.rates.tolist(), [0.5])
+        # reassigned
+        test_crypto.historical_data = [
+            ("2023-11-21", 0.5), ("2023-11-22", 0.6)
+        ]
+        self.assertEqual(test_crypto.time_series.rates.tolist(), [0.5, 0.6])
+        # grown in place
+        test_crypto.historical_data.append(("2023-11-23", 0.7))
+        self.assertEqual(
+            test_crypto.time_series.rates.tolist(), [0.5, 0.6, 0.7]
+        )
+        with self.assertRaises(TypeError):
+            test_crypto.historical_data = "2023-11-21"
@@ -10,6 +10,8 @@ from unittest.mock import patch
 from datetime import date
 import requests.exceptions as re
 import models.utils.crypto_helper as CryptoHelper
+from models.utils.http_client import CryptoTimeoutError, \
+    CryptoQuotaExceededError
 
 # Using unittest.mock.patch to mock the API responses
 
@@ -18,7 +20,7 @@ class TestCryptoHelper(TestCase):
     """Unit tests for crypto helper functions
     """
     def test_fetch_data_successful(self) -> None:
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             response_dict = {
                 "success": True,
                 "rates": {
@@ -32,7 +34,7 @@ class TestCryptoHelper(TestCase):
             assert result == response_dict
 
     def test_fetch_data_fail(self) -> None:
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             response_dict = {
                 "success": False,
                 "error": {
@@ -47,7 +49,7 @@ class TestCryptoHelper(TestCase):
             assert result is False
 
     def test_fetch_data_http_error(self) -> None:
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_get.side_effect = re.HTTPError("HTTP Error")
 
             with self.assertRaises(Exception):
@@ -56,7 +58,8 @@ class TestCryptoHelper(TestCase):
                 )
 
     def test_fetch_data_connection_error(self) -> None:
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get, \
+                patch("models.utils.http_client.time.sleep"):
             mock_get.side_effect = re.ConnectionError("Connection Error")
 
             with self.assertRaises(Exception):
@@ -65,7 +68,8 @@ class TestCryptoHelper(TestCase):
                 )
 
     def test_fetch_Data_timeout_error(self) -> None:
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get, \
+                patch("models.utils.http_client.time.sleep"):
             mock_get.side_effect = re.Timeout("Timeout Error")
 
             with self.assertRaises(Exception):
@@ -74,7 +78,7 @@ class TestCryptoHelper(TestCase):
                 )
 
     def test_fetch_data_redirect_error(self) -> None:
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_get.side_effect = re.TooManyRedirects("Redirect Error")
 
             with self.assertRaises(Exception):
@@ -144,6 +148,54 @@ class TestCryptoHelper(TestCase):
             result = CryptoHelper.get_crypto_stat_from_live_api("BTC")
             assert result is False
 
+    def test_get_crypto_stats_from_live_api_successful(self) -> None:
+        with patch("models.utils.crypto_helper.fetch_data") as mock_fetch_data:
+            stat = {
+                "rate": 1,
+                "high": 2,
+                "low": 3,
+                "vol": 4,
+                "cap": 5,
+                "sup": 6,
+                "change": 7,
+                "change_pct": 8
+            }
+            mock_fetch_data.return_value = {
+                "success": True,
+                "rates": {
+                    "BTC": stat,
+                    "ETH": stat
+                }
+            }
+            result = CryptoHelper.get_crypto_stats_from_live_api(
+                ["BTC", "ETH", "BTC"]
+            )
+            assert result == {"BTC": stat, "ETH": stat}
+            # One request for all symbols, duplicates dropped
+            mock_fetch_data.assert_called_once()
+            assert "symbols=BTC,ETH&" in mock_fetch_data.call_args[0][0]
+
+    def test_get_crypto_stats_from_live_api_chunks(self) -> None:
+        with patch("models.utils.crypto_helper.fetch_data") as mock_fetch_data:
+            mock_fetch_data.return_value = {"success": True, "rates": {}}
+            CryptoHelper.get_crypto_stats_from_live_api(
+                ["BTC", "ETH", "DOGE", "ADA", "XRP"], chunk_size=2
+            )
+            assert mock_fetch_data.call_count == 3
+
+    def test_get_crypto_stats_from_live_api_fail(self) -> None:
+        with patch("models.utils.crypto_helper.fetch_data") as mock_fetch_data:
+            mock_fetch_data.return_value = False
+
+            result = CryptoHelper.get_crypto_stats_from_live_api(["BTC"])
+            assert result is False
+
+    def test_get_crypto_stats_from_live_api_false_type(self) -> None:
+        with self.assertRaises(TypeError):
+            CryptoHelper.get_crypto_stats_from_live_api("BTC")
+        with self.assertRaises(TypeError):
+            CryptoHelper.get_crypto_stats_from_live_api([1])
+
     def test_get_crypto_day_historical_data_fail(self) -> None:
         with patch("models.utils.crypto_helper.fetch_data") as mock_fetch_data:
             mock_fetch_data.return_value = False
@@ -162,23 +214,26 @@ class TestCryptoHelper(TestCase):
                 mock_fetch_data, patch("datetime.date") as mock_date:
             # mock date to a fixed date
             mock_date.today.return_value = date(2023, 11, 30)
-            # side effect to return different data each call
-            mock_fetch_data.side_effect = [
-                {
+            # days are fetched concurrently, so answer by the requested date
+            responses = {
+                "2023-11-30": {
                     "success": True,
                     "date": "2023-11-30",
                     "rates": {
                         "BTC": 1
                         }
                 },
-                {
+                "2023-11-29": {
                     "success": True,
                     "date": "2023-11-29",
                     "rates": {
                         "BTC": 2
                         }
                 }
-            ]
+            }
+            mock_fetch_data.side_effect = (
+                lambda url: responses[url.split("/")[3].split("?")[0]]
+            )
 
             result = CryptoHelper.get_crypto_day_historical_data("BTC", 2)
             expected = [
@@ -186,3 +241,79 @@ class TestCryptoHelper(TestCase):
                 ("2023-11-30", 1)
             ]
             assert result == expected
+
+    def test_get_crypto_day_historical_data_partial(self) -> None:
+        with patch("models.utils.crypto_helper.fetch_data") as \
+                mock_fetch_data, patch("datetime.date") as mock_date:
+            mock_date.today.return_value = date(2023, 11, 30)
+            mock_fetch_data.side_effect = (
+                lambda url: False if "2023-11-29" in url
+                else {"success": True, "rates": {"BTC": 1}}
+            )
+
+            result = CryptoHelper.get_crypto_day_historical_data(
+                "BTC", 3, max_workers=2, allow_partial=True
+            )
+            expected = [
+                ("2023-11-28", 1),
+                ("2023-11-29", None),
+                ("2023-11-30", 1)
+            ]
+            assert result == expected
+
+            result = CryptoHelper.get_crypto_day_historical_data("BTC", 3)
+            assert result is False
+
+    def test_get_crypto_day_historical_data_partial_errors(self) -> None:
+        def fetch_data(url: str) -> dict:
+            if "2023-11-29" in url:
+                raise CryptoTimeoutError("Timeout error occurred")
+            return {"success": True, "rates": {"BTC": 1}}
+
+        with patch(
+            "models.utils.crypto_helper.fetch_data", side_effect=fetch_data
+        ), patch("datetime.date") as mock_date:
+            mock_date.today.return_value = date(2023, 11, 30)
+            result = CryptoHelper.get_crypto_day_historical_data(
+                "BTC", 3, allow_partial=True
+            )
+            self.assertEqual(
+                result,
+                [("2023-11-28", 1), ("2023-11-29", None), ("2023-11-30", 1)]
+            )
+            with self.assertRaises(CryptoTimeoutError):
+                CryptoHelper.get_crypto_day_historical_data("BTC", 3)
+
+    def test_get_crypto_day_historical_data_quota_exceeded(self) -> None:
+        with patch(
+            "models.utils.crypto_helper.fetch_data",
+            side_effect=CryptoQuotaExceededError("budget is exhausted")
+        ):
+            with self.assertRaises(CryptoQuotaExceededError):
+                CryptoHelper.get_crypto_day_historical_data(
+                    "BTC", 3, allow_partial=True
+                )
+
+    def test_fetch_historical_rates(self) -> None:
+        with patch("models.utils.crypto_helper.fetch_data") as \
+                mock_fetch_data:
+            mock_fetch_data.return_value = {
+                "success": True,
+                "rates": {"BTC": 1, "ETH": 2}
+            }
+            result = CryptoHelper.fetch_historical_rates(
+                ["BTC", "ETH", "XYZ"], "2023-11-30"
+            )
+            self.assertEqual(result, {"BTC": 1, "ETH": 2, "XYZ": 0})
+            self.assertIn(
+                "symbols=BTC,ETH,XYZ", mock_fetch_data.call_args.args[0]
+            )
+
+            mock_fetch_data.return_value = False
+            self.assertIsNone(
+                CryptoHelper.fetch_historical_rates(["BTC"], "2023-11-30")
+            )
+
+    def test_get_crypto_day_historical_data_invalid_workers(self) -> None:
+        with self.assertRaises(ValueError):
+            CryptoHelper.get_crypto_day_historical_data("BTC", max_workers=0)
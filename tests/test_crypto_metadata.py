@@ -0,0 +1,117 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Unit tests for the crypto metadata classes
+'''
+
+from unittest import TestCase
+from models.crypto_metadata import CryptoMetadata, CryptoMetadataStore, \
+    parse_max_supply
+
+
+CRYPTO_LIST = {
+    "BTC": {
+        "symbol": "BTC",
+        "name": "Bitcoin",
+        "name_full": "Bitcoin (BTC)",
+        "max_supply": "21000000",
+        "icon_url": "https://assets.coinlayer.com/icons/BTC.png"
+    },
+    "ETH": {
+        "symbol": "ETH",
+        "name": "Ethereum",
+        "name_full": "Ethereum (ETH)",
+        "max_supply": "N/A",
+        "icon_url": "https://assets.coinlayer.com/icons/ETH.png"
+    }
+}
+
+
+class TestCryptoMetadata(TestCase):
+    """Unit tests for one metadata record
+    """
+    def test_from_list_data(self) -> None:
+        record = CryptoMetadata.from_list_data("BTC", CRYPTO_LIST["BTC"])
+        self.assertEqual(record.name, "Bitcoin")
+        self.assertEqual(record.name_full, "Bitcoin (BTC)")
+        self.assertEqual(record.max_supply, 21000000.0)
+        self.assertEqual(
+            record.icon_url, "https://assets.coinlayer.com/icons/BTC.png"
+        )
+
+    def test_missing_details(self) -> None:
+        record = CryptoMetadata.from_list_data("XYZ", {})
+        self.assertEqual(record.name, "XYZ")
+        self.assertEqual(record.name_full, "XYZ")
+        self.assertIsNone(record.icon_url)
+        self.assertIsNone(record.max_supply)
+
+    def test_slots(self) -> None:
+        record = CryptoMetadata("BTC")
+        self.assertFalse(hasattr(record, "__dict__"))
+        with self.assertRaises(AttributeError):
+            record.rate = 1
+
+    def test_init_invalid(self) -> None:
+        with self.assertRaises(TypeError):
+            CryptoMetadata(1)
+        with self.assertRaises(TypeError):
+            CryptoMetadata.from_list_data("BTC", "Bitcoin")
+
+    def test_parse_max_supply(self) -> None:
+        self.assertEqual(parse_max_supply(21000000), 21000000.0)
+        self.assertEqual(parse_max_supply("1.5"), 1.5)
+        self.assertIsNone(parse_max_supply("N/A"))
+        self.assertIsNone(parse_max_supply(None))
+        self.assertIsNone(parse_max_supply(0))
+
+
+class TestCryptoMetadataStore(TestCase):
+    """Unit tests for the metadata store
+    """
+    def test_from_list_data(self) -> None:
+        store = CryptoMetadataStore.from_list_data(CRYPTO_LIST)
+        self.assertEqual(len(store), 2)
+        self.assertIn("BTC", store)
+        self.assertEqual(store.get("ETH").name_full, "Ethereum (ETH)")
+        self.assertIsNone(store.get("DOGE"))
+
+    def test_get_name(self) -> None:
+        store = CryptoMetadataStore.from_list_data(CRYPTO_LIST)
+        self.assertEqual(store.get_name("BTC"), "Bitcoin")
+        self.assertEqual(store.get_name("DOGE"), "DOGE")
+
+    def test_updated_only_changed(self) -> None:
+        store = CryptoMetadataStore.from_list_data(CRYPTO_LIST)
+        btc = store.get("BTC")
+        newer = dict(CRYPTO_LIST)
+        newer["ETH"] = dict(CRYPTO_LIST["ETH"], name="Ether")
+        newer["DOGE"] = {"name": "Dogecoin"}
+        newer_store, changed = store.updated(newer)
+        self.assertEqual(changed, 2)
+        self.assertIs(newer_store.get("BTC"), btc)
+        self.assertEqual(newer_store.get_name("ETH"), "Ether")
+        self.assertEqual(newer_store.get_name("DOGE"), "Dogecoin")
+        # the store itself never changes
+        self.assertEqual(store.get_name("ETH"), "Ethereum")
+        self.assertNotIn("DOGE", store)
+        self.assertEqual(newer_store.updated(newer), (newer_store, 0))
+
+    def test_updated_remove_missing(self) -> None:
+        store = CryptoMetadataStore.from_list_data(CRYPTO_LIST)
+        self.assertEqual(store.updated({}), (store, 0))
+        newer_store, changed = store.updated(
+            {"BTC": CRYPTO_LIST["BTC"]}, remove_missing=True
+        )
+        self.assertEqual(changed, 1)
+        self.assertNotIn("ETH", newer_store)
+        self.assertEqual(len(store), 2)
+
+    def test_init_invalid(self) -> None:
+        with self.assertRaises(TypeError):
+            CryptoMetadataStore("BTC")
+        with self.assertRaises(TypeError):
+            CryptoMetadataStore(["BTC"])
+        with self.assertRaises(TypeError):
+            CryptoMetadataStore().updated(["BTC"])
@@ -6,9 +6,18 @@ Unit tests for crypto data class
 '''
 
 from unittest import TestCase
+from models.crypto_metadata import CryptoMetadataStore
 from models.crypto_name_list import CryptoNameList
 
 
+def make_metadata(names: dict) -> CryptoMetadataStore:
+    """Metadata store of {symbol: name}"""
+
+    return CryptoMetadataStore.from_list_data({
+        symbol: {"name": name} for symbol, name in names.items()
+    })
+
+
 class TestCryptoNameList(TestCase):
     """unit tests for crypto name list class
     """
@@ -31,3 +40,100 @@ class TestCryptoNameList(TestCase):
         test_crypto_names = ["BTC", "ETH", "DOGE"]
         crypto_name_list = CryptoNameList(test_crypto_names)
         self.assertEqual(crypto_name_list.count_crypto_names(), 3)
+
+    def test_get_full_name(self) -> None:
+        crypto_name_list = CryptoNameList(
+            ["BTC", "ETH"], make_metadata({"BTC": "Bitcoin"})
+        )
+        self.assertEqual(crypto_name_list.get_full_name("BTC"), "Bitcoin")
+        self.assertEqual(crypto_name_list.get_full_name("ETH"), "ETH")
+
+    def test_enriched_data(self) -> None:
+        metadata = CryptoMetadataStore.from_list_data({
+            "BTC": {"name": "Bitcoin", "max_supply": 21000000}
+        })
+        crypto_name_list = CryptoNameList(
+            ["BTC", "ETH"], enriched_crypto_data=metadata
+        )
+        self.assertEqual(crypto_name_list.get_full_name("BTC"), "Bitcoin")
+        self.assertEqual(
+            crypto_name_list.get_enriched_data("BTC").max_supply, 21000000
+        )
+        self.assertIsNone(crypto_name_list.get_enriched_data("ETH"))
+
+    def test_update_enriched_data(self) -> None:
+        metadata = make_metadata({"BTC": "Bitcoin"})
+        crypto_name_list = CryptoNameList(["BTC", "ETH"], metadata)
+        self.assertEqual(crypto_name_list.search("ethereum"), [])
+        self.assertEqual(
+            crypto_name_list.update_enriched_data(
+                {"ETH": {"name": "Ethereum"}}
+            ),
+            1
+        )
+        self.assertEqual(crypto_name_list.search("ethereum"), ["ETH"])
+        # the store shared with other lists is left as it was
+        self.assertNotIn("ETH", metadata)
+
+    def test_init_invalid_enriched_data(self) -> None:
+        with self.assertRaises(TypeError):
+            CryptoNameList(["BTC"], enriched_crypto_data={"BTC": "Bitcoin"})
+
+
+class TestCryptoNameListSearch(TestCase):
+    """unit tests for searching the crypto name list
+    """
+    def setUp(self) -> None:
+        self.crypto_name_list = CryptoNameList(
+            ["BTC", "BCH", "ETH", "ETC", "DOGE", "WBTC"],
+            make_metadata({
+                "BTC": "Bitcoin",
+                "BCH": "Bitcoin Cash",
+                "ETH": "Ethereum",
+                "ETC": "Ethereum Classic",
+                "DOGE": "Dogecoin",
+                "WBTC": "Wrapped Bitcoin"
+            })
+        )
+
+    def test_search_exact_symbol_first(self) -> None:
+        # ETC is one typo away and ranks after the substring match
+        self.assertEqual(
+            self.crypto_name_list.search("btc"), ["BTC", "WBTC", "ETC"]
+        )
+
+    def test_search_name_prefix(self) -> None:
+        self.assertEqual(
+            self.crypto_name_list.search("bitcoin"), ["BTC", "BCH", "WBTC"]
+        )
+
+    def test_search_substring(self) -> None:
+        self.assertEqual(self.crypto_name_list.search("cash"), ["BCH"])
+
+    def test_search_typo(self) -> None:
+        self.assertEqual(self.crypto_name_list.search("etherum")[0], "ETH")
+        self.assertEqual(self.crypto_name_list.search("bitcon")[0], "BTC")
+
+    def test_search_typo_among_tied_candidates(self) -> None:
+        # more keys than TYPO_CANDIDATE_LIMIT share as many n-grams with
+        # the query as "finance" does, and sort before it
+        symbols = [f"X{number:03d}" for number in range(300)] + ["FIN"]
+        full_names = {symbol: f"{symbol[1:]} nanse" for symbol in symbols}
+        full_names["FIN"] = "Finance"
+        crypto_name_list = CryptoNameList(
+            symbols, make_metadata(full_names)
+        )
+        self.assertEqual(crypto_name_list.search("finanse"), ["FIN"])
+
+    def test_search_limit(self) -> None:
+        self.assertEqual(len(self.crypto_name_list.search("e", k=1)), 1)
+
+    def test_search_no_match(self) -> None:
+        self.assertEqual(self.crypto_name_list.search("zzz"), [])
+        self.assertEqual(self.crypto_name_list.search("  "), [])
+
+    def test_search_invalid(self) -> None:
+        with self.assertRaises(TypeError):
+            self.crypto_name_list.search(None)
+        with self.assertRaises(ValueError):
+            self.crypto_name_list.search("btc", k=0)
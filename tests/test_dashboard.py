@@ -0,0 +1,90 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Unit tests for the auto refresh mode of the dashboard page
+'''
+
+from unittest import TestCase
+from unittest.mock import Mock, patch
+from models.crypto import Crypto
+from views.dashboard import auto_refresh, wait_for_next_update
+
+
+class TestAutoRefresh(TestCase):
+    """Unit tests for the auto refresh loop
+    """
+    def setUp(self) -> None:
+        self.session_state = {}
+        self.patcher = patch("streamlit.session_state", self.session_state)
+        self.patcher.start()
+        self.last_updated = Mock()
+        self.placeholders = {"BTC": Mock(), "ETH": Mock()}
+        self.countdown = Mock()
+        self.sleep = Mock()
+
+    def tearDown(self) -> None:
+        self.patcher.stop()
+
+    def test_only_changed_quotes_redrawn(self) -> None:
+        quotes = iter([
+            [
+                Crypto("BTC", {"rate": 1.0, "change_pct": 2.0}),
+                Crypto("ETH", {"rate": 3.0, "change_pct": 4.0})
+            ],
+            [
+                Crypto("BTC", {"rate": 1.0, "change_pct": 2.0}),
+                Crypto("ETH", {"rate": 3.5, "change_pct": 4.0})
+            ]
+        ])
+        auto_refresh(
+            self.last_updated, self.placeholders, lambda: next(quotes), 10,
+            get_updated_at=lambda: 0.0, ticks=2, sleep=self.sleep,
+            countdown=self.countdown
+        )
+        # slept in one second slices
+        self.assertEqual(self.sleep.call_count, 20)
+        self.sleep.assert_called_with(1)
+        self.assertEqual(self.placeholders["BTC"].metric.call_count, 1)
+        self.assertEqual(self.placeholders["ETH"].metric.call_count, 2)
+        self.assertEqual(self.last_updated.text.call_count, 2)
+
+    def test_failed_load_keeps_quotes(self) -> None:
+        load_cryptos = Mock(side_effect=ValueError("not available"))
+        auto_refresh(
+            self.last_updated, self.placeholders, load_cryptos, 10,
+            ticks=3, sleep=self.sleep, countdown=self.countdown
+        )
+        self.assertEqual(load_cryptos.call_count, 3)
+        self.placeholders["BTC"].metric.assert_not_called()
+        self.last_updated.text.assert_not_called()
+
+    def test_invalid_interval(self) -> None:
+        with self.assertRaises(ValueError):
+            auto_refresh(self.last_updated, self.placeholders, list, 0)
+
+    def test_wait_draws_countdown_between_slices(self) -> None:
+        wait_for_next_update(self.countdown, 2.5, self.sleep)
+        self.assertEqual(
+            [call.args[0] for call in self.sleep.call_args_list],
+            [1, 1, 0.5]
+        )
+        self.assertEqual(
+            [call.args[0] for call in self.countdown.caption.call_args_list],
+            ["Next update in 3s", "Next update in 2s", "Next update in 1s"]
+        )
+
+    def test_rerun_request_ends_wait(self) -> None:
+        # Streamlit raises its control exceptions when the countdown draws
+        class RerunRequested(BaseException):
+            pass
+
+        self.countdown.caption.side_effect = [None, RerunRequested()]
+        load_cryptos = Mock()
+        with self.assertRaises(RerunRequested):
+            auto_refresh(
+                self.last_updated, self.placeholders, load_cryptos, 300,
+                sleep=self.sleep, countdown=self.countdown
+            )
+        self.assertEqual(self.sleep.call_count, 1)
+        load_cryptos.assert_not_called()
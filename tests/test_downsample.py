@@ -0,0 +1,94 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Unit tests for the chart downsampling helper functions
+'''
+
+from unittest import TestCase
+from unittest.mock import patch
+import numpy as np
+from models.time_series import TimeSeries
+from models.utils.cache import TTLCache
+from models.utils.downsample import lttb_indices, min_max_indices, \
+    downsample_indices, downsample_series, get_cached_chart_series
+
+
+def make_series(size: int) -> TimeSeries:
+    dates = np.datetime64("2023-01-01") + np.arange(size)
+    rates = np.sin(np.arange(size) / 20) + 2
+    return TimeSeries(dates, rates)
+
+
+class TestDownsample(TestCase):
+    """Unit tests for the chart downsampling helper functions
+    """
+    def test_lttb_keeps_budget_and_ends(self) -> None:
+        x = np.arange(1000, dtype="float64")
+        y = np.sin(x / 50)
+        kept = lttb_indices(x, y, 100)
+        self.assertEqual(len(kept), 100)
+        self.assertEqual(kept[0], 0)
+        self.assertEqual(kept[-1], 999)
+        self.assertTrue(np.all(np.diff(kept) > 0))
+
+    def test_lttb_keeps_spike(self) -> None:
+        x = np.arange(1000, dtype="float64")
+        y = np.zeros(1000)
+        y[500] = 10
+        self.assertIn(500, lttb_indices(x, y, 50))
+
+    def test_min_max_keeps_extremes(self) -> None:
+        y = np.sin(np.arange(1000) / 7)
+        y[123] = -5
+        y[877] = 5
+        kept = min_max_indices(y, 40)
+        self.assertLessEqual(len(kept), 40)
+        self.assertIn(123, kept)
+        self.assertIn(877, kept)
+
+    def test_short_series_unchanged(self) -> None:
+        series = make_series(7)
+        self.assertIs(downsample_series(series, 200), series)
+        self.assertEqual(
+            downsample_indices(np.arange(3), np.ones(3), 3).tolist(),
+            [0, 1, 2]
+        )
+
+    def test_missing_rates_left_out(self) -> None:
+        series = make_series(400)
+        series.rates[10:20] = np.nan
+        downsampled = downsample_series(series, 100, "minmax")
+        self.assertLessEqual(len(downsampled), 100)
+        self.assertFalse(np.isnan(downsampled.rates).any())
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            downsample_indices(np.arange(3), np.ones(3), method="mean")
+        with self.assertRaises(ValueError):
+            downsample_indices(np.arange(3), np.ones(3), budget=0)
+        with self.assertRaises(TypeError):
+            downsample_series([1, 2, 3])
+        with self.assertRaises(ValueError):
+            get_cached_chart_series("BTC", "2W", make_series(7))
+
+    def test_get_cached_chart_series(self) -> None:
+        with patch(
+            "models.utils.downsample._chart_cache", TTLCache(8, 60)
+        ), patch(
+            "models.utils.downsample.downsample_series",
+            wraps=downsample_series
+        ) as mock_downsample:
+            series = make_series(365)
+            first = get_cached_chart_series("BTC", "1Y", series, 100)
+            self.assertIs(
+                get_cached_chart_series("BTC", "1Y", make_series(365), 100),
+                first
+            )
+            self.assertEqual(mock_downsample.call_count, 1)
+
+            # A new rate for the latest day is downsampled again
+            series.rates[-1] = 10
+            updated = get_cached_chart_series("BTC", "1Y", series, 100)
+            self.assertEqual(updated.rates[-1], 10)
+            self.assertEqual(mock_downsample.call_count, 2)
@@ -0,0 +1,103 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Unit tests for the historical rates store
+'''
+
+from unittest import TestCase
+from unittest.mock import patch
+from datetime import date
+from models.utils.history_store import HistoryStore
+import models.utils.crypto_helper as CryptoHelper
+
+
+class TestHistoryStore(TestCase):
+    """Unit tests for the historical rates store
+    """
+    def setUp(self) -> None:
+        self.store = HistoryStore(":memory:")
+
+    def tearDown(self) -> None:
+        self.store.close()
+
+    def test_init_invalid_path_type(self) -> None:
+        with self.assertRaises(TypeError):
+            HistoryStore(1)
+
+    def test_save_and_get_rates(self) -> None:
+        saved = self.store.save_rates(
+            "BTC", [("2023-11-28", 1.0), ("2023-11-29", 2.0)]
+        )
+        self.assertEqual(saved, 2)
+        result = self.store.get_rates(
+            "BTC", ["2023-11-28", "2023-11-29", "2023-11-30"]
+        )
+        self.assertEqual(result, {"2023-11-28": 1.0, "2023-11-29": 2.0})
+        self.assertEqual(self.store.count_stats(), {"hits": 2, "misses": 1})
+
+    def test_save_rates_skips_today_and_gaps(self) -> None:
+        today = date.today().strftime("%Y-%m-%d")
+        saved = self.store.save_rates(
+            "BTC", [("2023-11-28", None), (today, 3.0)]
+        )
+        self.assertEqual(saved, 0)
+        self.assertEqual(
+            self.store.get_rates("BTC", ["2023-11-28", today]), {}
+        )
+
+    def test_save_date_rates(self) -> None:
+        saved = self.store.save_date_rates(
+            "2023-11-28", {"BTC": 1.0, "ETH": 2.0, "DOGE": None}
+        )
+        self.assertEqual(saved, 2)
+        self.assertEqual(
+            self.store.get_rates("ETH", ["2023-11-28"]), {"2023-11-28": 2.0}
+        )
+        today = date.today().strftime("%Y-%m-%d")
+        self.assertEqual(self.store.save_date_rates(today, {"BTC": 1.0}), 0)
+        with self.assertRaises(TypeError):
+            self.store.save_date_rates("2023-11-28", [("BTC", 1.0)])
+
+    def test_historical_data_only_fetches_missing_dates(self) -> None:
+        self.store.save_rates("BTC", [("2023-11-28", 1.0)])
+        with patch("models.utils.crypto_helper.fetch_data") as \
+                mock_fetch_data, patch("datetime.date") as mock_date:
+            mock_date.today.return_value = date(2023, 11, 30)
+            mock_fetch_data.return_value = {
+                "success": True, "rates": {"BTC": 2.0}
+            }
+
+            result = CryptoHelper.get_crypto_day_historical_data(
+                "BTC", 3, store=self.store
+            )
+            self.assertEqual(result, [
+                ("2023-11-28", 1.0),
+                ("2023-11-29", 2.0),
+                ("2023-11-30", 2.0)
+            ])
+            self.assertEqual(mock_fetch_data.call_count, 2)
+
+            # Only today is fetched again
+            mock_fetch_data.reset_mock()
+            CryptoHelper.get_crypto_day_historical_data(
+                "BTC", 3, store=self.store
+            )
+            self.assertEqual(mock_fetch_data.call_count, 1)
+
+    def test_warm_up_historical_data(self) -> None:
+        with patch("models.utils.crypto_helper.fetch_data") as \
+                mock_fetch_data, patch("datetime.date") as mock_date:
+            mock_date.today.return_value = date(2023, 11, 30)
+            mock_fetch_data.return_value = {
+                "success": True, "rates": {"BTC": 1.0, "ETH": 2.0}
+            }
+
+            result = CryptoHelper.warm_up_historical_data(
+                ["BTC", "ETH"], self.store, 2
+            )
+            self.assertEqual(result, {"hits": 0, "misses": 4})
+            result = CryptoHelper.warm_up_historical_data(
+                ["BTC", "ETH"], self.store, 2
+            )
+            self.assertEqual(result, {"hits": 2, "misses": 2})
@@ -0,0 +1,146 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Unit tests for the pooled http client
+'''
+
+from unittest import TestCase
+from unittest.mock import patch, Mock
+import requests
+import requests.exceptions as re
+from models.utils.http_client import HttpClient, CryptoAPIError, \
+    CryptoHTTPError, CryptoConnectionError, CryptoTimeoutError, \
+    CryptoRedirectError
+
+
+def make_response(status_code: int, body: dict = None) -> Mock:
+    """Build a fake requests response"""
+
+    response = Mock()
+    response.status_code = status_code
+    response.headers = {}
+    response.json.return_value = body
+    if status_code >= 400:
+        response.raise_for_status.side_effect = re.HTTPError(
+            f"{status_code} Error", response=response
+        )
+    return response
+
+
+class TestHttpClient(TestCase):
+    """Unit tests for the pooled http client
+    """
+    def setUp(self) -> None:
+        self.client = HttpClient(max_retries=2)
+        sleep_patcher = patch("models.utils.http_client.time.sleep")
+        self.mock_sleep = sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+
+    def test_init_invalid(self) -> None:
+        with self.assertRaises(TypeError):
+            HttpClient(pool_size="10")
+        with self.assertRaises(ValueError):
+            HttpClient(pool_size=0)
+        with self.assertRaises(ValueError):
+            HttpClient(max_retries=-1)
+
+    def test_session_is_pooled(self) -> None:
+        client = HttpClient(pool_size=4)
+        adapter = client.session.get_adapter("http://api.coinlayer.com")
+        self.assertEqual(adapter._pool_maxsize, 4)
+
+    def test_get_json_successful(self) -> None:
+        with patch.object(self.client.session, "get") as mock_get:
+            mock_get.return_value = make_response(200, {"success": True})
+            self.assertEqual(
+                self.client.get_json("http://test.api.com"),
+                {"success": True}
+            )
+            self.mock_sleep.assert_not_called()
+
+    def test_get_json_retries_server_errors(self) -> None:
+        with patch.object(self.client.session, "get") as mock_get:
+            mock_get.side_effect = [
+                make_response(503),
+                make_response(429),
+                make_response(200, {"success": True})
+            ]
+            self.assertEqual(
+                self.client.get_json("http://test.api.com"),
+                {"success": True}
+            )
+            self.assertEqual(self.mock_sleep.call_count, 2)
+
+    def test_get_json_before_attempt(self) -> None:
+        before_attempt = Mock()
+        with patch.object(self.client.session, "get") as mock_get:
+            mock_get.side_effect = [
+                make_response(503),
+                re.Timeout("timed out"),
+                make_response(200, {"success": True})
+            ]
+            self.client.get_json(
+                "http://test.api.com", before_attempt=before_attempt
+            )
+        self.assertEqual(before_attempt.call_count, 3)
+
+        before_attempt.side_effect = ValueError("no budget")
+        with patch.object(self.client.session, "get") as mock_get:
+            with self.assertRaises(ValueError):
+                self.client.get_json(
+                    "http://test.api.com", before_attempt=before_attempt
+                )
+            mock_get.assert_not_called()
+
+    def test_get_json_retry_after_header(self) -> None:
+        with patch.object(self.client.session, "get") as mock_get:
+            limited = make_response(429)
+            limited.headers = {"Retry-After": "3"}
+            mock_get.side_effect = [limited, make_response(200, {})]
+            self.client.get_json("http://test.api.com")
+            self.mock_sleep.assert_called_once_with(3)
+
+    def test_get_json_gives_up_with_http_error(self) -> None:
+        with patch.object(self.client.session, "get") as mock_get:
+            mock_get.return_value = make_response(500)
+            with self.assertRaises(CryptoHTTPError) as context:
+                self.client.get_json("http://test.api.com")
+            self.assertEqual(mock_get.call_count, 3)
+            # still caught by handlers of the requests exceptions
+            self.assertIsInstance(
+                context.exception, requests.exceptions.HTTPError
+            )
+            self.assertEqual(context.exception.response.status_code, 500)
+
+    def test_get_json_does_not_retry_client_errors(self) -> None:
+        with patch.object(self.client.session, "get") as mock_get:
+            mock_get.return_value = make_response(404)
+            with self.assertRaises(CryptoHTTPError):
+                self.client.get_json("http://test.api.com")
+            mock_get.assert_called_once()
+
+    def test_get_json_retries_timeouts(self) -> None:
+        with patch.object(self.client.session, "get") as mock_get:
+            mock_get.side_effect = [
+                re.Timeout("Timeout"),
+                make_response(200, {"success": True})
+            ]
+            self.assertEqual(
+                self.client.get_json("http://test.api.com"),
+                {"success": True}
+            )
+
+    def test_get_json_typed_errors(self) -> None:
+        errors = [
+            (re.Timeout("Timeout"), CryptoTimeoutError),
+            (re.ConnectionError("Connection"), CryptoConnectionError),
+            (re.TooManyRedirects("Redirect"), CryptoRedirectError)
+        ]
+        for raised, expected in errors:
+            with patch.object(self.client.session, "get") as mock_get:
+                mock_get.side_effect = raised
+                with self.assertRaises(expected) as context:
+                    self.client.get_json("http://test.api.com")
+                self.assertIsInstance(context.exception, CryptoAPIError)
+                self.assertIsInstance(context.exception, type(raised))
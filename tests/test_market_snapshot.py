@@ -0,0 +1,116 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Unit tests for market snapshot class
+'''
+
+from unittest import TestCase
+from unittest.mock import patch
+import numpy as np
+from models.market_snapshot import MarketSnapshot, STAT_COLUMNS
+import models.utils.crypto_helper as CryptoHelper
+
+
+def make_stat(rate: float, vol: float, cap: float, change_pct: float) -> dict:
+    return {
+        "rate": rate, "high": rate * 2, "low": rate / 2, "vol": vol,
+        "cap": cap, "sup": 100, "change": 1, "change_pct": change_pct
+    }
+
+
+LIVE_DATA = {
+    "success": True,
+    "timestamp": 1701302400,
+    "rates": {
+        "BTC": make_stat(40000, 300, 800, 1.5),
+        "ETH": make_stat(2000, 200, 250, -4.0),
+        "DOGE": make_stat(0.08, 100, 10, 2.5),
+        "XYZ": {"rate": 1, "high": None}
+    }
+}
+
+
+class TestMarketSnapshot(TestCase):
+    """Unit tests for market snapshot class
+    """
+    def setUp(self) -> None:
+        self.snapshot = MarketSnapshot.from_live_data(LIVE_DATA)
+
+    def test_from_live_data(self) -> None:
+        self.assertEqual(len(self.snapshot), 4)
+        self.assertEqual(self.snapshot.timestamp, 1701302400)
+        self.assertEqual(self.snapshot.columns["rate"].dtype, np.float64)
+        self.assertIn("BTC", self.snapshot)
+        self.assertNotIn("ADA", self.snapshot)
+
+    def test_init_invalid(self) -> None:
+        with self.assertRaises(TypeError):
+            MarketSnapshot(["BTC"], [1])
+        with self.assertRaises(ValueError):
+            MarketSnapshot(["BTC"], {"rate": [1]})
+        with self.assertRaises(ValueError):
+            MarketSnapshot(
+                ["BTC"], {stat: [1, 2] for stat in STAT_COLUMNS}
+            )
+        with self.assertRaises(TypeError):
+            MarketSnapshot.from_live_data(False)
+
+    def test_get_crypto_stat(self) -> None:
+        self.assertEqual(
+            self.snapshot.get_crypto_stat("ETH"),
+            make_stat(2000, 200, 250, -4.0)
+        )
+        # missing stats are 0 like in Crypto
+        self.assertEqual(self.snapshot.get_crypto_stat("XYZ")["high"], 0)
+        self.assertIsNone(self.snapshot.get_crypto_stat("ADA"))
+
+    def test_top_rankings(self) -> None:
+        self.assertEqual(
+            list(self.snapshot.top_movers(2).index), ["ETH", "DOGE"]
+        )
+        self.assertEqual(
+            list(self.snapshot.top_volume(3).index), ["BTC", "ETH", "DOGE"]
+        )
+        self.assertEqual(list(self.snapshot.top_cap(10).index)[0], "BTC")
+        self.assertEqual(len(self.snapshot.top_cap(10)), 4)
+
+    def test_top_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            self.snapshot.top("name")
+        with self.assertRaises(ValueError):
+            self.snapshot.top("rate", 0)
+
+    def test_to_frame(self) -> None:
+        frame = self.snapshot.to_frame()
+        self.assertEqual(list(frame.columns), STAT_COLUMNS)
+        self.assertEqual(frame.loc["DOGE", "rate"], 0.08)
+
+    def test_fetch_market_snapshot(self) -> None:
+        with patch("models.utils.crypto_helper.fetch_data") as mock_fetch_data:
+            mock_fetch_data.return_value = LIVE_DATA
+            snapshot = CryptoHelper.fetch_market_snapshot()
+            self.assertEqual(len(snapshot), 4)
+            mock_fetch_data.assert_called_once()
+            self.assertNotIn("symbols=", mock_fetch_data.call_args[0][0])
+
+            mock_fetch_data.return_value = False
+            self.assertIs(CryptoHelper.fetch_market_snapshot(), False)
+
+    def test_validate_crypto_stats(self) -> None:
+        self.assertEqual(
+            self.snapshot.validate_crypto_stats().tolist(),
+            [True, True, True, False]
+        )
+
+    def test_sample_without_replacement(self) -> None:
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            picked = self.snapshot.sample(3, rng=rng)
+            self.assertEqual(len(set(picked)), 3)
+            self.assertNotIn("XYZ", picked)
+        # not enough valid symbols
+        self.assertEqual(len(self.snapshot.sample(6)), 3)
+        self.assertEqual(len(self.snapshot.sample(6, valid_only=False)), 4)
+        with self.assertRaises(ValueError):
+            self.snapshot.sample(-1)
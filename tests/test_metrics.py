@@ -0,0 +1,183 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Unit tests for the metrics registry, its HTTP endpoint and the API metrics
+recorded by fetch_data
+'''
+
+import socket
+from unittest import TestCase
+from unittest.mock import patch
+import requests
+import models.utils.metrics as Metrics
+import models.utils.crypto_helper as CryptoHelper
+from models.utils.http_client import CryptoTimeoutError
+from models.utils.metrics import MetricsRegistry, Histogram, hit_ratio, \
+    start_metrics_server, stop_metrics_server
+
+
+class TestMetrics(TestCase):
+    """Unit tests for the metrics registry
+    """
+    def setUp(self) -> None:
+        self.registry = MetricsRegistry()
+
+    def test_counter(self) -> None:
+        counter = self.registry.counter(
+            "requests_total", "Requests", ("endpoint",)
+        )
+        counter.inc(endpoint="/live")
+        counter.inc(2, endpoint="/live")
+        counter.inc(endpoint='/li"st')
+        self.assertEqual(counter.get(endpoint="/live"), 3)
+        text = self.registry.format()
+        self.assertIn("# TYPE requests_total counter", text)
+        self.assertIn('requests_total{endpoint="/live"} 3', text)
+        self.assertIn('requests_total{endpoint="/li\\"st"} 1', text)
+        with self.assertRaises(ValueError):
+            counter.inc(-1, endpoint="/live")
+        with self.assertRaises(ValueError):
+            counter.inc()
+
+    def test_gauge(self) -> None:
+        gauge = self.registry.gauge("in_flight", "In flight")
+        with gauge.track():
+            self.assertEqual(gauge.get(), 1)
+        self.assertEqual(gauge.get(), 0)
+
+        ratio = self.registry.gauge("ratio", "Ratio", ("cache",))
+        ratio.set_function(lambda: 0.5, cache="quote")
+        ratio.set_function(lambda: None, cache="history")
+        text = self.registry.format()
+        self.assertIn('ratio{cache="quote"} 0.5', text)
+        self.assertNotIn('cache="history"', text)
+
+    def test_histogram(self) -> None:
+        histogram = self.registry.histogram(
+            "latency_seconds", "Latency", buckets=(0.1, 1.0)
+        )
+        for value in [0.05, 0.1, 0.5, 3]:
+            histogram.observe(value)
+        self.assertEqual(histogram.count(), 4)
+        text = self.registry.format()
+        self.assertIn('latency_seconds_bucket{le="0.1"} 2', text)
+        self.assertIn('latency_seconds_bucket{le="1"} 3', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 4', text)
+        self.assertIn("latency_seconds_sum 3.65", text)
+        self.assertIn("latency_seconds_count 4", text)
+        with self.assertRaises(ValueError):
+            Histogram("invalid", "Invalid", buckets=(1.0, 0.1))
+
+    def test_registry(self) -> None:
+        counter = self.registry.counter("once_total", "Once", ("cache",))
+        self.assertIs(
+            self.registry.counter("once_total", "Once", ("cache",)), counter
+        )
+        with self.assertRaises(ValueError):
+            self.registry.gauge("once_total", "Once", ("cache",))
+        with self.assertRaises(ValueError):
+            self.registry.counter("once_total", "Once")
+        self.registry.histogram("latency_seconds", "Latency")
+        with self.assertRaises(ValueError):
+            self.registry.histogram("latency_seconds", "Latency", (), (1.0,))
+        self.registry.register_collector(lambda: "extra_metric 1\n")
+        self.assertTrue(self.registry.format().endswith("extra_metric 1\n"))
+
+    def test_registry_collector_imported_again(self) -> None:
+        def collector() -> str:
+            return "extra_metric 1\n"
+
+        def reloaded() -> str:
+            return "extra_metric 2\n"
+
+        reloaded.__qualname__ = collector.__qualname__
+        self.registry.register_collector(collector)
+        self.registry.register_collector(reloaded)
+        self.assertEqual(self.registry.format(), "extra_metric 2\n")
+
+    def test_hit_ratio(self) -> None:
+        self.assertIsNone(hit_ratio({"hits": 0, "misses": 0}))
+        self.assertEqual(hit_ratio({"hits": 3, "misses": 1}), 0.75)
+
+    def test_metrics_server(self) -> None:
+        self.registry.counter("served_total", "Served").inc()
+        self.addCleanup(stop_metrics_server)
+        server = start_metrics_server(0, registry=self.registry)
+        self.assertIs(start_metrics_server(0), server)
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        response = requests.get(url + "/metrics", timeout=5)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("served_total 1", response.text)
+        self.assertEqual(requests.get(url, timeout=5).status_code, 404)
+
+    def test_metrics_server_port_taken(self) -> None:
+        taken = socket.socket()
+        self.addCleanup(taken.close)
+        taken.bind(("127.0.0.1", 0))
+        taken.listen()
+        port = taken.getsockname()[1]
+        self.addCleanup(stop_metrics_server)
+        with patch.object(
+            Metrics, "ThreadingHTTPServer",
+            wraps=Metrics.ThreadingHTTPServer
+        ) as mock_server, self.assertLogs(Metrics.logger, "WARNING") as logs:
+            self.assertIsNone(start_metrics_server(port, "127.0.0.1"))
+            self.assertIsNone(start_metrics_server(port, "127.0.0.1"))
+        mock_server.assert_called_once()
+        self.assertEqual(len(logs.records), 1)
+
+
+class TestApiMetrics(TestCase):
+    """Unit tests for the metrics recorded by fetch_data
+    """
+    def test_coinlayer_error_type(self) -> None:
+        errors = CryptoHelper.API_ERRORS
+        before = errors.get(endpoint="/live", type="invalid_access_key")
+        requests_before = CryptoHelper.API_REQUESTS.get(endpoint="/live")
+        with patch("requests.Session.get") as mock_get, self.assertLogs(
+            CryptoHelper.logger, "WARNING"
+        ) as logs:
+            mock_get.return_value.json.return_value = {
+                "success": False, "error": {"type": "invalid_access_key"}
+            }
+            self.assertFalse(CryptoHelper.fetch_data(
+                CryptoHelper.LIVE_DATA.format(api_key="key", symbol="BTC")
+            ))
+        self.assertIn("/live: invalid_access_key", logs.output[0])
+        self.assertEqual(
+            errors.get(endpoint="/live", type="invalid_access_key"),
+            before + 1
+        )
+        self.assertEqual(
+            CryptoHelper.API_REQUESTS.get(endpoint="/live"),
+            requests_before + 1
+        )
+        self.assertEqual(CryptoHelper.API_IN_FLIGHT.get(), 0)
+
+    def test_exception_type(self) -> None:
+        errors = CryptoHelper.API_ERRORS
+        before = errors.get(endpoint="/list", type="CryptoTimeoutError")
+        latency_before = CryptoHelper.API_LATENCY.count(endpoint="/list")
+        with patch.object(
+            CryptoHelper._http_client, "get_json",
+            side_effect=CryptoTimeoutError("timed out")
+        ), self.assertRaises(CryptoTimeoutError):
+            CryptoHelper.fetch_data(
+                CryptoHelper.LIST_ENDPOINT.format(api_key="key")
+            )
+        self.assertEqual(
+            errors.get(endpoint="/list", type="CryptoTimeoutError"),
+            before + 1
+        )
+        self.assertEqual(
+            CryptoHelper.API_LATENCY.count(endpoint="/list"),
+            latency_before + 1
+        )
+        self.assertEqual(CryptoHelper.API_IN_FLIGHT.get(), 0)
+
+    def test_registry_includes_spans(self) -> None:
+        text = CryptoHelper.REGISTRY.format()
+        self.assertIn("# TYPE crypto_api_requests_total counter", text)
+        self.assertIn("# TYPE crypto_span_calls_total counter", text)
+        self.assertIn('crypto_cache_hit_ratio', text)
@@ -0,0 +1,90 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Unit tests for the local coinlayer stand-in, queried through the crypto
+helper functions
+'''
+
+import datetime as dt
+from unittest import TestCase
+from unittest.mock import patch
+import models.utils.crypto_helper as CryptoHelper
+from models.utils.http_client import CryptoAPIError
+from benchmarks.mock_coinlayer import MockCoinlayerServer, day_rate
+
+
+class TestMockCoinlayer(TestCase):
+    """Unit tests for the local coinlayer stand-in
+    """
+    def start_server(self, **kwargs) -> MockCoinlayerServer:
+        server = MockCoinlayerServer(symbol_count=50, **kwargs).start()
+        self.addCleanup(server.stop)
+        base_url = server.url
+        for name, path in [
+            ("LIST_ENDPOINT", "/list?access_key={api_key}"),
+            ("LIVE_DATA",
+             "/live?access_key={api_key}&symbols={symbol}&expand=1"),
+            ("HISTORICAL_DATE",
+             "/{date}?access_key={api_key}&symbols={symbol}"),
+            ("LIVE_MARKET_DATA", "/live?access_key={api_key}&expand=1")
+        ]:
+            patcher = patch.object(CryptoHelper, name, base_url + path)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        return server
+
+    def test_list(self) -> None:
+        self.start_server()
+        crypto_list = CryptoHelper.fetch_crypto_list()
+        self.assertEqual(len(crypto_list), 50)
+        self.assertEqual(crypto_list["BTC"]["name"], "Bitcoin")
+
+    def test_live(self) -> None:
+        self.start_server()
+        stats = CryptoHelper.get_crypto_stats_from_live_api(["BTC", "ETH"])
+        self.assertEqual(set(stats), {"BTC", "ETH"})
+        self.assertGreater(stats["BTC"]["rate"], 0)
+        self.assertEqual(
+            len(CryptoHelper.fetch_market_snapshot()), 50
+        )
+
+    def test_historical_is_deterministic(self) -> None:
+        self.start_server()
+        yesterday = dt.date.today() - dt.timedelta(days=1)
+        rates = CryptoHelper.fetch_historical_rates(
+            ["BTC", "NOPE"], yesterday.isoformat()
+        )
+        self.assertEqual(rates["BTC"], day_rate("BTC", yesterday))
+        self.assertEqual(rates["NOPE"], 0)
+
+    def test_historical_until_today(self) -> None:
+        self.start_server()
+        today = dt.date.today()
+        self.assertIsNotNone(
+            CryptoHelper.fetch_historical_rate("BTC", today.isoformat())
+        )
+        tomorrow = today + dt.timedelta(days=1)
+        self.assertIsNone(
+            CryptoHelper.fetch_historical_rate("BTC", tomorrow.isoformat())
+        )
+
+    def test_error_rate(self) -> None:
+        server = self.start_server(error_rate=1, seed=0)
+        with patch.object(CryptoHelper._http_client, "_sleep"):
+            try:
+                result = CryptoHelper.fetch_crypto_list()
+            except CryptoAPIError:
+                result = False
+        self.assertFalse(result)
+        self.assertGreaterEqual(server.count_stats()["errors"], 1)
+
+    def test_rate_limit(self) -> None:
+        server = self.start_server(rate_limit=1)
+        with patch.object(CryptoHelper._http_client, "_sleep"):
+            for _ in range(3):
+                try:
+                    CryptoHelper.fetch_crypto_list()
+                except CryptoAPIError:
+                    pass
+        self.assertGreater(server.count_stats()["rate_limited"], 0)
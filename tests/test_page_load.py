@@ -0,0 +1,73 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Unit tests for the page load benchmark, comparing results with a baseline
+'''
+
+from unittest import TestCase
+from benchmarks.page_load import find_regressions, summarize, STEPS
+
+
+BASELINE = {
+    "dashboard": {
+        "seconds": 0.2,
+        "calls": 2,
+        "bytes": 100000,
+        "peak_bytes": 2000000
+    }
+}
+
+
+class TestPageLoad(TestCase):
+    """Unit tests for the page load benchmark
+    """
+    def test_no_regression(self) -> None:
+        results = {
+            "dashboard": {
+                "seconds": 0.23,
+                "calls": 2,
+                "bytes": 110000,
+                "peak_bytes": 2100000
+            },
+            "new step": {"seconds": 9, "calls": 9}
+        }
+        self.assertEqual(find_regressions(results, BASELINE), [])
+
+    def test_regressions(self) -> None:
+        results = {
+            "dashboard": {
+                "seconds": 0.5,
+                "calls": 3,
+                "bytes": 130000,
+                "peak_bytes": 2100000
+            }
+        }
+        regressions = find_regressions(results, BASELINE, 0.2)
+        self.assertEqual(len(regressions), 3)
+        self.assertTrue(regressions[0].startswith("dashboard: seconds"))
+        self.assertTrue(regressions[1].startswith("dashboard: calls"))
+
+    def test_slack(self) -> None:
+        # 0.01 to 0.05 seconds is five times slower but still noise
+        baseline = {"search": {"seconds": 0.01, "peak_bytes": 1000}}
+        results = {"search": {"seconds": 0.05, "peak_bytes": 200000}}
+        self.assertEqual(find_regressions(results, baseline), [])
+
+    def test_invalid_threshold(self) -> None:
+        with self.assertRaises(ValueError):
+            find_regressions({}, BASELINE, -1)
+
+    def test_summarize(self) -> None:
+        timing_runs = [
+            {step: {"seconds": seconds, "calls": 1, "bytes": 10}
+             for step, _ in STEPS}
+            for seconds in [0.3, 0.1, 0.2]
+        ]
+        memory_run = {step: {"peak_bytes": 500} for step, _ in STEPS}
+        summary = summarize(timing_runs, memory_run)
+        self.assertEqual(len(summary), len(STEPS))
+        self.assertEqual(
+            summary["dashboard"],
+            {"seconds": 0.2, "calls": 1, "bytes": 10, "peak_bytes": 500}
+        )
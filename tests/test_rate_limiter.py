@@ -0,0 +1,168 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Unit tests for the rate limiter and the monthly request budget
+'''
+
+import os
+import tempfile
+from datetime import date
+from unittest import TestCase
+from unittest.mock import patch, Mock
+from models.utils.rate_limiter import TokenBucket, QuotaBudget
+from models.utils.http_client import CryptoQuotaExceededError
+import models.utils.crypto_helper as CryptoHelper
+
+
+class FakeTime:
+    """Clock advanced by the fake sleep"""
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def clock(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class TestTokenBucket(TestCase):
+    """Unit tests for the token bucket
+    """
+    def test_init_invalid(self) -> None:
+        with self.assertRaises(TypeError):
+            TokenBucket("5")
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+        with self.assertRaises(ValueError):
+            TokenBucket(1, 0)
+
+    def test_try_acquire_burst_then_refill(self) -> None:
+        fake_time = FakeTime()
+        bucket = TokenBucket(2, 2, clock=fake_time.clock)
+        self.assertTrue(bucket.try_acquire())
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+        fake_time.now = 0.5
+        self.assertTrue(bucket.try_acquire())
+
+    def test_acquire_waits_for_token(self) -> None:
+        fake_time = FakeTime()
+        bucket = TokenBucket(
+            4, 1, clock=fake_time.clock, sleep=fake_time.sleep
+        )
+        self.assertEqual(bucket.acquire(), 0)
+        self.assertAlmostEqual(bucket.acquire(), 0.25)
+        self.assertAlmostEqual(fake_time.now, 0.25)
+
+
+class TestQuotaBudget(TestCase):
+    """Unit tests for the monthly request budget
+    """
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "quota.json")
+        self.today = date(2023, 11, 30)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def make_budget(self, monthly_limit: int = 3) -> QuotaBudget:
+        return QuotaBudget(
+            self.path, monthly_limit, warning_ratio=0.5,
+            today=lambda: self.today
+        )
+
+    def test_init_invalid(self) -> None:
+        with self.assertRaises(TypeError):
+            QuotaBudget(1, 3)
+        with self.assertRaises(ValueError):
+            QuotaBudget(self.path, 0)
+        with self.assertRaises(ValueError):
+            QuotaBudget(self.path, 3, warning_ratio=2)
+
+    def test_consume_until_exhausted(self) -> None:
+        budget = self.make_budget()
+        self.assertTrue(budget.consume())
+        self.assertFalse(budget.is_nearly_exhausted())
+        self.assertTrue(budget.consume())
+        self.assertTrue(budget.is_nearly_exhausted())
+        self.assertTrue(budget.consume())
+        self.assertFalse(budget.consume())
+        self.assertEqual(budget.count_used(), 3)
+
+    def test_budget_is_persisted(self) -> None:
+        self.make_budget().consume()
+        self.assertEqual(self.make_budget().count_used(), 1)
+
+    def test_budget_shared_between_processes(self) -> None:
+        budget = self.make_budget()
+        other_process = self.make_budget()
+        self.assertTrue(budget.consume())
+        self.assertTrue(other_process.consume())
+        self.assertTrue(budget.consume())
+        self.assertFalse(other_process.consume())
+        self.assertEqual(budget.count_used(), 3)
+
+    def test_budget_resets_each_month(self) -> None:
+        budget = self.make_budget()
+        budget.consume()
+        self.today = date(2023, 12, 1)
+        self.assertEqual(budget.count_used(), 0)
+        self.assertEqual(self.make_budget().count_used(), 0)
+
+
+class TestFetchDataBudget(TestCase):
+    """Unit tests for the budget checks of the crypto helper
+    """
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        CryptoHelper._quote_cache.clear()
+
+    def tearDown(self) -> None:
+        CryptoHelper._quota_budget = None
+        CryptoHelper._quote_cache.clear()
+        self.directory.cleanup()
+
+    def test_fetch_data_budget_exhausted(self) -> None:
+        CryptoHelper.enable_quota_budget(
+            os.path.join(self.directory.name, "quota.json"), 1
+        )
+        with patch("requests.Session.get") as mock_get:
+            mock_get.return_value.json.return_value = {"success": True}
+            CryptoHelper.fetch_data("http://test.api.com")
+            with self.assertRaises(CryptoQuotaExceededError):
+                CryptoHelper.fetch_data("http://test.api.com")
+            mock_get.assert_called_once()
+
+    def test_fetch_data_retries_use_budget(self) -> None:
+        budget = CryptoHelper.enable_quota_budget(
+            os.path.join(self.directory.name, "quota.json"), 2
+        )
+        unavailable = Mock(status_code=503, headers={})
+        with patch("requests.Session.get") as mock_get, patch.object(
+            CryptoHelper._rate_limiter, "acquire"
+        ) as mock_acquire, patch(
+            "models.utils.http_client.time.sleep"
+        ):
+            mock_get.return_value = unavailable
+            with self.assertRaises(CryptoQuotaExceededError):
+                CryptoHelper.fetch_data("http://test.api.com")
+            self.assertEqual(mock_get.call_count, 2)
+            self.assertEqual(mock_acquire.call_count, 3)
+        self.assertEqual(budget.count_used(), 2)
+
+    def test_cached_stats_serve_stale_when_budget_low(self) -> None:
+        CryptoHelper._quote_cache.set("BTC", {"rate": 1})
+        with patch.object(CryptoHelper._quote_cache, "ttl", 0), \
+                patch.object(CryptoHelper, "QUOTE_CACHE_TTL", 0), \
+                patch(
+                    "models.utils.crypto_helper.is_quota_nearly_exhausted"
+                ) as mock_low, patch(
+                    "models.utils.crypto_helper.get_crypto_stats_from_live_api"
+                ) as mock_live:
+            mock_low.return_value = True
+            result = CryptoHelper.get_cached_crypto_stats(["BTC"])
+            self.assertEqual(result, {"BTC": {"rate": 1}})
+            mock_live.assert_not_called()
@@ -0,0 +1,157 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Unit tests for the background quote refresher
+'''
+
+import datetime as dt
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import patch, Mock, ANY
+from models.utils.scheduler import QuoteRefresher, seconds_until_next_month
+import models.utils.crypto_helper as CryptoHelper
+
+
+class TestQuoteRefresher(TestCase):
+    """Unit tests for the background quote refresher
+    """
+    def test_init_invalid(self) -> None:
+        with self.assertRaises(TypeError):
+            QuoteRefresher("BTC")
+        with self.assertRaises(ValueError):
+            QuoteRefresher(["BTC"], interval=0)
+        with self.assertRaises(ValueError):
+            QuoteRefresher(["BTC"], interval=1, jitter=1)
+        with self.assertRaises(ValueError):
+            QuoteRefresher(["BTC"], idle_timeout=0)
+
+    def test_refresh_once_metrics(self) -> None:
+        refresh = Mock(side_effect=[{"BTC": {}}, Exception("down")])
+        refresher = QuoteRefresher(["BTC", "BTC"], refresh=refresh)
+        self.assertTrue(refresher.refresh_once(lag=0.5))
+        self.assertFalse(refresher.refresh_once(interval=100))
+        # fresh until the next refresh, jitter and margin included
+        refresh.assert_called_with(["BTC"], 113)
+
+        metrics = refresher.count_metrics()
+        self.assertEqual(metrics["refresh_count"], 1)
+        self.assertEqual(metrics["error_count"], 1)
+        self.assertEqual(metrics["max_lag"], 0.5)
+        self.assertIsNotNone(metrics["snapshot_age"])
+
+    def test_add_symbols(self) -> None:
+        refresh = Mock(return_value={})
+        refresher = QuoteRefresher(["BTC"], refresh=refresh)
+        refresher.add_symbols(["ETH", "BTC"])
+        refresher.refresh_once()
+        refresh.assert_called_with(["BTC", "ETH"], ANY)
+
+    def test_idle_symbols_are_dropped(self) -> None:
+        refresh = Mock(return_value={})
+        refresher = QuoteRefresher(
+            ["BTC"], interval=0.01, jitter=0, refresh=refresh,
+            idle_timeout=0.05
+        )
+        time.sleep(0.06)
+        refresher.add_symbols(["ETH"])
+        self.assertTrue(refresher._drop_idle_symbols())
+        self.assertEqual(refresher.symbols, ["ETH"])
+
+        # without viewers the thread stops, a new render restarts it
+        refresher.start()
+        refresher._thread.join(timeout=1)
+        self.assertFalse(refresher.is_running())
+        self.assertEqual(refresher.symbols, [])
+        calls = refresh.call_count
+        refresher.add_symbols(["BTC"])
+        refresher.start()
+        self.assertTrue(refresher.is_running())
+        refresher.stop(timeout=1)
+        self.assertGreater(refresh.call_count, calls)
+        refresh.assert_called_with(["BTC"], ANY)
+
+    def test_next_interval_follows_budget(self) -> None:
+        refresher = QuoteRefresher(["BTC"], interval=30, jitter=0)
+        with patch(
+            "models.utils.crypto_helper.get_quota_budget", return_value=None
+        ):
+            self.assertEqual(refresher.next_interval(), 30)
+
+        budget = Mock(monthly_limit=5000)
+        budget.count_used.return_value = 1000
+        with patch(
+            "models.utils.crypto_helper.get_quota_budget",
+            return_value=budget
+        ), patch(
+            "models.utils.scheduler.seconds_until_next_month",
+            return_value=2_000_000
+        ):
+            # half of the 4000 requests left over the rest of the month
+            self.assertEqual(refresher.next_interval(), 1000)
+            budget.count_used.return_value = 5000
+            self.assertEqual(refresher.next_interval(), 2_000_000)
+
+    def test_seconds_until_next_month(self) -> None:
+        self.assertEqual(
+            seconds_until_next_month(dt.datetime(2026, 12, 31, 23, 59)), 60
+        )
+        self.assertEqual(
+            seconds_until_next_month(dt.datetime(2026, 2, 1)), 28 * 86400
+        )
+
+    def test_background_thread_refreshes_periodically(self) -> None:
+        refreshed = threading.Event()
+        calls = []
+
+        def refresh(symbols: list, ttl: float) -> dict:
+            calls.append(symbols)
+            if len(calls) >= 2:
+                refreshed.set()
+            return {"BTC": {}}
+
+        refresher = QuoteRefresher(
+            ["BTC"], interval=0.01, jitter=0, refresh=refresh
+        )
+        refresher.start()
+        refresher.start()
+        self.assertTrue(refreshed.wait(timeout=1))
+        refresher.stop(timeout=1)
+        self.assertFalse(refresher.is_running())
+
+    def test_refresh_cached_crypto_stats(self) -> None:
+        CryptoHelper._quote_cache.clear()
+        with patch(
+            "models.utils.crypto_helper.get_crypto_stats_from_live_api"
+        ) as mock_live:
+            mock_live.return_value = {"BTC": {"rate": 1}}
+            CryptoHelper.refresh_cached_crypto_stats(["BTC"])
+            CryptoHelper.refresh_cached_crypto_stats(["BTC"])
+            # refreshed even though cached
+            self.assertEqual(mock_live.call_count, 2)
+            self.assertEqual(
+                CryptoHelper.get_cached_crypto_stats(["BTC"]),
+                {"BTC": {"rate": 1}}
+            )
+            self.assertEqual(mock_live.call_count, 2)
+
+            # quotes refreshed in the background stay fresh until the next
+            # refresh, beyond QUOTE_CACHE_TTL
+            now = time.monotonic()
+            CryptoHelper.refresh_cached_crypto_stats(["BTC"], ttl=300)
+            with patch.object(
+                CryptoHelper._quote_cache, "_clock",
+                return_value=now + 200
+            ):
+                CryptoHelper.get_cached_crypto_stats(["BTC"])
+            self.assertEqual(mock_live.call_count, 3)
+
+            with patch(
+                "models.utils.crypto_helper.is_quota_nearly_exhausted",
+                return_value=True
+            ):
+                self.assertIs(
+                    CryptoHelper.refresh_cached_crypto_stats(["BTC"]), False
+                )
+        CryptoHelper._quote_cache.clear()
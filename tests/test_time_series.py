@@ -0,0 +1,86 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Unit tests for time series class
+'''
+
+from unittest import TestCase
+import numpy as np
+from models.time_series import TimeSeries
+from models.crypto import Crypto
+
+
+HISTORICAL_DATA = [
+    ("2023-11-28", 0.5),
+    ("2023-11-29", None),
+    ("2023-11-30", 0.7)
+]
+
+
+class TestTimeSeries(TestCase):
+    """Unit tests for time series class
+    """
+    def test_init_empty(self) -> None:
+        series = TimeSeries()
+        self.assertEqual(len(series), 0)
+        self.assertEqual(series.to_list(), [])
+
+    def test_init_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            TimeSeries(["2023-11-28"], [1.0, 2.0])
+        with self.assertRaises(ValueError):
+            TimeSeries(["2023-11-29", "2023-11-28"], [1.0, 2.0])
+        with self.assertRaises(TypeError):
+            TimeSeries.from_historical_data("2023-11-28")
+
+    def test_from_historical_data(self) -> None:
+        series = TimeSeries.from_historical_data(HISTORICAL_DATA)
+        self.assertEqual(len(series), 3)
+        self.assertEqual(series.dates.dtype, np.dtype("datetime64[ns]"))
+        self.assertTrue(np.isnan(series.rates[1]))
+        self.assertEqual(series.to_list(), HISTORICAL_DATA)
+
+    def test_append_grows_capacity(self) -> None:
+        series = TimeSeries()
+        for day in range(1, 21):
+            series.append(f"2023-11-{day:02d}", day)
+        self.assertEqual(len(series), 20)
+        self.assertGreaterEqual(len(series._dates), 20)
+        self.assertEqual(series.rates[-1], 20)
+        with self.assertRaises(ValueError):
+            series.append("2023-11-20", 1)
+
+    def test_slice_shares_memory(self) -> None:
+        series = TimeSeries.from_historical_data(HISTORICAL_DATA)
+        sliced = series.slice("2023-11-29", "2023-11-30")
+        self.assertEqual(sliced.to_list(), HISTORICAL_DATA[1:])
+        self.assertTrue(np.shares_memory(sliced.rates, series.rates))
+        self.assertEqual(
+            series.slice(end="2023-11-28").to_list(), HISTORICAL_DATA[:1]
+        )
+
+    def test_to_frame_is_zero_copy(self) -> None:
+        series = TimeSeries.from_historical_data(HISTORICAL_DATA)
+        frame = series.to_frame()
+        self.assertEqual(list(frame.columns), ["DATE", "CRYPTO"])
+        self.assertTrue(
+            np.shares_memory(frame["CRYPTO"].to_numpy(), series.rates)
+        )
+        self.assertTrue(
+            np.shares_memory(frame["DATE"].to_numpy(), series.dates)
+        )
+
+    def test_to_arrow(self) -> None:
+        table = TimeSeries.from_historical_data(HISTORICAL_DATA).to_arrow()
+        self.assertEqual(table.num_rows, 3)
+        self.assertEqual(table.column("CRYPTO").null_count, 1)
+
+    def test_crypto_time_series(self) -> None:
+        crypto = Crypto("BTC", historical_data=HISTORICAL_DATA)
+        self.assertEqual(crypto.time_series.to_list(), HISTORICAL_DATA)
+        self.assertIs(crypto.time_series, crypto.time_series)
+
+        series = TimeSeries.from_historical_data(HISTORICAL_DATA)
+        crypto = Crypto("BTC", historical_data=series)
+        self.assertIs(crypto.time_series, series)
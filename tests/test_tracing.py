@@ -0,0 +1,170 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Unit tests for the tracing spans, their breakdown per trace and exports
+'''
+
+import asyncio
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from unittest.mock import patch
+import models.utils.crypto_helper as CryptoHelper
+from models.crypto import Crypto
+from models.utils.tracing import start_trace, span, traced, submit, \
+    get_current_trace, count_span_totals, reset_span_totals, \
+    format_prometheus, Trace
+
+
+class TestTracing(TestCase):
+    """Unit tests for the tracing spans
+    """
+    def setUp(self) -> None:
+        reset_span_totals()
+
+    def test_nested_spans(self) -> None:
+        with start_trace("test") as trace:
+            with span("outer"):
+                with span("inner", symbol="BTC"):
+                    pass
+                with span("inner"):
+                    pass
+        self.assertIsNone(get_current_trace())
+        self.assertIsNotNone(trace.duration)
+        spans = trace.to_dict()["spans"]
+        self.assertEqual(
+            [each["name"] for each in spans], ["inner", "inner", "outer"]
+        )
+        self.assertEqual(spans[0]["parent"], "outer")
+        self.assertEqual(spans[0]["attributes"], {"symbol": "BTC"})
+
+        rows = {row["name"]: row for row in trace.breakdown()}
+        self.assertEqual(rows["inner"]["count"], 2)
+        outer = rows["outer"]
+        self.assertAlmostEqual(
+            outer["self_seconds"],
+            outer["seconds"] - rows["inner"]["seconds"]
+        )
+        self.assertEqual(trace.breakdown()[0]["name"], "outer")
+
+    def test_span_without_trace(self) -> None:
+        with span("alone"):
+            pass
+        self.assertEqual(count_span_totals()["alone"]["count"], 1)
+
+    def test_error_attribute(self) -> None:
+        with start_trace() as trace:
+            with self.assertRaises(ValueError):
+                with span("failing"):
+                    raise ValueError("failed")
+        self.assertEqual(trace.spans[0].attributes["error"], "ValueError")
+
+    def test_traced(self) -> None:
+        @traced()
+        def add(first, second):
+            return first + second
+
+        with start_trace() as trace:
+            self.assertEqual(add(1, 2), 3)
+        self.assertEqual(trace.spans[0].name, add.__wrapped__.__qualname__)
+
+    def test_context_follows_threads(self) -> None:
+        def work():
+            with span("work"):
+                return get_current_trace()
+
+        async def gather():
+            return await asyncio.gather(
+                asyncio.to_thread(work), asyncio.to_thread(work)
+            )
+
+        with start_trace() as trace:
+            with span("parent"):
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    futures = [submit(executor, work) for _ in range(2)]
+                    traces = [future.result() for future in futures]
+                traces += asyncio.run(gather())
+        self.assertEqual(traces, [trace] * 4)
+        works = [each for each in trace.spans if each.name == "work"]
+        self.assertEqual(len(works), 4)
+        self.assertEqual(works[0].parent.name, "parent")
+
+    def test_fetch_data_span(self) -> None:
+        with patch.object(
+            CryptoHelper._http_client, "get_json",
+            return_value={"success": False, "error": {"type": "bad"}}
+        ), start_trace() as trace:
+            self.assertFalse(CryptoHelper.fetch_data(
+                CryptoHelper.LIVE_DATA.format(api_key="key", symbol="BTC")
+            ))
+        self.assertEqual(trace.spans[0].name, "fetch_data /live")
+        self.assertEqual(trace.spans[0].attributes, {"error": "bad"})
+
+    def test_crypto_spans_per_bulk_call(self) -> None:
+        with start_trace() as trace:
+            Crypto("BTC")
+            Crypto.from_live_data({"rates": {"BTC": {}, "ETH": {}}})
+        self.assertEqual(
+            [each.name for each in trace.spans], ["Crypto.from_live_data"]
+        )
+
+    def test_live_stats_span_per_request(self) -> None:
+        with patch.object(
+            CryptoHelper, "fetch_data",
+            return_value={"success": True, "rates": {
+                symbol: dict.fromkeys(
+                    ["rate", "high", "low", "vol", "cap", "sup", "change",
+                     "change_pct"], 1
+                ) for symbol in ["BTC", "ETH", "DOGE"]
+            }}
+        ), start_trace() as trace:
+            CryptoHelper.get_crypto_stats_from_live_api(["BTC", "ETH", "DOGE"])
+        self.assertEqual(
+            [each.name for each in trace.spans],
+            ["get_crypto_stats_from_live_api"]
+        )
+
+    def test_get_endpoint_name(self) -> None:
+        base_url = "http://api.coinlayer.com"
+        for path, name in [
+            ("/list?access_key=key", "/list"),
+            ("/live?access_key=key&symbols=BTC", "/live"),
+            ("/2023-01-01?access_key=key", "/historical")
+        ]:
+            self.assertEqual(
+                CryptoHelper.get_endpoint_name(base_url + path), name
+            )
+
+    def test_format_prometheus(self) -> None:
+        text = format_prometheus({
+            'fetch_data "x"': {
+                "count": 2, "seconds": 0.5, "self_seconds": 0.25
+            }
+        })
+        self.assertIn("# TYPE crypto_span_calls_total counter", text)
+        self.assertIn(
+            'crypto_span_calls_total{span="fetch_data \\"x\\""} 2', text
+        )
+        self.assertIn(
+            'crypto_span_self_seconds_total{span="fetch_data \\"x\\""} 0.25',
+            text
+        )
+
+    def test_json_log(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "traces.jsonl")
+            for _ in range(2):
+                with start_trace(log_path=path):
+                    with span("step"):
+                        pass
+            with open(path, encoding="utf-8") as file:
+                traces = [json.loads(line) for line in file]
+        self.assertEqual(len(traces), 2)
+        self.assertEqual(traces[0]["spans"][0]["name"], "step")
+
+    def test_invalid_trace_name(self) -> None:
+        with self.assertRaises(TypeError):
+            Trace(1)
@@ -0,0 +1,62 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Unit tests for the incremental quote rendering of the views
+'''
+
+from unittest import TestCase
+from unittest.mock import Mock, patch
+from models.crypto import Crypto
+from views.utils.views_utils import find_changed_quotes, \
+    update_crypto_quotes, RENDERED_QUOTES_KEY
+
+
+class TestIncrementalQuotes(TestCase):
+    """Unit tests for redrawing only the changed quotes
+    """
+    def test_find_changed_quotes(self) -> None:
+        rendered_quotes = {"BTC": (1.0, 2.0), "ETH": (3.0, 4.0)}
+        crypto_list = [
+            Crypto("BTC", {"rate": 1.0, "change_pct": 2.0}),
+            Crypto("ETH", {"rate": 3.5, "change_pct": 4.0}),
+            Crypto("DOGE", {"rate": 0.1, "change_pct": 0.0})
+        ]
+        self.assertEqual(
+            find_changed_quotes(rendered_quotes, crypto_list),
+            ["ETH", "DOGE"]
+        )
+
+    def test_find_changed_quotes_as_displayed(self) -> None:
+        # Changes too small to show on the card are not redrawn
+        rendered_quotes = {"BTC": (1.0, 2.0)}
+        crypto_list = [Crypto("BTC", {"rate": 1.0001, "change_pct": 2.001})]
+        self.assertEqual(
+            find_changed_quotes(rendered_quotes, crypto_list), []
+        )
+
+    def test_update_crypto_quotes(self) -> None:
+        session_state = {RENDERED_QUOTES_KEY: {"BTC": (1.0, 2.0)}}
+        placeholders = {"BTC": Mock(), "ETH": Mock()}
+        crypto_list = [
+            Crypto("BTC", {"rate": 1.0, "change_pct": 2.0}),
+            Crypto("ETH", {"rate": 3.0, "change_pct": 4.0})
+        ]
+        with patch("streamlit.session_state", session_state):
+            updated = update_crypto_quotes(placeholders, crypto_list)
+            self.assertEqual(updated, ["ETH"])
+            placeholders["BTC"].metric.assert_not_called()
+            placeholders["ETH"].metric.assert_called_once()
+            self.assertEqual(
+                session_state[RENDERED_QUOTES_KEY]["ETH"], (3.0, 4.0)
+            )
+            # Nothing changed since, so nothing is redrawn
+            self.assertEqual(
+                update_crypto_quotes(placeholders, crypto_list), []
+            )
+
+    def test_update_crypto_quotes_invalid(self) -> None:
+        with self.assertRaises(TypeError):
+            update_crypto_quotes([], [])
+        with self.assertRaises(TypeError):
+            find_changed_quotes({}, "BTC")
@@ -6,8 +6,24 @@ Dashboard page for streamlit app
 '''
 
 import datetime as dt
+import math
+import time
 import streamlit as st
-from views.utils.views_utils import display_three_cryptos_in_one_row
+from models.utils.tracing import start_trace
+from views.utils.views_utils import display_three_cryptos_in_one_row, \
+    update_crypto_quotes
+
+
+# Auto refresh interval choices of the sidebar, in seconds
+AUTO_REFRESH_MIN_INTERVAL = 5
+AUTO_REFRESH_MAX_INTERVAL = 300
+AUTO_REFRESH_DEFAULT_INTERVAL = 30
+# Seconds slept between two draws of the countdown. Streamlit only stops a
+# running script for a rerun or a closed session when it draws, so this is
+# the longest the loop outlives them
+AUTO_REFRESH_SLICE = 1
+# Most cryptos shown in auto refresh mode, four rows of three
+AUTO_REFRESH_MAX_CRYPTOS = 12
 
 
 def validate_crypto_list(crypto_list: list) -> None:
@@ -27,20 +43,25 @@ def validate_crypto_list(crypto_list: list) -> None:
         raise ValueError("crypto_list cannot be empty")
 
 
-def render(crypto_list: list) -> None:
-    """Entry point for the dashboard page"""
+def render(crypto_list: list) -> tuple:
+    """Entry point for the dashboard page
+
+    Returns:
+        tuple: (placeholder of the last updated time, {symbol: placeholder
+        of its quote}), for auto_refresh
+    """
 
     try:
         # Validate crypto_list first before passing on
         validate_crypto_list(crypto_list)
         st.title("Cryptoeconomy Dashboard :chart_with_upwards_trend:")
         st.markdown(
-            """A simple cryptocurrency dashboard to explore the cryptoeconomy"""
-            """ *via [coinlayer API](https://coinlayer.com/)*"""
+            """A simple cryptocurrency dashboard to explore the """
+            """cryptoeconomy *via [coinlayer API](https://coinlayer.com/)*"""
         )
         st.header(":rainbow[Market Overview]", divider="rainbow")
-        current_time = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        st.text(f"Last updated: {current_time}")
+        last_updated = st.empty()
+        display_last_updated(last_updated)
 
         default = st.button("Default :house:")
         reload_button = st.button("Random :game_die:")
@@ -54,9 +75,141 @@ def render(crypto_list: list) -> None:
             st.session_state["dashboard_display"] = "random"
             st.rerun()
 
-        mid = len(crypto_list) // 2
-        display_three_cryptos_in_one_row(crypto_list[:mid])
-        display_three_cryptos_in_one_row(crypto_list[mid:])
+        placeholders = {}
+        for first in range(0, len(crypto_list), 3):
+            placeholders.update(
+                display_three_cryptos_in_one_row(
+                    crypto_list[first:first + 3]
+                )
+            )
+        return last_updated, placeholders
 
     except (TypeError, ValueError) as e:
         st.error(e)
+        return None, {}
+
+
+def display_last_updated(placeholder, timestamp: float = None) -> None:
+    """Draw the last updated time in its placeholder
+
+    Args:
+        placeholder: the placeholder of the time
+        timestamp (float, optional): epoch seconds. Defaults to now.
+    """
+
+    if timestamp is None:
+        timestamp = time.time()
+    updated_time = dt.datetime.fromtimestamp(timestamp).strftime(
+        "%Y-%m-%d %H:%M:%S"
+    )
+    placeholder.text(f"Last updated: {updated_time}")
+
+
+def render_auto_refresh_controls(
+    name_list: list,
+    default_cryptos: list
+) -> tuple or None:
+    """Sidebar controls of the auto refresh mode
+
+    Args:
+        name_list (list): the symbols that can be selected
+        default_cryptos (list): the symbols selected at first
+
+    Returns:
+        tuple or None: (symbols, interval in seconds), None if auto refresh
+        is off
+    """
+
+    st.sidebar.divider()
+    if not st.sidebar.toggle(
+        "Auto refresh",
+        key="auto_refresh",
+        help="Keep the dashboard updating, i.e., on a wall screen"
+    ):
+        return None
+    interval = st.sidebar.slider(
+        "Refresh every (seconds)",
+        min_value=AUTO_REFRESH_MIN_INTERVAL,
+        max_value=AUTO_REFRESH_MAX_INTERVAL,
+        value=AUTO_REFRESH_DEFAULT_INTERVAL,
+        key="auto_refresh_interval"
+    )
+    symbols = st.sidebar.multiselect(
+        "Cryptos",
+        options=name_list,
+        default=[crypto for crypto in default_cryptos if crypto in name_list],
+        max_selections=AUTO_REFRESH_MAX_CRYPTOS,
+        key="auto_refresh_cryptos"
+    )
+    return symbols, interval
+
+
+def auto_refresh(
+    last_updated,
+    placeholders: dict,
+    load_cryptos,
+    interval: float,
+    get_updated_at=None,
+    ticks: int = None,
+    sleep=time.sleep,
+    countdown=None
+) -> None:
+    """Update the dashboard every interval seconds until the session reruns
+    or ends. Every viewer reads the same shared quote cache, so viewers add
+    no requests to the API. Each update is traced on its own, so call it
+    after the rerun trace is finished
+
+    Args:
+        last_updated: the placeholder of the last updated time
+        placeholders (dict): {symbol: placeholder of its quote}
+        load_cryptos (callable): function returning the latest crypto list
+        interval (float): seconds between two updates
+        get_updated_at (callable, optional): function returning the epoch
+        seconds of the quotes, None if unknown. Defaults to None.
+        ticks (int, optional): stop after this many updates.
+        Defaults to None, never.
+        sleep (callable, optional): Defaults to time.sleep.
+        countdown (optional): the placeholder of the seconds left until the
+        next update. Defaults to a new st.empty().
+    """
+
+    if interval <= 0:
+        raise ValueError("interval must be positive")
+    if countdown is None:
+        countdown = st.empty()
+
+    tick = 0
+    while ticks is None or tick < ticks:
+        tick += 1
+        wait_for_next_update(countdown, interval, sleep)
+        with start_trace("auto refresh"):
+            try:
+                crypto_list = load_cryptos()
+            # Keep showing the last quotes, the next update tries again.
+            # Reruns and stops are not Exceptions and still end the loop
+            except Exception:
+                continue
+            update_crypto_quotes(placeholders, crypto_list)
+            if last_updated is not None:
+                display_last_updated(
+                    last_updated,
+                    get_updated_at() if get_updated_at else None
+                )
+
+
+def wait_for_next_update(countdown, seconds: float, sleep=time.sleep):
+    """Sleep in slices of AUTO_REFRESH_SLICE seconds, drawing the seconds
+    left before each, so Streamlit can stop the script in between
+
+    Args:
+        countdown: the placeholder of the seconds left
+        seconds (float): the seconds to wait
+        sleep (callable, optional): Defaults to time.sleep.
+    """
+
+    remaining = seconds
+    while remaining > 0:
+        countdown.caption(f"Next update in {math.ceil(remaining)}s")
+        step = min(AUTO_REFRESH_SLICE, remaining)
+        sleep(step)
+        remaining -= step
@@ -0,0 +1,59 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Hidden debug panel for streamlit app, showing where the time of a rerun
+went. Open the app with ?debug=timing to show it
+'''
+
+import json
+import pandas as pd
+import streamlit as st
+from models.utils.tracing import Trace, format_prometheus
+
+
+DEBUG_QUERY_PARAM = "debug"
+DEBUG_TIMING = "timing"
+
+
+def is_enabled() -> bool:
+    """Whether the app was opened with the timing debug query parameter"""
+
+    query_params = st.experimental_get_query_params()
+    return DEBUG_TIMING in query_params.get(DEBUG_QUERY_PARAM, [])
+
+
+def render(trace: Trace) -> None:
+    """Entry point for the debug panel, in the sidebar
+
+    Args:
+        trace (Trace): the trace of the current rerun
+    """
+
+    if not isinstance(trace, Trace):
+        raise TypeError("trace must be a Trace")
+
+    with st.sidebar.expander("Timing breakdown", expanded=True):
+        st.caption(
+            f"Rerun took {trace.elapsed * 1000:.1f} ms, "
+            f"{len(trace.spans)} spans"
+        )
+        breakdown = pd.DataFrame(trace.breakdown())
+        if not breakdown.empty:
+            for column in ["seconds", "self_seconds", "max_seconds"]:
+                breakdown[column] = (breakdown[column] * 1000).round(2)
+            breakdown.columns = ["Span", "Calls", "ms", "Self ms", "Max ms"]
+            st.dataframe(breakdown, hide_index=True)
+
+        st.download_button(
+            "Download trace JSON",
+            json.dumps(trace.to_dict()),
+            file_name="trace.json",
+            mime="application/json"
+        )
+        st.download_button(
+            "Download Prometheus metrics",
+            format_prometheus(),
+            file_name="metrics.txt",
+            mime="text/plain"
+        )
@@ -0,0 +1,87 @@
+'''
+@Author:	Jiawei He(Anson)
+@Date:		2026/10/18
+
+Market page for streamlit app
+'''
+
+import datetime as dt
+import streamlit as st
+from models.market_snapshot import MarketSnapshot
+
+
+# Ranking options of the market page and the snapshot method behind each
+RANKINGS = {
+    "Top movers": "top_movers",
+    "Top volume": "top_volume",
+    "Top market cap": "top_cap"
+}
+
+
+def validate_market_snapshot(snapshot: MarketSnapshot) -> None:
+    """validate the market snapshot
+
+    Args:
+        snapshot (MarketSnapshot): market snapshot object
+
+    Raises:
+        TypeError
+        ValueError
+    """
+
+    if not isinstance(snapshot, MarketSnapshot):
+        raise TypeError("snapshot must be a MarketSnapshot")
+    if len(snapshot) == 0:
+        raise ValueError("snapshot cannot be empty")
+
+
+def render(snapshot: MarketSnapshot) -> None:
+    """Entry point for the market page"""
+
+    try:
+        # Validate snapshot first before passing on
+        validate_market_snapshot(snapshot)
+        st.title("Market Overview :bar_chart:")
+        snapshot_time = dt.datetime.fromtimestamp(
+            snapshot.timestamp
+        ).strftime("%Y-%m-%d %H:%M:%S")
+        st.text(f"{len(snapshot)} cryptos, last updated: {snapshot_time}")
+
+        col1, col2 = st.columns([3, 1])
+        ranking = col1.radio(
+            "Rank by",
+            list(RANKINGS.keys()),
+            horizontal=True
+        )
+        number = col2.number_input(
+            "Number of cryptos",
+            min_value=1,
+            max_value=len(snapshot),
+            value=min(20, len(snapshot))
+        )
+
+        ranked = getattr(snapshot, RANKINGS[ranking])(int(number))
+        # Columns can be sorted again by clicking their header
+        st.dataframe(
+            ranked,
+            use_container_width=True,
+            column_config={
+                "rate": st.column_config.NumberColumn(
+                    "RATE (USD)", format="%.4f"
+                ),
+                "high": st.column_config.NumberColumn("HIGH", format="%.4f"),
+                "low": st.column_config.NumberColumn("LOW", format="%.4f"),
+                "vol": st.column_config.NumberColumn("VOLUME(24H)"),
+                "cap": st.column_config.NumberColumn("MARKET CAP"),
+                "sup": st.column_config.NumberColumn("SUPPLY"),
+                "change": st.column_config.NumberColumn(
+                    "CHANGE", format="%.4f"
+                ),
+                "change_pct": st.column_config.NumberColumn(
+                    "CHANGE %", format="%.2f %%"
+                )
+            }
+        )
+
+    except (TypeError, ValueError) as e:
+        st.error(e)
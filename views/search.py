@@ -7,9 +7,11 @@ Search page for streamlit app
 
 
 import streamlit as st
-from views.utils.views_utils import display_one_crypto_stat
+from views.utils.views_utils import display_one_crypto_stat, \
+    display_crypto_analytics
 from models.crypto import Crypto
 from models.crypto_name_list import CryptoNameList
+from models.utils.downsample import TIMEFRAMES, DEFAULT_TIMEFRAME
 
 
 def validate_crypto_name_instance(
@@ -38,16 +40,32 @@ def render(crypto_name_instance: CryptoNameList) -> None:
         # Validate crypto_name_instance first before passing on
         validate_crypto_name_instance(crypto_name_instance)
         st.title("Explore the Cryptoeconomy! :money_with_wings:")
-        # Using selectbox property to make sure no invalid entries are
-        # passed beyond this point
+        query = st.text_input(
+            "Search for a crypto:",
+            help="Symbol or name, i.e, BTC, Bitcoin, DOGE and etc.",
+            placeholder="Search for an asset"
+        )
+        # Only the best matches are listed, and using selectbox property
+        # makes sure no invalid entries are passed beyond this point
+        matches = crypto_name_instance.search(query) if query else []
         crypto_search = st.selectbox(
-            "Enter a crypto symbol:",
-            options=crypto_name_instance.name_list,
-            help="i.e, BTC, ETH, DOGE and etc.",
-            placeholder="Search for an asset",
-            index=None
+            "Select a crypto:",
+            options=matches,
+            format_func=lambda symbol: format_search_result(
+                crypto_name_instance, symbol
+            ),
+            placeholder="Type above to see matches",
+            index=0 if matches else None
         )
         search_button = st.button("SEARCH", type="primary")
+        st.radio(
+            "Timeframe",
+            list(TIMEFRAMES.keys()),
+            index=list(TIMEFRAMES.keys()).index(DEFAULT_TIMEFRAME),
+            horizontal=True,
+            key="timeframe",
+            help="Longer timeframes are charted with fewer points"
+        )
 
         # Check if the user has chose a crypto from selectbox and store
         # to session state
@@ -58,11 +76,36 @@ def render(crypto_name_instance: CryptoNameList) -> None:
         st.error(e)
 
 
-def display_searched_crypto(crypto: Crypto) -> None:
+def format_search_result(
+    crypto_name_instance: CryptoNameList,
+    symbol: str
+) -> str:
+    """format a search result as "SYMBOL - Full Name"
+
+    Args:
+        crypto_name_instance (CryptoNameList): crypto name list object
+        symbol (str): crypto symbol, i.e., BTC
+
+    Returns:
+        str: i.e., "BTC - Bitcoin", or the symbol if it has no full name
+    """
+
+    full_name = crypto_name_instance.get_full_name(symbol)
+    if full_name == symbol:
+        return symbol
+    return f"{symbol} - {full_name}"
+
+
+def display_searched_crypto(
+    crypto: Crypto,
+    timeframe: str = DEFAULT_TIMEFRAME
+) -> None:
     """display the searched crypto
 
     Args:
         crypto (Crypto): crypto object
+        timeframe (str, optional): the charted timeframe.
+        Defaults to DEFAULT_TIMEFRAME.
     """
 
     if not isinstance(crypto, Crypto):
@@ -73,6 +116,7 @@ def display_searched_crypto(crypto: Crypto) -> None:
             f"{crypto.symbol} has limited data from APIs, only showing rates",
             icon="ℹ️"
         )
-        display_one_crypto_stat(crypto, option="missing_data")
+        display_one_crypto_stat(crypto, "missing_data", timeframe)
     else:
-        display_one_crypto_stat(crypto)
+        display_one_crypto_stat(crypto, timeframe=timeframe)
+    display_crypto_analytics(crypto)
@@ -9,15 +9,50 @@ import pandas as pd
 from millify import millify
 import streamlit as st
 from models.crypto import Crypto
+from models.crypto_name_list import CryptoNameList
+from models.utils.analytics import build_rate_frame, compute_indicators, \
+    compute_sma, compute_ema, SMA_WINDOW, EMA_SPAN
+from models.utils.downsample import get_cached_chart_series, \
+    downsample_indices, DEFAULT_TIMEFRAME
+from models.utils.tracing import traced
 
 
-def display_one_crypto_stat(crypto: Crypto, option="default") -> None:
+# Session state key of the quotes last drawn, {symbol: (rates, change_pct)}
+RENDERED_QUOTES_KEY = "rendered_quotes"
+
+
+def get_crypto_label(symbol: str) -> str:
+    """Return the name of a crypto from the metadata already loaded in the
+    session, so labelling a symbol never needs a request
+
+    Args:
+        symbol (str): Crypto symbol, i.e., BTC
+
+    Returns:
+        str: the name, i.e., Bitcoin, or "" if unknown
+    """
+
+    crypto_names = st.session_state.get("crypto_names")
+    if not isinstance(crypto_names, CryptoNameList):
+        return ""
+    name = crypto_names.get_full_name(symbol)
+    return "" if name == symbol else name
+
+
+@traced()
+def display_one_crypto_stat(
+    crypto: Crypto,
+    option="default",
+    timeframe: str = DEFAULT_TIMEFRAME
+) -> None:
     """Display one crypto stat in streamlit
 
     Args:
         crypto (Crypto): The crypto object
         option (str, optional): whether crypto has enough stat to display.
         Defaults to "default".
+        timeframe (str, optional): the timeframe of the historical data,
+        long ones are charted downsampled. Defaults to DEFAULT_TIMEFRAME.
 
     Raises:
         ValueError: If options are not default or missing_data
@@ -31,7 +66,10 @@ def display_one_crypto_stat(crypto: Crypto, option="default") -> None:
     if option not in options:
         raise ValueError(f"Invalid option: {option}")
 
-    st.header(f":violet[{crypto.symbol}]", divider="rainbow")
+    st.header(
+        f":violet[{crypto.symbol}] {get_crypto_label(crypto.symbol)}",
+        divider="rainbow"
+    )
     st.subheader("Market Stats")
     st.image(crypto.icon, width=100)
 
@@ -68,40 +106,140 @@ supply of a crypto at the current price."
             delta=f"{crypto.change_pct:.2f} %"
         )
 
-    chart_data = pd.DataFrame(
-        crypto.historical_data, columns=["DATE", "CRYPTO"]
+    chart_series = get_cached_chart_series(
+        crypto.symbol, timeframe, crypto.time_series
     )
+    chart_data = chart_series.to_frame("DATE", "CRYPTO")
     st.line_chart(chart_data, x="DATE", y="CRYPTO", color="#ffaa00")
 
 
-def display_one_crypto_overview(crypto: Crypto) -> None:
-    """Display one crypto overview in streamlit
+@traced()
+def display_crypto_analytics(crypto: Crypto) -> None:
+    """Display the indicators computed from the historical data of one
+    crypto in streamlit
+
+    Args:
+        crypto (Crypto): The crypto object
+    """
+
+    if not isinstance(crypto, Crypto):
+        raise TypeError("crypto must be a Crypto object")
+
+    rate_frame = build_rate_frame([crypto])
+    indicators = compute_indicators(rate_frame).loc[crypto.symbol]
+
+    st.subheader("Analytics")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric(
+        label=":blue[RETURN]",
+        value=format_indicator(indicators["total_return"], percent=True),
+        help="Change of the rate over the charted period."
+    )
+    col2.metric(
+        label=":blue[VOLATILITY]",
+        value=format_indicator(indicators["volatility"], percent=True),
+        help="Standard deviation of the daily returns."
+    )
+    col3.metric(
+        label=":blue[MAX DRAWDOWN]",
+        value=format_indicator(indicators["max_drawdown"], percent=True),
+        help="Largest fall from a previous peak over the charted period."
+    )
+    col4.metric(
+        label=f":blue[SMA({SMA_WINDOW}) / EMA({EMA_SPAN})]",
+        value=f"{format_indicator(indicators['sma'])} / \
+{format_indicator(indicators['ema'])}"
+    )
+
+    chart_data = rate_frame.rename(columns={crypto.symbol: "CRYPTO"})
+    chart_data["SMA"] = compute_sma(rate_frame)[crypto.symbol]
+    chart_data["EMA"] = compute_ema(rate_frame)[crypto.symbol]
+    # Averages are computed on every day, only the charted rows are capped
+    chart_data = chart_data.iloc[downsample_indices(
+        chart_data.index.values, chart_data["CRYPTO"].to_numpy()
+    )]
+    st.line_chart(
+        chart_data.reset_index(),
+        x="DATE",
+        y=["CRYPTO", "SMA", "EMA"],
+        color=["#ffaa00", "#0068c9", "#29b09d"]
+    )
+
+
+def format_indicator(value: float, percent: bool = False) -> str:
+    """Format an indicator for display, "-" when it cannot be computed
+
+    Args:
+        value (float): the indicator value
+        percent (bool, optional): show a ratio as a percentage.
+        Defaults to False.
+
+    Returns:
+        str: the formatted value
+    """
+
+    if pd.isna(value):
+        return "-"
+    if percent:
+        return f"{value * 100:.2f} %"
+    return f"{value:.3f}"
+
+
+@traced()
+def display_one_crypto_overview(crypto: Crypto):
+    """Display one crypto overview in streamlit. The quote is drawn in a
+    placeholder, so it can be redrawn alone by update_crypto_quotes
 
     Args:
         crypto (Crypto): The crypto object
+
+    Returns:
+        the placeholder of the quote
     """
 
     if not isinstance(crypto, Crypto):
         raise TypeError("crypto must be a Crypto object")
 
     st.subheader(f"{crypto.symbol}")
+    st.caption(get_crypto_label(crypto.symbol))
     st.image(crypto.icon, width=70)
 
-    st.metric(
+    placeholder = st.empty()
+    display_crypto_quote(placeholder, crypto)
+    st.divider()
+    return placeholder
+
+
+@traced()
+def display_crypto_quote(placeholder, crypto: Crypto) -> None:
+    """Draw the quote of a crypto in its placeholder and remember it as
+    rendered in the session state
+
+    Args:
+        placeholder: the placeholder of the quote
+        crypto (Crypto): The crypto object
+    """
+
+    placeholder.metric(
         label=f":blue[{crypto.symbol} / USD]",
         value=f"{crypto.rates:.3f}",
         delta=f"{crypto.change_pct:.2f} %"
     )
-    st.divider()
+    rendered_quotes = st.session_state.setdefault(RENDERED_QUOTES_KEY, {})
+    rendered_quotes[crypto.symbol] = get_quote(crypto)
 
 
-def display_three_cryptos_in_one_row(crypto_list: list, n=3) -> None:
+@traced()
+def display_three_cryptos_in_one_row(crypto_list: list, n=3) -> dict:
     """A page helper function to display three cryptos in one row
 
     Args:
         crypto_list (list): a list of cryptos
         n (int, optional): number of cryptos to display in a row.
         Defaults to 3.
+
+    Returns:
+        dict: {symbol: placeholder of its quote}
     """
 
     if not isinstance(crypto_list, list):
@@ -111,7 +249,68 @@ def display_three_cryptos_in_one_row(crypto_list: list, n=3) -> None:
     if n % 3 != 0:
         raise ValueError("n must be a multiple of 3")
 
+    placeholders = {}
     col = st.columns(n)
-    for i in range(n):
+    # The last row may have fewer cryptos
+    for i in range(min(n, len(crypto_list))):
         with col[i]:
-            display_one_crypto_overview(crypto_list[i])
+            placeholders[crypto_list[i].symbol] = \
+                display_one_crypto_overview(crypto_list[i])
+    return placeholders
+
+
+@traced()
+def update_crypto_quotes(placeholders: dict, crypto_list: list) -> list:
+    """Redraw only the quotes that changed since they were last rendered,
+    the other cards send nothing to the browser
+
+    Args:
+        placeholders (dict): {symbol: placeholder of its quote}
+        crypto_list (list): list of crypto objects with the latest quotes
+
+    Returns:
+        list: the symbols redrawn
+    """
+
+    if not isinstance(placeholders, dict):
+        raise TypeError("placeholders must be a dict")
+
+    rendered_quotes = st.session_state.setdefault(RENDERED_QUOTES_KEY, {})
+    changed = find_changed_quotes(rendered_quotes, crypto_list)
+    for crypto in crypto_list:
+        if crypto.symbol in changed and crypto.symbol in placeholders:
+            display_crypto_quote(placeholders[crypto.symbol], crypto)
+    return [symbol for symbol in changed if symbol in placeholders]
+
+
+def find_changed_quotes(rendered_quotes: dict, crypto_list: list) -> list:
+    """Return the symbols whose quote differs from the rendered one
+
+    Args:
+        rendered_quotes (dict): {symbol: (rates, change_pct)} last rendered
+        crypto_list (list): list of crypto objects
+
+    Returns:
+        list: the symbols of the changed or never rendered quotes, in order
+    """
+
+    if not isinstance(crypto_list, list):
+        raise TypeError("crypto_list must be a list")
+
+    return [
+        crypto.symbol for crypto in crypto_list
+        if rendered_quotes.get(crypto.symbol) != get_quote(crypto)
+    ]
+
+
+def get_quote(crypto: Crypto) -> tuple:
+    """Return what a card shows of a crypto, as rounded on screen
+
+    Args:
+        crypto (Crypto): The crypto object
+
+    Returns:
+        tuple: (rates, change_pct)
+    """
+
+    return (round(crypto.rates, 3), round(crypto.change_pct, 2))